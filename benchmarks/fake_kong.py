@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+""" A local stand-in of the Kong admin API, for benchmarks.
+
+A `kongclient.testing.FakeKong` served over HTTP. Every request can be delayed by a fixed latency
+plus a random jitter, to model a remote admin API::
+
+    python -m benchmarks.fake_kong --port 8001 --services 1000 --consumers 1000 --latency 0.002 --jitter 0.001
+
+The URL of the server is printed on the first line of the standard output once it listens.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from kongclient.testing import FakeKong
+
+
+def seed(kong, services=0, consumers=0, plugins=0, upstreams=0, targets=0):
+    """ Fill a FakeKong: one route per service, plugins spread over the services,
+    and `targets` targets per upstream.
+    """
+    service_ids = []
+    for i in range(services):
+        service = kong.add('services', {'name': 'service-%d' % i, 'host': 'backend-%d.local' % i,
+                                        'tags': ['bench', 'group-%d' % (i % 10)]})
+        kong.add('routes', {'name': 'route-%d' % i, 'paths': ['/s%d' % i], 'service': {'id': service['id']},
+                            'tags': ['bench']})
+        service_ids.append(service['id'])
+    for i in range(consumers):
+        kong.add('consumers', {'username': 'consumer-%d' % i, 'custom_id': str(i), 'tags': ['bench']})
+    for i in range(plugins):
+        service = {'id': service_ids[i % len(service_ids)]} if i < len(service_ids) else None
+        kong.add('plugins', {'name': 'rate-limiting', 'config': {'minute': 20 + i}, 'service': service,
+                             'tags': ['bench']})
+    for i in range(upstreams):
+        upstream = kong.add('upstreams', {'name': 'upstream-%d' % i})
+        for j in range(targets):
+            kong.add('targets', {'target': '10.%d.%d.%d:80' % (i // 256, i % 256, j),
+                                 'upstream': {'id': upstream['id']}})
+    return kong
+
+
+class FakeKongServer(ThreadingHTTPServer):
+    """ HTTP server answering admin API requests from a FakeKong.
+
+    :param address: The (host, port) tuple to listen on, port 0 picking a free one.
+    :param kong: The FakeKong holding the entities, an empty one when None.
+    :param latency: The delay added to every request, in seconds.
+    :param jitter: The maximum random delay added on top of latency, in seconds.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address=('127.0.0.1', 0), kong=None, latency=0, jitter=0):
+        super(FakeKongServer, self).__init__(address, _Handler)
+        self.kong = kong if kong is not None else FakeKong()
+        self.latency = latency
+        self.jitter = jitter
+
+    @property
+    def url(self):
+        return 'http://%s:%d' % self.server_address[:2]
+
+    def start(self):
+        """ Serve requests in a background thread and return the server URL. """
+        threading.Thread(target=self.serve_forever, name='fake-kong', daemon=True).start()
+        return self.url
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately, Nagle's algorithm would delay the body.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _handle(self):
+        server = self.server
+        delay = server.latency + (random.uniform(0, server.jitter) if server.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        status, payload = server.kong.handle(self.command, url.path, query, body)
+        content = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _handle
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve a fake Kong admin API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--services', type=int, default=0, help='services to create, with one route each')
+    parser.add_argument('--consumers', type=int, default=0)
+    parser.add_argument('--plugins', type=int, default=0)
+    parser.add_argument('--upstreams', type=int, default=0)
+    parser.add_argument('--targets', type=int, default=0, help='targets per upstream')
+    parser.add_argument('--latency', type=float, default=0, help='delay added to every request, in seconds')
+    parser.add_argument('--jitter', type=float, default=0, help='maximum random delay added to latency, in seconds')
+    args = parser.parse_args(argv)
+    kong = seed(FakeKong(), services=args.services, consumers=args.consumers, plugins=args.plugins,
+                upstreams=args.upstreams, targets=args.targets)
+    server = FakeKongServer((args.host, args.port), kong=kong, latency=args.latency, jitter=args.jitter)
+    print(server.url, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
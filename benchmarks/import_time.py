@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+""" Import-time budget of the kongclient package.
+
+Every step of a cold start is timed in fresh interpreters, along with the heavy modules it pulls in,
+and the run fails when creating a client takes longer than the budget::
+
+    python -m benchmarks.import_time --runs 20 --budget-ms 30 --output import_time.json
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The steps of a cold start, each one timed on its own, after the steps before it.
+STEPS = (
+    ('import', 'import kongclient'),
+    ('client_class', 'from kongclient import KongClient'),
+    ('client', "kong_client = KongClient('http://localhost:8001')"),
+    ('manager', 'kong_client.services'),
+)
+
+# The step the budget applies to, i.e., everything until a client exists.
+BUDGET_STEP = 'client'
+
+# Modules only worth importing when they are used.
+HEAVY_MODULES = ('requests', 'urllib3', 'httpx', 'asyncio', 'concurrent.futures', 'ssl', 'kongclient.api.base')
+
+CHILD = '''
+import sys, time
+timings = []
+started_at = time.perf_counter()
+for name, statement in STEPS:
+    exec(statement)
+    timings.append((name, (time.perf_counter() - started_at) * 1000,
+                    [module for module in HEAVY_MODULES if module in sys.modules]))
+print(repr(timings))
+'''
+
+
+def measure_once():
+    """ Return the cumulative time in ms and the heavy modules imported after every step, in a fresh interpreter. """
+    source = 'STEPS = %r\nHEAVY_MODULES = %r\n%s' % (STEPS, HEAVY_MODULES, CHILD)
+    output = subprocess.check_output([sys.executable, '-c', source], cwd=ROOT, universal_newlines=True)
+    return ast.literal_eval(output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure the cold start of the kongclient package.')
+    parser.add_argument('--runs', type=int, default=10, help='fresh interpreters to time')
+    parser.add_argument('--budget-ms', type=float, help='the median time until a client exists, exits with 1 above')
+    parser.add_argument('--output', help='the file the JSON results are written to, standard output when omitted')
+    args = parser.parse_args(argv)
+
+    runs = [measure_once() for _ in range(args.runs)]
+    steps = []
+    for i, (name, _) in enumerate(STEPS):
+        timings = sorted(run[i][1] for run in runs)
+        steps.append({'step': name, 'statement': STEPS[i][1], 'median_ms': statistics.median(timings),
+                      'min_ms': timings[0], 'max_ms': timings[-1], 'heavy_modules': runs[-1][i][2]})
+    document = {'python': sys.version.split()[0], 'runs': args.runs, 'steps': steps}
+    if args.budget_ms is not None:
+        spent = next(step['median_ms'] for step in steps if step['step'] == BUDGET_STEP)
+        document['budget'] = {'step': BUDGET_STEP, 'budget_ms': args.budget_ms, 'median_ms': spent,
+                              'exceeded': spent > args.budget_ms}
+    output = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 1 if document.get('budget', {}).get('exceeded') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
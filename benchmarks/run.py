@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+""" Benchmarks of the Kong clients against a local stand-in of the Kong admin API.
+
+Every scenario is run by every client, and its throughput, latency percentiles and peak memory
+are written as JSON, to be compared between releases::
+
+    python -m benchmarks.run --services 1000 --latency 0.002 --jitter 0.001 --output results.json
+    python -m benchmarks.run --scenarios list get --clients sync --baseline results.json
+
+The fake server runs in a child process, so that it does not compete with the clients for the GIL
+and its memory is not counted. With --url, an existing Kong admin API is used instead, and with
+--in-process requests go to a FakeKong through FakeKongTransport, measuring the clients without any socket.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_kong import seed
+from kongclient import AsyncKongClient, KongClient
+from kongclient.sync import sync
+from kongclient.testing import AsyncFakeKongTransport, FakeKong, FakeKongTransport
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = ('list', 'get', 'bulk_write', 'sync', 'decode')
+CLIENTS = ('sync', 'async')
+
+# The scenarios the asynchronous client runs, sync being a blocking API.
+ASYNC_SCENARIOS = ('list', 'get', 'bulk_write', 'decode')
+
+
+def percentile(sorted_values, q):
+    """ Return the nearest-rank q percentile of sorted values, e.g., q=0.99. """
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+def summarize(durations, seconds, errors, peak_memory):
+    durations = sorted(durations)
+    return {
+        'operations': len(durations),
+        'errors': errors,
+        'seconds': seconds,
+        'throughput': len(durations) / seconds if seconds else None,
+        'latency': {
+            'mean': sum(durations) / len(durations) if durations else None,
+            'p50': percentile(durations, 0.5),
+            'p99': percentile(durations, 0.99),
+            'max': durations[-1] if durations else None,
+        },
+        'peak_memory': peak_memory,
+    }
+
+
+class FakeKongProcess:
+    """ Runs benchmarks.fake_kong in a child process.
+
+    :param options: The command line options of the server, e.g., ['--services', '100'].
+    """
+
+    def __init__(self, options):
+        self.process = subprocess.Popen([sys.executable, '-m', 'benchmarks.fake_kong'] + options, cwd=ROOT,
+                                        stdout=subprocess.PIPE, universal_newlines=True)
+        self.url = self.process.stdout.readline().strip()
+        if not self.url:
+            self.process.wait()
+            raise RuntimeError('The fake Kong admin API did not start')
+
+    def close(self):
+        self.process.terminate()
+        self.process.wait()
+
+
+class Scenarios:
+    """ Builds the operation of every scenario, for the blocking client.
+
+    :param kong: instance of KongClient.
+    :param args: The command line arguments.
+    """
+
+    client = 'sync'
+
+    def __init__(self, kong, args):
+        self.kong = kong
+        self.args = args
+        self.counter = itertools.count()
+
+    def list(self):
+        return lambda: self.kong.services.list(size=self.args.page_size)
+
+    def get(self):
+        names = itertools.cycle([service['name'] for service in self.kong.services.list(size=1000)])
+        return lambda: self.kong.services.get(next(names))
+
+    def _batch(self):
+        batch = next(self.counter)
+        return [{'username': 'bench-%s-%d-%d' % (self.client, batch, i), 'tags': ['bench-write']}
+                for i in range(self.args.batch)]
+
+    def bulk_write(self):
+        def op():
+            results = self.kong.consumers.bulk_create(self._batch(), max_workers=self.args.workers)
+            failed = [result.error for result in results if not result.ok]
+            if failed:
+                raise failed[0]
+
+        return op
+
+    def _desired(self, retries):
+        services = []
+        for i in range(self.args.sync_services):
+            service = {'name': 'bench-sync-%d' % i, 'url': 'http://backend-%d.local:80/' % i,
+                       'routes': [{'name': 'bench-sync-%d' % i, 'paths': ['/sync-%d' % i]}]}
+            if i < self.args.sync_changes:
+                service['retries'] = retries
+            services.append(service)
+        return {'services': services}
+
+    def sync(self):
+        sync(self.kong, self._desired(0), max_workers=self.args.workers, select_tags=['bench-sync'])
+        retries = itertools.cycle((1, 0))
+
+        def op():
+            plan = sync(self.kong, self._desired(next(retries)), max_workers=self.args.workers,
+                        select_tags=['bench-sync'])
+            if not plan.ok:
+                raise plan.errors[0].error
+
+        return op
+
+    def decode(self):
+        content = self.kong.client.request('GET', '/services', params={'size': self.args.page_size}).content
+        return lambda: self.kong.codec.decode_page(content, 'data', url='/services')
+
+
+class AsyncScenarios(Scenarios):
+    """ Builds the operation of every scenario, for the asynchronous client, operations being coroutine functions. """
+
+    client = 'async'
+
+    def list(self):
+        return lambda: self.kong.services.list(size=self.args.page_size)
+
+    async def get(self):
+        names = itertools.cycle([service['name'] for service in await self.kong.services.list(size=1000)])
+        return lambda: self.kong.services.get(next(names))
+
+    def bulk_write(self):
+        async def op():
+            results = await self.kong.consumers.bulk_create(self._batch(), max_workers=self.args.workers)
+            failed = [result.error for result in results if not result.ok]
+            if failed:
+                raise failed[0]
+
+        return op
+
+    async def decode(self):
+        content = (await self.kong.client.request('GET', '/services', params={'size': self.args.page_size})).content
+
+        async def op():
+            return self.kong.codec.decode_page(content, 'data', url='/services')
+
+        return op
+
+
+def measure(op, args):
+    """ Run an operation `args.iterations` times over `args.concurrency` threads, after a warmup. """
+    for _ in range(args.warmup):
+        op()
+    durations = []
+    errors = []
+    operations = iter(range(args.iterations))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                if next(operations, None) is None:
+                    return
+            started_at = time.perf_counter()
+            try:
+                op()
+            except Exception as e:
+                errors.append(e)
+            durations.append(time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        for _ in range(args.concurrency):
+            executor.submit(worker)
+    seconds = time.perf_counter() - started_at
+    tracemalloc.start()
+    try:
+        op()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return summarize(durations, seconds, len(errors), peak_memory), errors
+
+
+async def measure_async(op, args):
+    """ Await an operation `args.iterations` times over `args.concurrency` tasks, after a warmup. """
+    for _ in range(args.warmup):
+        await op()
+    durations = []
+    errors = []
+    operations = iter(range(args.iterations))
+
+    async def worker():
+        while next(operations, None) is not None:
+            started_at = time.perf_counter()
+            try:
+                await op()
+            except Exception as e:
+                errors.append(e)
+            durations.append(time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(args.concurrency)])
+    seconds = time.perf_counter() - started_at
+    tracemalloc.start()
+    try:
+        await op()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return summarize(durations, seconds, len(errors), peak_memory), errors
+
+
+def run_sync(url, args, fake=None):
+    results = []
+    transport = FakeKongTransport(fake) if fake is not None else None
+    kong = KongClient(url, transport=transport, pool_maxsize=max(args.concurrency, args.workers))
+    try:
+        scenarios = Scenarios(kong, args)
+        for name in args.scenarios:
+            result, errors = measure(getattr(scenarios, name)(), args)
+            results.append(dict(result, client='sync', scenario=name, first_error=_error(errors)))
+    finally:
+        kong.close()
+    return results
+
+
+async def run_async(url, args, fake=None):
+    results = []
+    transport = AsyncFakeKongTransport(fake) if fake is not None else None
+    async with AsyncKongClient(url, transport=transport, max_concurrency=max(args.concurrency, args.workers)) as kong:
+        scenarios = AsyncScenarios(kong, args)
+        for name in args.scenarios:
+            if name not in ASYNC_SCENARIOS:
+                continue
+            op = getattr(scenarios, name)()
+            if asyncio.iscoroutine(op):
+                op = await op
+            result, errors = await measure_async(op, args)
+            results.append(dict(result, client='async', scenario=name, first_error=_error(errors)))
+    return results
+
+
+def _error(errors):
+    return '%s: %s' % (type(errors[0]).__name__, errors[0]) if errors else None
+
+
+def compare(results, baseline, tolerance):
+    """ Return the results slower than in a baseline document by more than `tolerance`, e.g., 0.1 for 10%. """
+    previous = {(result['client'], result['scenario']): result for result in baseline['results']}
+    regressions = []
+    for result in results:
+        before = previous.get((result['client'], result['scenario']))
+        if not before or not before['throughput'] or not result['throughput']:
+            continue
+        change = result['throughput'] / before['throughput'] - 1
+        if change < -tolerance:
+            regressions.append({'client': result['client'], 'scenario': result['scenario'],
+                                'throughput': result['throughput'], 'baseline': before['throughput'],
+                                'change': change})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the Kong clients against a fake Kong admin API.')
+    parser.add_argument('--url', help='an existing Kong admin API, instead of starting the fake one')
+    parser.add_argument('--in-process', action='store_true',
+                        help='send requests to a FakeKong in process, its memory is then counted too')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--clients', nargs='+', choices=CLIENTS, default=list(CLIENTS))
+    parser.add_argument('--services', type=int, default=1000, help='services served by the fake API')
+    parser.add_argument('--consumers', type=int, default=1000, help='consumers served by the fake API')
+    parser.add_argument('--plugins', type=int, default=100, help='plugins served by the fake API')
+    parser.add_argument('--latency', type=float, default=0, help='delay of every request, in seconds')
+    parser.add_argument('--jitter', type=float, default=0, help='maximum random delay added to latency, in seconds')
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--iterations', type=int, default=50, help='operations measured per scenario')
+    parser.add_argument('--warmup', type=int, default=2, help='operations run before measuring')
+    parser.add_argument('--concurrency', type=int, default=1, help='operations running at the same time')
+    parser.add_argument('--workers', type=int, default=10, help='workers of bulk and sync operations')
+    parser.add_argument('--batch', type=int, default=50, help='consumers created per bulk_write operation')
+    parser.add_argument('--sync-services', type=int, default=50, help='services of the sync desired state')
+    parser.add_argument('--sync-changes', type=int, default=5, help='services changed by every sync operation')
+    parser.add_argument('--output', help='the file the JSON results are written to, standard output when omitted')
+    parser.add_argument('--baseline', help='JSON results to compare with, exits with 1 on regressions')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='throughput drop tolerated by --baseline')
+    args = parser.parse_args(argv)
+
+    server = None
+    fake = None
+    url = args.url
+    if args.in_process:
+        fake = seed(FakeKong(), services=args.services, consumers=args.consumers, plugins=args.plugins)
+        url = 'http://localhost:8001'
+    elif url is None:
+        server = FakeKongProcess(['--services', str(args.services), '--consumers', str(args.consumers),
+                                  '--plugins', str(args.plugins), '--latency', str(args.latency),
+                                  '--jitter', str(args.jitter)])
+        url = server.url
+    try:
+        results = []
+        if 'sync' in args.clients:
+            results += run_sync(url, args, fake=fake)
+        if 'async' in args.clients:
+            results += asyncio.run(run_async(url, args, fake=fake))
+    finally:
+        if server is not None:
+            server.close()
+
+    document = {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'options': {key: value for key, value in vars(args).items() if key not in ('output', 'baseline')},
+        },
+        'results': results,
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            document['regressions'] = compare(results, json.load(f), args.tolerance)
+    output = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 1 if document.get('regressions') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
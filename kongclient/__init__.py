@@ -1,2 +1,9 @@
 # -*- coding: utf-8 -*-
-from kongclient.client import KongClient
+from kongclient.lazy import lazy_exports
+
+__all__ = ['KongClient', 'AsyncKongClient']
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'KongClient': 'kongclient.client',
+    'AsyncKongClient': 'kongclient.aio',
+})
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+from kongclient.client import DEFAULT_TIMEOUT
+from kongclient.codec import Codec
+from kongclient.deadline import Deadline
+from kongclient.lazy import LazyManager
+from kongclient.singleflight import AsyncSingleFlight
+from kongclient import transport as transports
+
+
+class AsyncKongClient:
+    """ Asyncio Kong class for manipulating Kong resources (service, route, plugin, etc.).
+
+    Every manager method returns an awaitable, and `iter*` methods return async iterators.
+    Run many calls at once with `asyncio.gather`, `max_concurrency` caps how many of them
+    hit the Kong admin API simultaneously.
+
+    :param kong_url: The URL of the Kong admin API.
+    :param verify_ssl: If you want to disable SSL verification,
+    set verify_ssl is False, otherwise set it is True.
+    :param max_concurrency: The maximum number of requests in flight at the same time.
+    :param transport: The asyncio transport requests are sent through, either an AsyncTransport subclass
+    or a ready-made instance. Defaults to AsyncHttpxTransport.
+    :param cache: An optional EntityCache serving repeated reads from memory.
+    :param retry: An optional RetryPolicy replaying requests that failed on connection errors
+    or on transient http statuses (429, 502, 503, 504).
+    :param codec: An optional Codec choosing the JSON backend, and whether responses are returned
+    decoded, lazily decoded or raw. Defaults to responses decoded with the standard json module.
+    :param coalesce: Whether concurrent identical GETs share one in-flight request and its result.
+    :param tracker: An optional ChangeTracker returning the previously decoded object of unchanged responses.
+    :param metrics: An optional Metrics recording the latency, status and size of every request.
+    :param timeout: The default timeout of requests in seconds, either a number or a (connect, read) tuple,
+    only used when the transport is a class. None waits forever.
+    :param transport_options: Options of the transport class, e.g., pool_maxsize=200 or http2=True.
+    """
+
+    services = LazyManager('AsyncServiceManager')
+    routes = LazyManager('AsyncRouteManager')
+    consumers = LazyManager('AsyncConsumerManager')
+    plugins = LazyManager('AsyncPluginManager')
+    certificates = LazyManager('AsyncCertificateManager')
+    snis = LazyManager('AsyncSNIManager')
+    upstreams = LazyManager('AsyncUpstreamManager')
+    targets = LazyManager('AsyncTargetManager')
+    tags = LazyManager('AsyncTagManager')
+    info = LazyManager('AsyncNodeInfoManager')
+
+    def __init__(self, kong_url, verify_ssl=True, max_concurrency=None, transport=None, timeout=DEFAULT_TIMEOUT,
+                 cache=None, retry=None, codec=None, coalesce=False, tracker=None, metrics=None,
+                 **transport_options):
+        transport = transport or transports.AsyncHttpxTransport
+        if isinstance(transport, type):
+            transport = transport(base_url=kong_url, verify_ssl=verify_ssl, timeout=timeout,
+                                  max_concurrency=max_concurrency, **transport_options)
+        self.client = transport
+        self.cache = cache
+        self.retry = retry
+        self.codec = codec or Codec()
+        self.tracker = tracker
+        self.metrics = metrics
+        self.flights = AsyncSingleFlight() if coalesce else None
+
+    def deadline(self, seconds):
+        """ Return a context manager sharing a time budget between every request sent in its block.
+
+        :param seconds: The time budget, in seconds.
+        """
+        return Deadline(seconds)
+
+    async def close(self):
+        """ Close all pooled connections. """
+        await self.client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
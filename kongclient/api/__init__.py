@@ -1,11 +1,21 @@
 # -*- coding: utf-8 -*-
-from kongclient.api.service import ServiceManager
-from kongclient.api.route import RouteManager
-from kongclient.api.consumer import ConsumerManager
-from kongclient.api.plugin import PluginManager
-from kongclient.api.certificate import CertificateManager
-from kongclient.api.sni import SNIManager
-from kongclient.api.upstream import UpstreamManager
-from kongclient.api.target import TargetManager
-from kongclient.api.tag import TagManager
-from kongclient.api.node_info import NodeInfoManager
+from kongclient.lazy import lazy_exports
+
+# The manager classes of every module, imported on first access.
+MODULES = {
+    'service': ('ServiceManager', 'AsyncServiceManager'),
+    'route': ('RouteManager', 'AsyncRouteManager'),
+    'consumer': ('ConsumerManager', 'AsyncConsumerManager'),
+    'plugin': ('PluginManager', 'AsyncPluginManager'),
+    'certificate': ('CertificateManager', 'AsyncCertificateManager'),
+    'sni': ('SNIManager', 'AsyncSNIManager'),
+    'upstream': ('UpstreamManager', 'AsyncUpstreamManager'),
+    'target': ('TargetManager', 'AsyncTargetManager'),
+    'tag': ('TagManager', 'AsyncTagManager'),
+    'node_info': ('NodeInfoManager', 'AsyncNodeInfoManager'),
+}
+
+__all__ = [name for names in MODULES.values() for name in names]
+
+__getattr__, __dir__ = lazy_exports(__name__, {name: 'kongclient.api.%s' % module
+                                               for module, names in MODULES.items() for name in names})
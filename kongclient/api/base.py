@@ -1,5 +1,119 @@
 # -*- coding: utf-8 -*-
-from kongclient.exceptions import APIException
+import time
+
+from kongclient.cache import cache_key
+from kongclient.deadline import current_deadline, in_current_context
+from kongclient.exceptions import APIException, TransportException
+from kongclient.filters import project, tags_param
+
+# The default pool size of the transports, so bulk workers never queue for a connection.
+BULK_MAX_WORKERS = 10
+
+
+def check_status(resp, expected_status, method):
+    """ Raise an APIException if the response status is not the expected one.
+
+    :param resp: the http response returned by the Kong API.
+    :param expected_status: the http status code of a successful response, e.g., 200
+    :param method: the http method used to make request to the Kong API.
+    """
+    if resp.status_code != expected_status:
+        raise APIException(http_status=resp.status_code, message=resp.text, method=method, url=str(resp.url))
+
+
+def page_params(params=None, size=None):
+    """ Return a copy of the query string parameters of a page request, with its size if any. """
+    params = dict(params or {})
+    if size:
+        params['size'] = size
+    return params
+
+
+def list_key(url, params=None, size=None, fields=None):
+    """ Return the cache key of a list call, its projected fields included. """
+    params = page_params(params, size)
+    if fields:
+        params['fields'] = ','.join(fields)
+    return cache_key(url, params)
+
+
+def projected(entities, fields=None):
+    """ Iterate over the entities of a page, keeping only `fields` of every one, except for raw pages. """
+    for entity in entities:
+        yield project(entity, fields) if fields and not isinstance(entity, bytes) else entity
+
+
+class BulkResult:
+    """ The outcome of one item of a bulk operation.
+
+    :param item: The input item, e.g., the keyword arguments passed to `create`.
+    :param result: The value returned by the API call, if it succeeded.
+    :param error: The exception raised by the API call, if it failed.
+    """
+
+    def __init__(self, item, result=None, error=None):
+        self.item = item
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.ok:
+            return 'BulkResult(item=%r, result=%r)' % (self.item, self.result)
+        return 'BulkResult(item=%r, error=%r)' % (self.item, self.error)
+
+
+class _Attempts:
+    """ The attempts of one request: their timeout capped by the deadline of the current context,
+    their metrics and the delays between them, as set by the client retry policy.
+
+    :param api: instance of KongClient or AsyncKongClient.
+    :param method: the http method, e.g., 'GET'
+    :param url: a partial URL, e.g., '/services'
+    :param kwargs: the arguments of the transport request, updated with the timeout of every attempt.
+    """
+
+    def __init__(self, api, method, url, kwargs):
+        self.api = api
+        self.method = method
+        self.url = url
+        self.kwargs = kwargs
+        self.deadline = current_deadline()
+        self.started_at = time.monotonic()
+        self.attempt = 0
+        self.token = None
+
+    def start(self):
+        """ Start the next attempt. """
+        self.attempt += 1
+        if self.deadline is not None:
+            self.kwargs['timeout'] = self.deadline.timeout(self.api.client.timeout, method=self.method, url=self.url)
+        metrics = self.api.metrics
+        self.token = metrics.start(self.method, self.url) if metrics is not None else None
+
+    def end(self, response=None, error=None):
+        """ End the current attempt. """
+        if self.token is not None:
+            self.api.metrics.end(self.token, response=response, error=error)
+
+    def retry_delay(self, response=None, error=None):
+        """ End the current attempt and return the delay before the next one, None when it is not retried.
+
+        :param response: the response of the attempt, if it got one.
+        :param error: the TransportException raised by the attempt, if it failed.
+        """
+        self.end(response=response, error=error)
+        retry = self.api.retry
+        delay = retry.next_delay(self.method, self.attempt, self.started_at, response=response, error=error) \
+            if retry else None
+        if delay is None or (self.deadline is not None and delay >= self.deadline.remaining()):
+            return None
+        if self.api.metrics is not None:
+            self.api.metrics.retried(self.method, self.url)
+        return delay
 
 
 class Manager:
@@ -14,51 +128,218 @@ class Manager:
     def __init__(self, api):
         self.api = api
 
-    def _list(self, url, response_key):
-        """ List the collection.
+    def _invalidate(self, url):
+        """ Invalidate the cached responses affected by a write.
+
+        :param url: the partial URL written to, e.g., '/services/xxx_id'
+        """
+        # Flights first: a read starting in between must not share a flight started before the write
+        # while holding a cache generation taken after it.
+        if self.api.flights is not None:
+            self.api.flights.forget()
+        if self.api.cache is not None:
+            self.api.cache.invalidate(url)
+
+    def _cached(self, key):
+        """ Look a read up in the client cache.
+
+        :param key: the cache key of the read, e.g., '/services/xxx_id'
+        :return: a (hit, value, generation) tuple, generation being the one to store the value with on a miss.
+        """
+        cache = self.api.cache
+        if cache is None:
+            return False, None, None
+        hit, value = cache.get(key)
+        # Taken before the request, so that a write running meanwhile prevents caching a stale value.
+        return hit, value, None if hit else cache.generation(key)
+
+    def _store(self, key, value, generation):
+        """ Store a read in the client cache, see `_cached`. """
+        if self.api.cache is not None:
+            self.api.cache.set(key, value, generation)
+
+    def _coalesce(self, key, func):
+        """ Call func, sharing the in-flight call of an identical read when the client coalesces requests.
+
+        :param key: the cache key of the read, e.g., '/services/xxx_id'
+        :param func: the function sending the read, without arguments.
+        """
+        if self.api.flights is None:
+            return func()
+        return self.api.flights.do(key, func)
+
+    def _request(self, method, url, **kwargs):
+        """ Send a request through the client transport.
+
+        The request is retried according to the client retry policy, and its timeout is capped
+        by the deadline of the current context, if any.
+
+        :param method: the http method, e.g., 'GET'
+        :param url: a partial URL, e.g., '/services'
+        :param kwargs: the arguments of the transport request, e.g., params or json.
+        """
+        attempts = _Attempts(self.api, method, url, kwargs)
+        while True:
+            attempts.start()
+            try:
+                resp = self.api.client.request(method, url, **kwargs)
+            except TransportException as e:
+                delay = attempts.retry_delay(error=e)
+                if delay is None:
+                    raise
+            except BaseException as e:
+                # Any other error, or a cancellation, still ends the attempt but is never retried.
+                attempts.end(error=e)
+                raise
+            else:
+                delay = attempts.retry_delay(response=resp)
+                if delay is None:
+                    return resp
+            time.sleep(delay)
+
+    def _tracked(self, url, params=None):
+        """ Return the (key, entry) of a read in the client ChangeTracker, None when the client does not track changes.
+
+        :param url: a partial URL, e.g., '/services/xxx_id'
+        :param params: query string parameters, e.g., {'size': 100}
+        """
+        if self.api.tracker is None:
+            return None
+        key = cache_key(url, params)
+        return key, self.api.tracker.lookup(key)
+
+    def _read_headers(self, tracked):
+        """ Return the headers of a read, making it conditional when it is tracked, see `_tracked`. """
+        return self.api.tracker.headers(tracked[1]) if tracked is not None else None
+
+    def _read_response(self, resp, decode, tracked):
+        """ Check and decode the response of a read, see `_tracked`. """
+        if tracked is None:
+            check_status(resp, 200, 'GET')
+            return decode(resp.content)
+        key, entry = tracked
+        if resp.status_code != 304 or entry is None:
+            check_status(resp, 200, 'GET')
+        return self.api.tracker.decode(key, entry, resp, decode)
+
+    def _read(self, url, decode, params=None):
+        """ Send a GET and decode its response.
+
+        When the client tracks changes, the request is conditional and an unchanged response
+        returns the previously decoded object, see `kongclient.conditional.ChangeTracker`.
+
+        :param url: a partial URL, e.g., '/services/xxx_id'
+        :param decode: the function decoding the response bytes.
+        :param params: query string parameters, e.g., {'size': 100}
+        """
+        tracked = self._tracked(url, params)
+        resp = self._request('GET', url, params=params, headers=self._read_headers(tracked))
+        return self._read_response(resp, decode, tracked)
+
+    def _filters(self, tags=None, **filters):
+        """ Return the query string parameters of a list call, None when there is no filter.
+
+        :param tags: a string sent as is, e.g., 'admin,example', or a list of tags all required.
+        :param filters: the other filters, e.g., custom_id='1234', None values are left out.
+        """
+        params = {key: value for key, value in filters.items() if value is not None}
+        if tags:
+            params['tags'] = tags_param(tags)
+        return params or None
+
+    def _page_decoder(self, url, response_key):
+        """ Return the function decoding the pages of a collection into (entities, offset) tuples. """
+
+        def decode_page(content):
+            return self.api.codec.decode_page(content, response_key, url)
+
+        return decode_page
+
+    def _decoder(self, url):
+        """ Return the function decoding a single object read from url. """
+
+        def decode(content):
+            return self.api.codec.decode(content, url)
+
+        return decode
+
+    def _iter(self, url, response_key, params=None, size=None, fields=None):
+        """ Iterate over a paginated collection.
+
+        Pages are requested lazily, following the `offset` returned by Kong,
+        so only one page is held in memory at a time. In raw mode, every page is yielded as bytes.
+
+        :param url: a partial URL, e.g., '/services'
+        :param response_key: the key to be looked up in response dictionary, e.g., 'data'
+        :param params: query string parameters sent with every page request, e.g., {'tags': 'admin'}
+        :param size: the number of objects to be returned per page (Kong defaults to 100).
+        :param fields: only keep these keys of every object, as soon as its page is decoded, e.g., ('id', 'name')
+        """
+        params = page_params(params, size)
+        decode_page = self._page_decoder(url, response_key)
+        while True:
+            entities, offset = self._read(url, decode_page, params=params)
+            yield from projected(entities, fields)
+            if not offset:
+                return
+            params['offset'] = offset
+
+    def _list(self, url, response_key, params=None, size=None, fields=None):
+        """ List the collection, following all pages.
 
         :param url: a partial URL, e.g., '/services'
         :param response_key: the key to be looked up in response dictionary, e.g., 'data'
+        :param params: query string parameters, e.g., {'tags': 'admin'}
+        :param size: the number of objects to be requested per page.
+        :param fields: only keep these keys of every object, e.g., ('id', 'name')
         """
-        resp = self.api.client.get(url=url)
-        if resp.status_code != 200:
-            raise APIException(http_status=resp.status_code, message=resp.text, method='GET', url=resp.request.url)
-        body = resp.json()
-        return body[response_key]
+        key = list_key(url, params, size, fields)
+        hit, entities, generation = self._cached(key)
+        if hit:
+            return entities
+        entities = self._coalesce(key, lambda: list(self._iter(url=url, response_key=response_key, params=params,
+                                                                size=size, fields=fields)))
+        self._store(key, entities, generation)
+        return entities
 
     def _get(self, url):
         """ Get an object from collection.
 
         :param url: a partial URL, e.g., '/services/xxx_id'
         """
-        resp = self.api.client.get(url=url)
-        if resp.status_code != 200:
-            raise APIException(http_status=resp.status_code, message=resp.text, method='GET', url=resp.request.url)
-        body = resp.json()
+        hit, body, generation = self._cached(url)
+        if hit:
+            return body
+        body = self._coalesce(url, lambda: self._read(url, self._decoder(url)))
+        self._store(url, body, generation)
         return body
 
+    def _written(self, resp, url, expected_status, method):
+        """ Invalidate what a write changed, check its response and decode it, None for a 204 response.
+
+        :param resp: the http response returned by the Kong API.
+        :param url: the partial URL written to, e.g., '/services/xxx_id'
+        :param expected_status: the http status code of a successful response, e.g., 201
+        :param method: the http method of the write, e.g., 'POST'
+        """
+        self._invalidate(url)
+        check_status(resp, expected_status, method)
+        return self.api.codec.decode(resp.content, url) if expected_status != 204 else None
+
     def _create(self, url, body):
         """ Create an object.
 
         :param url: a partial URL, e.g., '/services'
         :param body: data that will be encoded as JSON and passed in POST request
         """
-        resp = self.api.client.post(url=url, json=body)
-        if resp.status_code != 201:
-            raise APIException(http_status=resp.status_code, message=resp.text, method='POST', url=resp.request.url)
-        body = resp.json()
-        return body
+        return self._written(self._request('POST', url, json=body), url, 201, 'POST')
 
     def _set(self, url, body=None):
         """ Set value for object attribute.
 
         :param url: a partial URL, e.g., '/targets/xxx_id/healthy'
         """
-        body = body if body is not None else {}
-        resp = self.api.client.post(url=url, json=body)
-        if resp.status_code != 204:
-            raise APIException(http_status=resp.status_code, message=resp.text, method='POST', url=resp.request.url)
-        return None
+        return self._written(self._request('POST', url, json=body if body is not None else {}), url, 204, 'POST')
 
     def _update(self, url, body):
         """ Update an object with PATCH method.
@@ -66,18 +347,175 @@ class Manager:
         :param url: a partial URL, e.g., '/services/xxx_id'
         :param body: data that will be encoded as JSON and passed in PATCH request
         """
-        resp = self.api.client.patch(url=url, json=body)
-        if resp.status_code != 200:
-            raise APIException(http_status=resp.status_code, message=resp.text, method='PATCH', url=resp.request.url)
-        body = resp.json()
-        return body
+        return self._written(self._request('PATCH', url, json=body), url, 200, 'PATCH')
 
     def _delete(self, url):
         """ Delete an object.
 
         :param url: a partial URL, e.g., '/services/xxx_id'
         """
-        resp = self.api.client.delete(url=url)
-        if resp.status_code != 204:
-            raise APIException(http_status= resp.status_code, message=resp.text, method='DELETE', url=resp.request.url)
-        return None
+        return self._written(self._request('DELETE', url), url, 204, 'DELETE')
+
+    def _bulk(self, func, calls, max_workers=None):
+        """ Run API calls over a bounded worker pool.
+
+        A failing call does not stop the others, its exception is recorded in its result instead.
+        Every call shares the deadline of the current context, if any.
+
+        :param func: the manager method to call, e.g., self.create
+        :param calls: a list of (item, args, kwargs) tuples, one per call.
+        :param max_workers: the maximum number of calls running at the same time.
+        :return: a list of BulkResult, in the order of calls.
+        """
+        def run(call):
+            item, args, kwargs = call
+            try:
+                return BulkResult(item, result=func(*args, **kwargs))
+            except Exception as e:
+                return BulkResult(item, error=e)
+
+        # Imported here, like asyncio in AsyncManager, so that importing a manager stays cheap.
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max_workers or BULK_MAX_WORKERS) as executor:
+            return list(executor.map(in_current_context(run), calls))
+
+    def bulk_create(self, items, max_workers=None):
+        """ Create many objects concurrently.
+
+        :param items: a list of dicts, each one holding the keyword arguments of `create`.
+        :param max_workers: the maximum number of requests running at the same time.
+        :return: a list of BulkResult, in the order of items.
+        """
+        return self._bulk(self.create, [(item, (), item) for item in items], max_workers=max_workers)
+
+    def bulk_update(self, items, max_workers=None):
+        """ Update many objects concurrently.
+
+        :param items: a list of (object_id, fields) tuples, fields being the keyword arguments of `update`.
+        :param max_workers: the maximum number of requests running at the same time.
+        :return: a list of BulkResult, in the order of items.
+        """
+        return self._bulk(self.update, [(item, (item[0],), item[1]) for item in items], max_workers=max_workers)
+
+    def bulk_delete(self, object_ids, max_workers=None):
+        """ Delete many objects concurrently.
+
+        :param object_ids: a list of unique identifiers or names of the objects to delete.
+        :param max_workers: the maximum number of requests running at the same time.
+        :return: a list of BulkResult, in the order of object_ids.
+        """
+        return self._bulk(self.delete, [(object_id, (object_id,), {}) for object_id in object_ids],
+                          max_workers=max_workers)
+
+
+class AsyncManager(Manager):
+    """ Basic manager type providing common operations as coroutines.
+
+    Concrete async managers inherit from their sync counterpart first and from this class second,
+    e.g., `class AsyncServiceManager(ServiceManager, AsyncManager)`, so every public method returns
+    an awaitable (or an async iterator for `iter*` methods) instead of blocking. Only the methods
+    sending requests are overridden, everything else is shared with `Manager`.
+
+    :param api: instance of AsyncKongClient for HTTP requests.
+    """
+
+    async def _coalesce(self, key, func):
+        """ Await func(), sharing the in-flight call of an identical read, see `Manager._coalesce`. """
+        if self.api.flights is None:
+            return await func()
+        return await self.api.flights.do(key, func)
+
+    async def _request(self, method, url, **kwargs):
+        """ Send a request through the client transport, see `Manager._request`. """
+        import asyncio
+        attempts = _Attempts(self.api, method, url, kwargs)
+        while True:
+            attempts.start()
+            try:
+                resp = await self.api.client.request(method, url, **kwargs)
+            except TransportException as e:
+                delay = attempts.retry_delay(error=e)
+                if delay is None:
+                    raise
+            except BaseException as e:
+                attempts.end(error=e)
+                raise
+            else:
+                delay = attempts.retry_delay(response=resp)
+                if delay is None:
+                    return resp
+            await asyncio.sleep(delay)
+
+    async def _read(self, url, decode, params=None):
+        """ Send a GET and decode its response, see `Manager._read`. """
+        tracked = self._tracked(url, params)
+        resp = await self._request('GET', url, params=params, headers=self._read_headers(tracked))
+        return self._read_response(resp, decode, tracked)
+
+    async def _iter(self, url, response_key, params=None, size=None, fields=None):
+        """ Iterate over a paginated collection, see `Manager._iter`. """
+        params = page_params(params, size)
+        decode_page = self._page_decoder(url, response_key)
+        while True:
+            entities, offset = await self._read(url, decode_page, params=params)
+            for entity in projected(entities, fields):
+                yield entity
+            if not offset:
+                return
+            params['offset'] = offset
+
+    async def _list(self, url, response_key, params=None, size=None, fields=None):
+        """ List the collection, following all pages, see `Manager._list`. """
+        key = list_key(url, params, size, fields)
+        hit, entities, generation = self._cached(key)
+        if hit:
+            return entities
+
+        async def fetch():
+            return [entity async for entity in self._iter(url=url, response_key=response_key, params=params,
+                                                           size=size, fields=fields)]
+
+        entities = await self._coalesce(key, fetch)
+        self._store(key, entities, generation)
+        return entities
+
+    async def _get(self, url):
+        """ Get an object from collection, see `Manager._get`. """
+        hit, body, generation = self._cached(url)
+        if hit:
+            return body
+        body = await self._coalesce(url, lambda: self._read(url, self._decoder(url)))
+        self._store(url, body, generation)
+        return body
+
+    async def _create(self, url, body):
+        """ Create an object, see `Manager._create`. """
+        return self._written(await self._request('POST', url, json=body), url, 201, 'POST')
+
+    async def _set(self, url, body=None):
+        """ Set value for object attribute, see `Manager._set`. """
+        return self._written(await self._request('POST', url, json=body if body is not None else {}), url, 204,
+                             'POST')
+
+    async def _update(self, url, body):
+        """ Update an object with PATCH method, see `Manager._update`. """
+        return self._written(await self._request('PATCH', url, json=body), url, 200, 'PATCH')
+
+    async def _delete(self, url):
+        """ Delete an object, see `Manager._delete`. """
+        return self._written(await self._request('DELETE', url), url, 204, 'DELETE')
+
+    async def _bulk(self, func, calls, max_workers=None):
+        """ Run API calls concurrently, see `Manager._bulk`. """
+        import asyncio
+        semaphore = asyncio.Semaphore(max_workers or BULK_MAX_WORKERS)
+
+        async def run(call):
+            item, args, kwargs = call
+            async with semaphore:
+                try:
+                    return BulkResult(item, result=await func(*args, **kwargs))
+                except Exception as e:
+                    return BulkResult(item, error=e)
+
+        return await asyncio.gather(*[run(call) for call in calls])
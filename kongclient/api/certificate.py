@@ -7,30 +7,63 @@ class CertificateManager(base.Manager):
 
     FIELDS = ('cert', 'key', 'tags', 'snis')
 
-    def list(self, tags):
+    def iter(self, tags=None, size=None, fields=None):
+        """ Iterate over all certificates, requesting pages lazily.
+
+        :param tags: A string associated to certificates in Kong, e.g, 'admin,example',
+        or a list of tags all required, see `kongclient.filters.any_tags` to require any of them.
+        :param size: The number of certificates to be requested per page.
+        :param fields: Only keep these keys of every certificate, e.g., ('id', 'tags').
+        """
+        return self._iter(url='/certificates', response_key='data', params=self._filters(tags=tags), size=size,
+                          fields=fields)
+
+    def list(self, tags=None, size=None, fields=None):
         """ Get a list of all certificates.
 
-        :param tags: A string associated to certificates in Kong, e.g, 'admin,example'
+        :param tags: A string associated to certificates in Kong, e.g, 'admin,example',
+        or a list of tags all required, see `kongclient.filters.any_tags` to require any of them.
+        :param size: The number of certificates to be requested per page.
+        :param fields: Only keep these keys of every certificate, e.g., ('id', 'tags').
+        """
+        return self._list(url='/certificates', response_key='data', params=self._filters(tags=tags), size=size,
+                          fields=fields)
+
+    def iter_services(self, certificate_id, size=None):
+        """ Iterate over services associated to a specific certificate.
+
+        :param certificate_id: The unique identifier of the Certificate
+        whose Services are to be retrieved.
+        :param size: The number of services to be requested per page.
         """
-        if tags:
-            return self._list(url='/certificates?tags=%s' % tags, response_key='data')
-        return self._list(url='/certificates', response_key='data')
+        return self._iter(url='/certificates/%s/services' % certificate_id, response_key='data', size=size)
 
-    def list_services(self, certificate_id):
+    def list_services(self, certificate_id, size=None):
         """ Get a list of services associated to a specific certificate.
 
         :param certificate_id: The unique identifier of the Certificate
         whose Services are to be retrieved.
+        :param size: The number of services to be requested per page.
         """
-        return self._list(url='/certificates/%s/services' % certificate_id, response_key='data')
+        return self._list(url='/certificates/%s/services' % certificate_id, response_key='data', size=size)
 
-    def list_snis(self, certificate_id):
+    def iter_snis(self, certificate_id, size=None):
+        """ Iterate over snis associated to a specific certificate.
+
+        :param certificate_id: The unique identifier of the Certificate
+        whose SNIs are to be retrieved.
+        :param size: The number of SNIs to be requested per page.
+        """
+        return self._iter(url='/certificates/%s/snis' % certificate_id, response_key='data', size=size)
+
+    def list_snis(self, certificate_id, size=None):
         """ Get a list of snis associated to a specific certificate.
 
         :param certificate_id: The unique identifier of the Certificate
         whose SNIs are to be retrieved.
+        :param size: The number of SNIs to be requested per page.
         """
-        return self._list(url='/certificates/%s/snis' % certificate_id, response_key='data')
+        return self._list(url='/certificates/%s/snis' % certificate_id, response_key='data', size=size)
 
     def get(self, certificate_id):
         """ Get details of a certificate.
@@ -128,3 +161,7 @@ class CertificateManager(base.Manager):
         """
         body = {'name': name, 'tags': tags or [name]}
         return self._create(url='/certificates/%s/snis' % certificate_id, body=body)
+
+
+class AsyncCertificateManager(CertificateManager, base.AsyncManager):
+    """ Asyncio version of CertificateManager, every method returns an awaitable. """
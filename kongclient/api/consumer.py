@@ -7,22 +7,47 @@ class ConsumerManager(base.Manager):
 
     FIELDS = ('username', 'custom_id', 'tags')
 
-    def list(self, tags=None):
+    def iter(self, tags=None, size=None, custom_id=None, fields=None):
+        """ Iterate over all consumers, requesting pages lazily.
+
+        :param tags: A string associated with Consumers, for filtering,
+        or a list of tags all required, see `kongclient.filters.any_tags` to require any of them.
+        :param size: The number of consumers to be requested per page.
+        :param custom_id: Only return the consumer with this custom_id.
+        :param fields: Only keep these keys of every consumer, e.g., ('id', 'username').
+        """
+        params = self._filters(tags=tags, custom_id=custom_id)
+        return self._iter(url='/consumers', response_key='data', params=params, size=size, fields=fields)
+
+    def list(self, tags=None, size=None, custom_id=None, fields=None):
         """ Get a list of consumers.
 
-        :param tags: A string associated with Consumers, for filtering.
+        :param tags: A string associated with Consumers, for filtering,
+        or a list of tags all required, see `kongclient.filters.any_tags` to require any of them.
+        :param size: The number of consumers to be requested per page.
+        :param custom_id: Only return the consumer with this custom_id.
+        :param fields: Only keep these keys of every consumer, e.g., ('id', 'username').
         """
-        if tags:
-            return self._list(url='/consumers?tags=%s' % tags, response_key='data')
-        return self._list(url='/consumers', response_key='data')
+        params = self._filters(tags=tags, custom_id=custom_id)
+        return self._list(url='/consumers', response_key='data', params=params, size=size, fields=fields)
+
+    def iter_plugins(self, consumer_id, size=None):
+        """ Iterate over plugins associated to a specific consumer.
 
-    def list_plugins(self, consumer_id):
+        :param consumer_id: The unique identifier or the name attribute
+        of the Consumer whose Plugins are to be retrieved.
+        :param size: The number of plugins to be requested per page.
+        """
+        return self._iter(url='/consumers/%s/plugins' % consumer_id, response_key='data', size=size)
+
+    def list_plugins(self, consumer_id, size=None):
         """ Get a list of plugins associated to a specific consumer.
 
         :param consumer_id: The unique identifier or the name attribute
         of the Consumer whose Plugins are to be retrieved.
+        :param size: The number of plugins to be requested per page.
         """
-        return self._list(url='/consumers/%s/plugins' % consumer_id, response_key='data')
+        return self._list(url='/consumers/%s/plugins' % consumer_id, response_key='data', size=size)
 
     def get(self, consumer_id):
         """ Get details of a consumer.
@@ -112,3 +137,7 @@ class ConsumerManager(base.Manager):
         if config:
             body['config'] = config
         return self._create(url='/consumers/%s/plugins' % consumer_id, body=body)
+
+
+class AsyncConsumerManager(ConsumerManager, base.AsyncManager):
+    """ Asyncio version of ConsumerManager, every method returns an awaitable. """
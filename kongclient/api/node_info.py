@@ -12,3 +12,7 @@ class NodeInfoManager(base.Manager):
     def get_node_status(self):
         """ Retrieve node status. """
         return self._get(url='/status')
+
+
+class AsyncNodeInfoManager(NodeInfoManager, base.AsyncManager):
+    """ Asyncio version of NodeInfoManager, every method returns an awaitable. """
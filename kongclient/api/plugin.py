@@ -8,14 +8,27 @@ class PluginManager(base.Manager):
     FIELDS = ('name', 'route', 'service', 'consumer',
               'config', 'run_on', 'protocols', 'enabled', 'tags')
 
-    def list(self, tags=None):
+    def iter(self, tags=None, size=None, fields=None):
+        """ Iterate over all plugins, requesting pages lazily.
+
+        :param tags: A string associated with Plugins, for filtering,
+        or a list of tags all required, see `kongclient.filters.any_tags` to require any of them.
+        :param size: The number of plugins to be requested per page.
+        :param fields: Only keep these keys of every plugin, e.g., ('id', 'name').
+        """
+        return self._iter(url='/plugins', response_key='data', params=self._filters(tags=tags), size=size,
+                          fields=fields)
+
+    def list(self, tags=None, size=None, fields=None):
         """ Get a list of plugins.
 
-        :param tags: A string associated with Plugins, for filtering.
+        :param tags: A string associated with Plugins, for filtering,
+        or a list of tags all required, see `kongclient.filters.any_tags` to require any of them.
+        :param size: The number of plugins to be requested per page.
+        :param fields: Only keep these keys of every plugin, e.g., ('id', 'name').
         """
-        if tags:
-            return self._list(url='/plugins?tags=%s' % tags, response_key='data')
-        return self._list(url='/plugins', response_key='data')
+        return self._list(url='/plugins', response_key='data', params=self._filters(tags=tags), size=size,
+                          fields=fields)
 
     def get(self, plugin_id):
         """ Get details of a plugin.
@@ -171,3 +184,7 @@ class PluginManager(base.Manager):
         :param plugin_id: The unique identifier of the Plugin to delete.
         """
         return self._delete(url='/consumers/%s/plugins/%s' % (consumer_id, plugin_id))
+
+
+class AsyncPluginManager(PluginManager, base.AsyncManager):
+    """ Asyncio version of PluginManager, every method returns an awaitable. """
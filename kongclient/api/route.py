@@ -9,22 +9,43 @@ class RouteManager(base.Manager):
               'https_redirect_status_code', 'regex_priority', 'strip_path',
               'preserve_host', 'snis', 'sources', 'destinations', 'service', 'tags')
 
-    def list(self, tags=None):
+    def iter(self, tags=None, size=None, fields=None):
+        """ Iterate over all routes, requesting pages lazily.
+
+        :param tags: A string associated with Routes, for filtering,
+        or a list of tags all required, see `kongclient.filters.any_tags` to require any of them.
+        :param size: The number of routes to be requested per page.
+        :param fields: Only keep these keys of every route, e.g., ('id', 'name').
+        """
+        return self._iter(url='/routes', response_key='data', params=self._filters(tags=tags), size=size, fields=fields)
+
+    def list(self, tags=None, size=None, fields=None):
         """ Get a list of all routes.
 
-        :param tags: A string associated with Routes, for filtering.
+        :param tags: A string associated with Routes, for filtering,
+        or a list of tags all required, see `kongclient.filters.any_tags` to require any of them.
+        :param size: The number of routes to be requested per page.
+        :param fields: Only keep these keys of every route, e.g., ('id', 'name').
+        """
+        return self._list(url='/routes', response_key='data', params=self._filters(tags=tags), size=size, fields=fields)
+
+    def iter_plugins(self, route_id, size=None):
+        """ Iterate over plugins associated to a specific route.
+
+        :param route_id: The unique identifier or the name attribute
+        of the Route whose Plugins are to be retrieved.
+        :param size: The number of plugins to be requested per page.
         """
-        if tags:
-            return self._list(url='/routes?tags=%s' % tags, response_key='data')
-        return self._list(url='/routes', response_key='data')
+        return self._iter(url='/routes/%s/plugins' % route_id, response_key='data', size=size)
 
-    def list_plugins(self, route_id):
+    def list_plugins(self, route_id, size=None):
         """ Get a list of plugins associated to a specific route.
 
         :param route_id: The unique identifier or the name attribute
         of the Route whose Plugins are to be retrieved.
+        :param size: The number of plugins to be requested per page.
         """
-        return self._list(url='/routes/%s/plugins' % route_id, response_key='data')
+        return self._list(url='/routes/%s/plugins' % route_id, response_key='data', size=size)
 
     def get(self, route_id):
         """ Get details of a route.
@@ -175,3 +196,7 @@ class RouteManager(base.Manager):
         if config:
             body['config'] = config
         return self._create(url='/routes/%s/plugins' % route_id, body=body)
+
+
+class AsyncRouteManager(RouteManager, base.AsyncManager):
+    """ Asyncio version of RouteManager, every method returns an awaitable. """
@@ -8,30 +8,63 @@ class ServiceManager(base.Manager):
     FIELDS = ('name', 'protocol', 'host', 'port', 'path', 'url', 'retries',
               'connect_timeout', 'write_timeout', 'read_timeout', 'client_certificate', 'tags')
 
-    def list(self, tags=None):
+    def iter(self, tags=None, size=None, fields=None):
+        """ Iterate over all services, requesting pages lazily.
+
+        :param tags: A string associated to services in Kong, e.g, 'admin,example',
+        or a list of tags all required, see `kongclient.filters.any_tags` to require any of them.
+        :param size: The number of services to be requested per page.
+        :param fields: Only keep these keys of every service, e.g., ('id', 'name').
+        """
+        return self._iter(url='/services', response_key='data', params=self._filters(tags=tags), size=size,
+                          fields=fields)
+
+    def list(self, tags=None, size=None, fields=None):
         """ Get a list of all services.
 
-        :param tags: A string associated to services in Kong, e.g, 'admin,example'
+        :param tags: A string associated to services in Kong, e.g, 'admin,example',
+        or a list of tags all required, see `kongclient.filters.any_tags` to require any of them.
+        :param size: The number of services to be requested per page.
+        :param fields: Only keep these keys of every service, e.g., ('id', 'name').
+        """
+        return self._list(url='/services', response_key='data', params=self._filters(tags=tags), size=size,
+                          fields=fields)
+
+    def iter_routes(self, service_id, size=None):
+        """ Iterate over routes associated to a specific service.
+
+        :param service_id: The unique identifier or the name attribute
+        of the Service whose Routes are to be retrieved.
+        :param size: The number of routes to be requested per page.
         """
-        if tags:
-            return self._list(url='/services?tags=%s' % tags, response_key='data')
-        return self._list(url='/services', response_key='data')
+        return self._iter(url='/services/%s/routes' % service_id, response_key='data', size=size)
 
-    def list_routes(self, service_id):
+    def list_routes(self, service_id, size=None):
         """ Get a list of routes associated to a specific service.
 
         :param service_id: The unique identifier or the name attribute
         of the Service whose Routes are to be retrieved.
+        :param size: The number of routes to be requested per page.
         """
-        return self._list(url='/services/%s/routes' % service_id, response_key='data')
+        return self._list(url='/services/%s/routes' % service_id, response_key='data', size=size)
 
-    def list_plugins(self, service_id):
+    def iter_plugins(self, service_id, size=None):
+        """ Iterate over plugins associated to a specific service.
+
+        :param service_id: The unique identifier or the name attribute
+        of the Service whose Plugins are to be retrieved.
+        :param size: The number of plugins to be requested per page.
+        """
+        return self._iter(url='/services/%s/plugins' % service_id, response_key='data', size=size)
+
+    def list_plugins(self, service_id, size=None):
         """ Get a list of plugins associated to a specific service.
 
         :param service_id: The unique identifier or the name attribute
         of the Service whose Plugins are to be retrieved.
+        :param size: The number of plugins to be requested per page.
         """
-        return self._list(url='/services/%s/plugins' % service_id, response_key='data')
+        return self._list(url='/services/%s/plugins' % service_id, response_key='data', size=size)
 
     def get(self, service_id):
         """ Get details of a service.
@@ -241,3 +274,7 @@ class ServiceManager(base.Manager):
         if config:
             body['config'] = config
         return self._create(url='/services/%s/plugins' % service_id, body=body)
+
+
+class AsyncServiceManager(ServiceManager, base.AsyncManager):
+    """ Asyncio version of ServiceManager, every method returns an awaitable. """
@@ -7,14 +7,25 @@ class SNIManager(base.Manager):
 
     FIELDS = ('name', 'certificate', 'tags')
 
-    def list(self, tags=None):
+    def iter(self, tags=None, size=None, fields=None):
+        """ Iterate over all SNIs, requesting pages lazily.
+
+        :param tags: A string associated to SNIs in Kong, e.g, 'admin,example',
+        or a list of tags all required, see `kongclient.filters.any_tags` to require any of them.
+        :param size: The number of SNIs to be requested per page.
+        :param fields: Only keep these keys of every SNI, e.g., ('id', 'name').
+        """
+        return self._iter(url='/snis', response_key='data', params=self._filters(tags=tags), size=size, fields=fields)
+
+    def list(self, tags=None, size=None, fields=None):
         """ Get a list of SNIs.
 
-        :param tags: A string associated to SNIs in Kong, e.g, 'admin,example'
+        :param tags: A string associated to SNIs in Kong, e.g, 'admin,example',
+        or a list of tags all required, see `kongclient.filters.any_tags` to require any of them.
+        :param size: The number of SNIs to be requested per page.
+        :param fields: Only keep these keys of every SNI, e.g., ('id', 'name').
         """
-        if tags:
-            return self._list(url='/snis?tags=%s' % tags, response_key='data')
-        return self._list(url='/snis', response_key='data')
+        return self._list(url='/snis', response_key='data', params=self._filters(tags=tags), size=size, fields=fields)
 
     def get(self, sni_id):
         """ Get details of a SNI.
@@ -75,3 +86,7 @@ class SNIManager(base.Manager):
         :param sni_id: The unique identifier or the name of the SNI to delete.
         """
         return self._delete(url='/certificates/%s/snis/%s' % (certificate_id, sni_id))
+
+
+class AsyncSNIManager(SNIManager, base.AsyncManager):
+    """ Asyncio version of SNIManager, every method returns an awaitable. """
@@ -5,13 +5,36 @@ from kongclient.api import base
 class TagManager(base.Manager):
     """ Manager class for manipulating kong tags. """
 
-    def list(self):
-        """ Get a list of all tags. """
-        return self._list(url='/tags', response_key='data')
+    def iter(self, size=None):
+        """ Iterate over all tags, requesting pages lazily.
 
-    def get(self, tag):
+        :param size: The number of tags to be requested per page.
+        """
+        return self._iter(url='/tags', response_key='data', size=size)
+
+    def list(self, size=None):
+        """ Get a list of all tags.
+
+        :param size: The number of tags to be requested per page.
+        """
+        return self._list(url='/tags', response_key='data', size=size)
+
+    def iter_by_tag(self, tag, size=None):
+        """ Iterate over entities with the specified tag, requesting pages lazily.
+
+        :param tag: A string associated with entities, e.g, 'user-level'
+        :param size: The number of entities to be requested per page.
+        """
+        return self._iter(url='/tags/%s' % tag, response_key='data', size=size)
+
+    def get(self, tag, size=None):
         """ Get a list of entities with the specified tag.
 
         :param tag: A string associated with entities, e.g, 'user-level'
+        :param size: The number of entities to be requested per page.
         """
-        return self._list(url='/tags/%s' % tag, response_key='data')
+        return self._list(url='/tags/%s' % tag, response_key='data', size=size)
+
+
+class AsyncTagManager(TagManager, base.AsyncManager):
+    """ Asyncio version of TagManager, every method returns an awaitable. """
@@ -5,6 +5,8 @@ from kongclient.api import base
 class TargetManager(base.Manager):
     """ Manager class for manipulating kong targets. """
 
+    FIELDS = ('target', 'weight', 'tags')
+
     def get_upstream(self, target_id):
         """ Get a upstream associated to a specific target.
 
@@ -32,6 +34,16 @@ class TargetManager(base.Manager):
         """
         return self._set(url='/upstreams/%s/targets/%s/healthy' % (upstream_id, target_id))
 
+    def set_unhealthy_address_by_upstream(self, upstream_id, target_id, address):
+        """ Set target address as unhealthy.
+
+        :param upstream_id: The unique identifier or the name of the upstream.
+        :param target_id: The host/port combination element of the target to set as unhealthy,
+        or the `id` of an existing target entry.
+        :param address: The host/port combination element of the address to set as unhealthy.
+        """
+        return self._set(url='/upstreams/%s/targets/%s/%s/unhealthy' % (upstream_id, target_id, address))
+
     def set_unhealthy_target_by_upstream(self, upstream_id, target_id):
         """ Set target as unhealthy.
 
@@ -41,6 +53,17 @@ class TargetManager(base.Manager):
         """
         return self._set(url='/upstreams/%s/targets/%s/unhealthy' % (upstream_id, target_id))
 
+    def update_target_by_upstream(self, upstream_id, target_id, **kwargs):
+        """ Update a target by upstream_id, targets being unique per upstream since Kong 2.x.
+
+        :param upstream_id: The unique identifier or the name of the upstream.
+        :param target_id: The host:port combination element of the target to update,
+        or the `id` of an existing target entry.
+        :param kwargs: Data that will be updated, e.g., weight=50.
+        """
+        body = {k: v for k, v in kwargs.items() if k in self.FIELDS}
+        return self._update(url='/upstreams/%s/targets/%s' % (upstream_id, target_id), body=body)
+
     def delete_target_by_upstream(self, upstream_id, target_id):
         """ Delete target by upstream_id.
 
@@ -50,3 +73,37 @@ class TargetManager(base.Manager):
         or the `id` of an existing target entry.
         """
         return self._delete(url='/upstreams/%s/targets/%s' % (upstream_id, target_id))
+
+    def _set_health(self, upstream_id, target_id, address=None, healthy=True):
+        """ Set a target, or one of its addresses, as healthy or unhealthy. """
+        if address is None:
+            if healthy:
+                return self.set_healthy_target_by_upstream(upstream_id, target_id)
+            return self.set_unhealthy_target_by_upstream(upstream_id, target_id)
+        if healthy:
+            return self.set_healthy_address_by_upstream(upstream_id, target_id, address)
+        return self.set_unhealthy_address_by_upstream(upstream_id, target_id, address)
+
+    def bulk_set_healthy(self, items, max_workers=None):
+        """ Set many targets or addresses as healthy concurrently.
+
+        :param items: a list of (upstream_id, target_id) or (upstream_id, target_id, address) tuples.
+        :param max_workers: the maximum number of requests running at the same time.
+        :return: a list of BulkResult, in the order of items.
+        """
+        return self._bulk(self._set_health, [(item, tuple(item), {'healthy': True}) for item in items],
+                          max_workers=max_workers)
+
+    def bulk_set_unhealthy(self, items, max_workers=None):
+        """ Set many targets or addresses as unhealthy concurrently.
+
+        :param items: a list of (upstream_id, target_id) or (upstream_id, target_id, address) tuples.
+        :param max_workers: the maximum number of requests running at the same time.
+        :return: a list of BulkResult, in the order of items.
+        """
+        return self._bulk(self._set_health, [(item, tuple(item), {'healthy': False}) for item in items],
+                          max_workers=max_workers)
+
+
+class AsyncTargetManager(TargetManager, base.AsyncManager):
+    """ Asyncio version of TargetManager, every method returns an awaitable. """
@@ -1,5 +1,37 @@
 # -*- coding: utf-8 -*-
+import time
+
 from kongclient.api import base
+from kongclient.deadline import Deadline
+
+
+def _health_states(health):
+    """ Map every target, by id and by host:port, and every (target, address) of an upstream health
+    response to its health, e.g., 'HEALTHY'.
+    """
+    states = {}
+    for target in health.get('data') or ():
+        for key in (target.get('id'), target.get('target')):
+            states[key] = target.get('health')
+            for address in (target.get('data') or {}).get('addresses') or ():
+                states[(key, '%s:%s' % (address.get('ip'), address.get('port')))] = address.get('health')
+    return states
+
+
+def _pending_health(items, desired, results):
+    """ Return the items whose health is not the desired one yet.
+
+    :param items: a list of (upstream_id, target_id) or (upstream_id, target_id, address) tuples.
+    :param desired: the desired health, e.g., 'HEALTHY'.
+    :param results: the BulkResult of `get_upstream_health` for the upstreams of the items.
+    """
+    states = {result.item: _health_states(result.result) for result in results if result.ok}
+    pending = []
+    for item in items:
+        key = item[1] if len(item) < 3 else (item[1], item[2])
+        if states.get(item[0], {}).get(key) != desired:
+            pending.append(item)
+    return pending
 
 
 class UpstreamManager(base.Manager):
@@ -8,30 +40,63 @@ class UpstreamManager(base.Manager):
     FIELDS = ('name', 'algorithm', 'hash_on', 'hash_fallback', 'hash_on_header', 'hash_fallback_header',
               'hash_on_cookie', 'hash_on_cookie_path', 'slots', 'healthchecks', 'tags', 'host_header')
 
-    def list(self, tags=None):
+    def iter(self, tags=None, size=None, fields=None):
+        """ Iterate over all upstreams, requesting pages lazily.
+
+        :param tags: A string associated to Upstreams in Kong, e.g, 'admin,example',
+        or a list of tags all required, see `kongclient.filters.any_tags` to require any of them.
+        :param size: The number of upstreams to be requested per page.
+        :param fields: Only keep these keys of every upstream, e.g., ('id', 'name').
+        """
+        return self._iter(url='/upstreams', response_key='data', params=self._filters(tags=tags), size=size,
+                          fields=fields)
+
+    def list(self, tags=None, size=None, fields=None):
         """ Get a list of upstreams.
 
-        :param tags: A string associated to Upstreams in Kong, e.g, 'admin,example'
+        :param tags: A string associated to Upstreams in Kong, e.g, 'admin,example',
+        or a list of tags all required, see `kongclient.filters.any_tags` to require any of them.
+        :param size: The number of upstreams to be requested per page.
+        :param fields: Only keep these keys of every upstream, e.g., ('id', 'name').
+        """
+        return self._list(url='/upstreams', response_key='data', params=self._filters(tags=tags), size=size,
+                          fields=fields)
+
+    def iter_targets(self, upstream_id, size=None):
+        """ Iterate over targets associated to a specific upstream.
+
+        :param upstream_id: The unique identifier or the name attribute
+        of the Upstream whose Targets are to be retrieved.
+        :param size: The number of targets to be requested per page.
         """
-        if tags:
-            return self._list(url='/upstreams?tags=%s' % tags, response_key='data')
-        return self._list(url='/upstreams', response_key='data')
+        return self._iter(url='/upstreams/%s/targets' % upstream_id, response_key='data', size=size)
 
-    def list_targets(self, upstream_id):
+    def list_targets(self, upstream_id, size=None):
         """ Get a list of targets associated to a specific upstream.
 
         :param upstream_id: The unique identifier or the name attribute
         of the Upstream whose Targets are to be retrieved.
+        :param size: The number of targets to be requested per page.
         """
-        return self._list(url='/upstreams/%s/targets' % upstream_id, response_key='data')
+        return self._list(url='/upstreams/%s/targets' % upstream_id, response_key='data', size=size)
 
-    def list_all_targets(self, upstream_id):
+    def iter_all_targets(self, upstream_id, size=None):
+        """ Iterate over all targets associated to a specific upstream.
+
+        :param upstream_id: The unique identifier or the name attribute
+        of the Upstream whose Targets are to be retrieved.
+        :param size: The number of targets to be requested per page.
+        """
+        return self._iter(url='/upstreams/%s/targets/all/' % upstream_id, response_key='data', size=size)
+
+    def list_all_targets(self, upstream_id, size=None):
         """ Get a list of all targets associated to a specific upstream.
 
         :param upstream_id: The unique identifier or the name attribute
         of the Upstream whose Targets are to be retrieved.
+        :param size: The number of targets to be requested per page.
         """
-        return self._list(url='/upstreams/%s/targets/all/' % upstream_id, response_key='data')
+        return self._list(url='/upstreams/%s/targets/all/' % upstream_id, response_key='data', size=size)
 
     def get(self, upstream_id):
         """ Get details of a Upstream.
@@ -47,6 +112,36 @@ class UpstreamManager(base.Manager):
         """
         return self._get(url='/upstreams/%s/health/' % upstream_id)
 
+    def _health_calls(self, items):
+        """ Return the `get_upstream_health` calls of the upstreams of items, one per upstream. """
+        upstream_ids = list(dict.fromkeys(item[0] for item in items))
+        return [(upstream_id, (upstream_id,), {}) for upstream_id in upstream_ids]
+
+    def wait_for_health(self, items, healthy=True, timeout=60, interval=1, max_workers=None):
+        """ Poll the health of upstreams until targets or addresses reach a health state.
+
+        Every round fetches the health of the upstreams still having pending items, concurrently,
+        one request per upstream.
+
+        :param items: a list of (upstream_id, target_id) or (upstream_id, target_id, address) tuples,
+        e.g., the items passed to `TargetManager.bulk_set_healthy`.
+        :param healthy: Whether the items must become healthy or unhealthy.
+        :param timeout: The maximum time spent waiting, in seconds.
+        :param interval: The delay between two rounds, in seconds.
+        :param max_workers: the maximum number of requests running at the same time.
+        :return: the items that did not reach the health state, an empty list when all did.
+        """
+        desired = 'HEALTHY' if healthy else 'UNHEALTHY'
+        pending = list(items)
+        with Deadline(timeout) as deadline:
+            while pending:
+                results = self._bulk(self.get_upstream_health, self._health_calls(pending), max_workers=max_workers)
+                pending = _pending_health(pending, desired, results)
+                if not pending or deadline.remaining() <= interval:
+                    break
+                time.sleep(interval)
+        return pending
+
     def create(self, name, algorithm='round-robin', hash_on='none', hash_fallback='none', hash_on_header=None,
                hash_fallback_header=None, hash_on_cookie=None, hash_on_cookie_path='/', slots=10000,
                healthchecks=None, tags=None, host_header=None):
@@ -147,3 +242,23 @@ class UpstreamManager(base.Manager):
         body = {'target': target, 'weight': weight, 'tags': tags or [target]}
         return self._create(url='/upstreams/%s/targets' % upstream_id, body=body)
 
+
+class AsyncUpstreamManager(UpstreamManager, base.AsyncManager):
+    """ Asyncio version of UpstreamManager, every method returns an awaitable. """
+
+    async def wait_for_health(self, items, healthy=True, timeout=60, interval=1, max_workers=None):
+        """ Poll the health of upstreams until targets or addresses reach a health state,
+        see `UpstreamManager.wait_for_health`.
+        """
+        import asyncio
+        desired = 'HEALTHY' if healthy else 'UNHEALTHY'
+        pending = list(items)
+        with Deadline(timeout) as deadline:
+            while pending:
+                results = await self._bulk(self.get_upstream_health, self._health_calls(pending),
+                                           max_workers=max_workers)
+                pending = _pending_health(pending, desired, results)
+                if not pending or deadline.remaining() <= interval:
+                    break
+                await asyncio.sleep(interval)
+        return pending
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+# Collection names as they appear in Kong admin URLs, with their singular forms.
+ENTITY_TYPES = {
+    'services': 'services', 'service': 'services',
+    'routes': 'routes', 'route': 'routes',
+    'consumers': 'consumers', 'consumer': 'consumers',
+    'plugins': 'plugins', 'plugin': 'plugins',
+    'certificates': 'certificates', 'certificate': 'certificates',
+    'snis': 'snis', 'sni': 'snis',
+    'upstreams': 'upstreams', 'upstream': 'upstreams',
+    'targets': 'targets', 'target': 'targets',
+    'tags': 'tags',
+}
+
+# Writing an entity of a type also changes entities of these types, e.g., deleting a service
+# deletes its plugins and setting a target health changes the upstream health.
+CASCADES = {
+    'services': ('plugins',),
+    'routes': ('plugins',),
+    'consumers': ('plugins',),
+    'upstreams': ('targets',),
+    'targets': ('upstreams',),
+    'certificates': ('snis',),
+}
+
+
+def url_types(url):
+    """ Return the entity types an URL refers to, e.g., {'services', 'routes'} for '/services/xxx/routes'. """
+    path = url.split('?', 1)[0]
+    return {ENTITY_TYPES[segment] for segment in path.split('/') if segment in ENTITY_TYPES}
+
+
+def written_type(url):
+    """ Return the type of the entity an URL writes, i.e. its last collection, e.g., 'routes' for
+    '/services/xxx/routes' or 'services' for '/routes/xxx/service'.
+    """
+    path = url.split('?', 1)[0]
+    segments = [ENTITY_TYPES[segment] for segment in path.split('/') if segment in ENTITY_TYPES]
+    return segments[-1] if segments else None
+
+
+def cache_key(url, params=None):
+    """ Return the cache key of a request, the URL with its sorted query string. """
+    if not params:
+        return url
+    return '%s?%s' % (url, urlencode(sorted(params.items()), doseq=True))
+
+
+class EntityCache:
+    """ In-process LRU cache of Kong admin API responses, keyed by resource URL.
+
+    Entries expire after a TTL depending on the type of their first URL segment, and writes
+    invalidate every entry referring to the written type, including nested URLs such as
+    '/services/xxx/routes'. Cached objects are shared between callers and must not be mutated.
+
+    A read racing a write must not store what it read before the write: readers take the
+    `generation` of their key before sending the request and pass it to `set`, which drops
+    the value if an invalidation of one of the key types happened in between.
+
+    :param maxsize: The maximum number of entries, the least recently used ones are evicted first.
+    :param ttl: The default time-to-live of an entry, in seconds.
+    :param ttls: Per entity type time-to-live, e.g., {'plugins': 5, 'services': 300}.
+    A TTL of 0 disables caching for that type.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60, ttls=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._keys_by_type = {}
+        self._generations = {}
+        self._cleared = 0
+        self._lock = threading.Lock()
+
+    def _ttl(self, key):
+        # Health endpoints report live state, polling them must always reach Kong.
+        if '/health' in key.split('?', 1)[0]:
+            return 0
+        segment = key.split('?', 1)[0].strip('/').split('/', 1)[0]
+        return self.ttls.get(ENTITY_TYPES.get(segment, segment), self.ttl)
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+        for entity_type in url_types(key):
+            keys = self._keys_by_type.get(entity_type)
+            if keys is not None:
+                keys.discard(key)
+
+    def _generation(self, key):
+        return (self._cleared,) + tuple(sorted((entity_type, self._generations.get(entity_type, 0))
+                                               for entity_type in url_types(key)))
+
+    def generation(self, key):
+        """ Return the generation of an entry, to be passed to `set` once the value is read.
+
+        :param key: a cache key as returned by `cache_key`.
+        """
+        with self._lock:
+            return self._generation(key)
+
+    def get(self, key):
+        """ Look an entry up.
+
+        :param key: a cache key as returned by `cache_key`.
+        :return: a (hit, value) tuple.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value, generation=None):
+        """ Store an entry.
+
+        :param key: a cache key as returned by `cache_key`.
+        :param value: the decoded response.
+        :param generation: the generation of the entry before the value was read, as returned by `generation`.
+        The value is not stored if the entry was invalidated since.
+        """
+        ttl = self._ttl(key)
+        if not ttl:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation(key):
+                return
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            for entity_type in url_types(key):
+                self._keys_by_type.setdefault(entity_type, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, url):
+        """ Invalidate the entries affected by a write to an URL.
+
+        :param url: the partial URL written to, e.g., '/services/xxx/routes'
+        """
+        entity_type = written_type(url)
+        if entity_type is None:
+            return
+        types = (entity_type, 'tags') + CASCADES.get(entity_type, ())
+        with self._lock:
+            for invalidated_type in types:
+                self._generations[invalidated_type] = self._generations.get(invalidated_type, 0) + 1
+                for key in list(self._keys_by_type.get(invalidated_type, ())):
+                    self._remove(key)
+
+    def clear(self):
+        """ Remove every entry. """
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_type.clear()
+            self._cleared += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def stats(self):
+        """ Return the hit, miss and eviction counters and the current size. """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self._entries)}
@@ -1,20 +1,16 @@
 # -*- coding: utf-8 -*-
-import requests
-from requests.compat import urljoin
-from kongclient import api
+from kongclient.codec import Codec
+from kongclient.deadline import Deadline
+from kongclient.lazy import LazyManager, lazy_exports
+from kongclient.singleflight import SingleFlight
+from kongclient import transport as transports
 
 
-class HttpSession(requests.Session):
+# The default (connect, read) timeout of requests, in seconds.
+DEFAULT_TIMEOUT = (10, 60)
 
-    def __init__(self, base_url, verify_ssl=False):
-        super(HttpSession, self).__init__()
-        self.verify = bool(verify_ssl)
-        self.base_url = base_url
-
-    def request(self, method, url, *args, **kwargs):
-
-        url = urljoin(base=self.base_url, url=url)
-        return super(HttpSession, self).request(method, url, *args, **kwargs)
+# Kept for backward compatibility, imported on first access as it subclasses requests.Session.
+__getattr__, __dir__ = lazy_exports(__name__, {'HttpSession': 'kongclient.session'})
 
 
 class KongClient:
@@ -23,17 +19,60 @@ class KongClient:
     :param kong_url: The URL of the Kong admin API.
     :param verify_ssl: If you want to disable SSL verification,
     set verify_ssl is False, otherwise set it is True.
+    :param transport: The transport requests are sent through, either a Transport subclass,
+    instantiated with kong_url, verify_ssl and transport_options, or a ready-made Transport instance.
+    Defaults to RequestsTransport.
+    :param timeout: The default timeout of requests in seconds, either a number or a (connect, read) tuple,
+    only used when the transport is a class. None waits forever.
+    :param transport_options: Options of the transport class, e.g., pool_maxsize=50, pool_block=True or http2=True.
+    :param cache: An optional EntityCache serving repeated reads from memory.
+    :param retry: An optional RetryPolicy replaying requests that failed on connection errors
+    or on transient http statuses (429, 502, 503, 504).
+    :param codec: An optional Codec choosing the JSON backend, and whether responses are returned
+    decoded, lazily decoded or raw. Defaults to responses decoded with the standard json module.
+    :param coalesce: Whether concurrent identical GETs share one in-flight request and its result.
+    :param tracker: An optional ChangeTracker returning the previously decoded object of unchanged responses.
+    :param metrics: An optional Metrics recording the latency, status and size of every request.
     """
 
-    def __init__(self, kong_url, verify_ssl=True):
-        self.client = HttpSession(base_url=kong_url, verify_ssl=verify_ssl)
-        self.services = api.ServiceManager(self)
-        self.routes = api.RouteManager(self)
-        self.consumers = api.ConsumerManager(self)
-        self.plugins = api.PluginManager(self)
-        self.certificates = api.CertificateManager(self)
-        self.snis = api.SNIManager(self)
-        self.upstreams = api.UpstreamManager(self)
-        self.targets = api.TargetManager(self)
-        self.tags = api.TagManager(self)
-        self.info = api.NodeInfoManager(self)
+    services = LazyManager('ServiceManager')
+    routes = LazyManager('RouteManager')
+    consumers = LazyManager('ConsumerManager')
+    plugins = LazyManager('PluginManager')
+    certificates = LazyManager('CertificateManager')
+    snis = LazyManager('SNIManager')
+    upstreams = LazyManager('UpstreamManager')
+    targets = LazyManager('TargetManager')
+    tags = LazyManager('TagManager')
+    info = LazyManager('NodeInfoManager')
+
+    def __init__(self, kong_url, verify_ssl=True, transport=None, timeout=DEFAULT_TIMEOUT, cache=None, retry=None,
+                 codec=None, coalesce=False, tracker=None, metrics=None,
+                 **transport_options):
+        transport = transport or transports.RequestsTransport
+        if isinstance(transport, type):
+            transport = transport(base_url=kong_url, verify_ssl=verify_ssl, timeout=timeout, **transport_options)
+        self.client = transport
+        self.cache = cache
+        self.retry = retry
+        self.codec = codec or Codec()
+        self.tracker = tracker
+        self.metrics = metrics
+        self.flights = SingleFlight() if coalesce else None
+
+    def deadline(self, seconds):
+        """ Return a context manager sharing a time budget between every request sent in its block.
+
+        :param seconds: The time budget, in seconds.
+        """
+        return Deadline(seconds)
+
+    def close(self):
+        """ Close all pooled connections. """
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from kongclient import transport as transports
+from kongclient.client import DEFAULT_TIMEOUT, KongClient
+from kongclient.exceptions import APIException, ConnectException, TransportException
+
+logger = logging.getLogger(__name__)
+
+READ_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+
+STRATEGIES = ('round-robin', 'least-outstanding')
+
+
+class Node:
+    """ One Kong admin node of a cluster, with its own connection pool and health state.
+
+    :param url: The URL of the Kong admin API of the node.
+    :param transport: The transport sending requests to the node.
+    """
+
+    def __init__(self, url, transport):
+        self.url = url
+        self.transport = transport
+        self.kong = KongClient(url, transport=transport)
+        self.outstanding = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+
+    @property
+    def healthy(self):
+        return self.ejected_until <= time.monotonic()
+
+    def __repr__(self):
+        return 'Node(%r, healthy=%s, outstanding=%d)' % (self.url, self.healthy, self.outstanding)
+
+
+class ClusterTransport(transports.Transport):
+    """ Transport spreading requests over several Kong admin nodes.
+
+    Reads are balanced over the healthy nodes and fail over to the next one when a node does not
+    respond or answers with a 5xx status. Writes go to the preferred node, or to the first healthy
+    one when it is ejected, and only fail over when the node could not be connected to. A node is
+    ejected for `eject_for` seconds after `max_failures` consecutive failures, and comes back once
+    that delay has passed or a health check succeeds.
+
+    :param base_urls: The URLs of the Kong admin API of every node.
+    :param verify_ssl: Whether the SSL certificate of the nodes is verified.
+    :param timeout: The default timeout of requests.
+    :param strategy: How reads are balanced, 'round-robin' or 'least-outstanding', the latter breaking
+    ties round-robin.
+    :param preferred: The index of the node receiving writes.
+    :param max_failures: The number of consecutive failures ejecting a node.
+    :param eject_for: How long a failing node is ejected, in seconds.
+    :param transport: The transport class of every node.
+    :param transport_options: Options of the node transport class, e.g., pool_maxsize=50.
+    """
+
+    def __init__(self, base_urls, verify_ssl=True, timeout=None, strategy='round-robin', preferred=0,
+                 max_failures=1, eject_for=30, transport=None, **transport_options):
+        if not base_urls:
+            raise ValueError('At least one Kong admin URL is required')
+        if strategy not in STRATEGIES:
+            raise ValueError('Unknown strategy %r, expected one of %s' % (strategy, ', '.join(STRATEGIES)))
+        super(ClusterTransport, self).__init__(base_urls[0], verify_ssl=verify_ssl, timeout=timeout)
+        transport = transport or transports.RequestsTransport
+        self.nodes = [Node(url, transport(base_url=url, verify_ssl=verify_ssl, timeout=timeout, **transport_options))
+                      for url in base_urls]
+        self.strategy = strategy
+        self.preferred = preferred
+        self.max_failures = max_failures
+        self.eject_for = eject_for
+        self._round_robin = itertools.count()
+        self._lock = threading.Lock()
+
+    def _candidates(self, method):
+        """ Return the nodes to try for a request, in order. """
+        healthy = [node for node in self.nodes if node.healthy]
+        # When every node is ejected, try them all rather than failing without sending anything.
+        nodes = healthy or sorted(self.nodes, key=lambda node: node.ejected_until)
+        if method.upper() not in READ_METHODS:
+            preferred = self.nodes[self.preferred]
+            return [preferred] + [node for node in nodes if node is not preferred] if preferred.healthy else nodes
+        start = next(self._round_robin) % len(nodes)
+        nodes = nodes[start:] + nodes[:start]
+        if self.strategy == 'least-outstanding':
+            # The sort is stable, so ties between equally loaded nodes are broken round-robin.
+            return sorted(nodes, key=lambda node: node.outstanding)
+        return nodes
+
+    def _failed(self, node):
+        with self._lock:
+            node.failures += 1
+            if node.failures >= self.max_failures:
+                node.ejected_until = time.monotonic() + self.eject_for
+
+    def _succeeded(self, node):
+        with self._lock:
+            node.failures = 0
+            node.ejected_until = 0.0
+
+    def request(self, method, url, params=None, json=None, headers=None, timeout=None):
+        read = method.upper() in READ_METHODS
+        error = None
+        resp = None
+        for node in self._candidates(method):
+            with self._lock:
+                node.outstanding += 1
+            try:
+                resp = node.transport.request(method, url, params=params, json=json, headers=headers, timeout=timeout)
+            except TransportException as e:
+                self._failed(node)
+                # A write that reached the node may have been applied, even without a response,
+                # it is only sent to another node when the connection could not be opened.
+                if not read and not isinstance(e, ConnectException):
+                    raise
+                error = e
+                continue
+            finally:
+                with self._lock:
+                    node.outstanding -= 1
+            if resp.status_code >= 500:
+                self._failed(node)
+                if read:
+                    continue
+                return resp
+            self._succeeded(node)
+            return resp
+        if resp is not None:
+            return resp
+        raise error
+
+    def check_health(self):
+        """ Check the status of every node in parallel, ejecting or restoring them accordingly.
+
+        :return: a dict mapping every node URL to whether it is healthy.
+        """
+        def check(node):
+            try:
+                status = node.kong.info.get_node_status()
+            except (APIException, TransportException):
+                status = None
+            if status is not None and status.get('database', {}).get('reachable', True):
+                self._succeeded(node)
+            else:
+                self._failed(node)
+            return node.url, node.healthy
+
+        with ThreadPoolExecutor(max_workers=len(self.nodes)) as executor:
+            return dict(executor.map(check, self.nodes))
+
+    def close(self):
+        for node in self.nodes:
+            node.transport.close()
+
+
+class ClusterKongClient(KongClient):
+    """ Kong class spreading requests over several Kong admin nodes of the same cluster.
+
+    :param kong_urls: The URLs of the Kong admin API of every node.
+    :param verify_ssl: If you want to disable SSL verification,
+    set verify_ssl is False, otherwise set it is True.
+    :param strategy: How reads are balanced over healthy nodes, 'round-robin' or 'least-outstanding'.
+    :param preferred: The index in kong_urls of the node receiving writes.
+    :param health_check_interval: When set, every node status is checked in a background thread
+    every `health_check_interval` seconds.
+    :param timeout: The default timeout of requests in seconds, either a number or a (connect, read) tuple.
+    :param cache: An optional EntityCache serving repeated reads from memory.
+    :param retry: An optional RetryPolicy replaying failed requests.
+    :param codec: An optional Codec choosing how responses are decoded.
+    :param coalesce: Whether concurrent identical GETs share one in-flight request and its result.
+    :param tracker: An optional ChangeTracker returning the previously decoded object of unchanged responses.
+    :param metrics: An optional Metrics recording the latency, status and size of every request.
+    :param cluster_options: Options of ClusterTransport, e.g., max_failures=3, eject_for=10,
+    transport=HttpxTransport or pool_maxsize=50.
+    """
+
+    def __init__(self, kong_urls, verify_ssl=True, strategy='round-robin', preferred=0, health_check_interval=None,
+                 timeout=DEFAULT_TIMEOUT, cache=None, retry=None, codec=None, coalesce=False,
+                 tracker=None, metrics=None, **cluster_options):
+        cluster = ClusterTransport(kong_urls, verify_ssl=verify_ssl, timeout=timeout, strategy=strategy,
+                                   preferred=preferred, **cluster_options)
+        super(ClusterKongClient, self).__init__(kong_urls[0], verify_ssl=verify_ssl, transport=cluster,
+                                                cache=cache, retry=retry, codec=codec, coalesce=coalesce,
+                                                tracker=tracker, metrics=metrics)
+        self._stop = threading.Event()
+        self._health_checker = None
+        if health_check_interval:
+            self._health_checker = threading.Thread(target=self._check_health_forever, args=(health_check_interval,),
+                                                    name='kongclient-health-check', daemon=True)
+            self._health_checker.start()
+
+    @property
+    def nodes(self):
+        return self.client.nodes
+
+    def check_health(self):
+        """ Check the status of every node, see `ClusterTransport.check_health`. """
+        return self.client.check_health()
+
+    def _check_health_forever(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.check_health()
+            except Exception:
+                # An unexpected error must not stop the health checks for good.
+                logger.exception('Health check of the Kong admin nodes failed')
+
+    def close(self):
+        """ Stop the health checks and close all pooled connections. """
+        self._stop.set()
+        super(ClusterKongClient, self).close()
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+""" Decoding of Kong admin API responses.
+
+A KongClient decodes every response with one Codec, chosen once when it is created:
+
+* eager (default): responses are decoded into dicts, with the standard json module unless the codec
+  opts in to orjson or ujson,
+* lazy: single objects are returned as LazyEntity, decoded on first access, list pages are decoded
+  like in eager mode,
+* raw: responses are returned as bytes, lists as one bytes object per page, without any decoding,
+  which the sync, snapshot and health watcher helpers reject as they read the entities,
+* models: services, routes, plugins, consumers, upstreams and targets are returned as compact
+  models, see `kongclient.models`.
+"""
+import importlib
+import importlib.util
+import json
+import re
+from collections.abc import Mapping
+
+from kongclient.models import MODELS, model_for
+
+BACKENDS = ('orjson', 'ujson', 'json')
+
+# The offset of a page, with its JSON string escapes, e.g., "offset":"WyJ...\/..."
+_OFFSET = re.compile(rb'"offset"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+
+def json_loads(backend='json'):
+    """ Return the JSON decoding function of a backend.
+
+    :param backend: 'orjson', 'ujson', 'json' or 'auto' for the fastest installed one.
+    """
+    if backend == 'auto':
+        backend = next((name for name in BACKENDS[:-1] if importlib.util.find_spec(name) is not None), 'json')
+    if backend in ('orjson', 'ujson'):
+        try:
+            return importlib.import_module(backend).loads
+        except ImportError:
+            raise ImportError('The %s backend requires %s, install it with `pip install %s`'
+                              % (backend, backend, backend)) from None
+    if backend == 'json':
+        return json.loads
+    raise ValueError('Unknown JSON backend %r, expected one of %s or auto' % (backend, ', '.join(BACKENDS)))
+
+
+def page_offset(content, response_key='data'):
+    """ Return the offset of the next page of a raw list response, None for the last page, without decoding it.
+
+    The offset is a top-level field, so it is only looked for around the `response_key` array.
+
+    :param content: the bytes of a list response.
+    :param response_key: the key of the entities array, e.g., 'data'
+    """
+    start = content.find(b'"%s"' % response_key.encode())
+    end = content.rfind(b']')
+    for part in (content[:start] if start >= 0 else b'', content[end:] if end >= 0 else content):
+        match = _OFFSET.search(part)
+        if match:
+            return json.loads(match.group(1))
+    return None
+
+
+def ensure_decoded(kong, user):
+    """ Raise a ValueError when a client returns raw bytes, as `user` reads the entities it returns.
+
+    :param kong: instance of KongClient or AsyncKongClient.
+    :param user: The name of the caller, for the error message, e.g., 'HealthWatcher'
+    """
+    codec = getattr(kong, 'codec', None)
+    if codec is not None and codec.raw:
+        raise ValueError('%s reads the entities returned by the client, which cannot decode them with Codec(raw=True),'
+                         ' use a client with Codec(), Codec(lazy=True) or Codec(models=True) instead' % user)
+
+
+class LazyEntity(Mapping):
+    """ A read-only entity decoded on first access.
+
+    :param raw: the bytes of the entity, as returned by the Kong API.
+    :param loads: the JSON decoding function.
+    """
+
+    __slots__ = ('raw', '_loads', '_value')
+
+    def __init__(self, raw, loads=json.loads):
+        self.raw = raw
+        self._loads = loads
+        self._value = None
+
+    @property
+    def value(self):
+        """ Return the decoded entity. """
+        if self._value is None:
+            self._value = self._loads(self.raw)
+        return self._value
+
+    def __getitem__(self, key):
+        return self.value[key]
+
+    def __iter__(self):
+        return iter(self.value)
+
+    def __len__(self):
+        return len(self.value)
+
+    def __repr__(self):
+        if self._value is None:
+            return 'LazyEntity(<%d bytes>)' % len(self.raw)
+        return 'LazyEntity(%r)' % (self._value,)
+
+
+class Codec:
+    """ Decodes the responses of a KongClient.
+
+    :param backend: The JSON backend, 'orjson', 'ujson', 'json' or 'auto' for the fastest installed one.
+    :param raw: Whether responses are returned as bytes instead of being decoded.
+    :param lazy: Whether single objects are returned as LazyEntity, decoded on first access.
+    :param models: Whether entities are returned as compact models, either True for every kind
+    having a model or the kinds opting in, e.g., ('routes', 'plugins').
+    """
+
+    def __init__(self, backend='json', raw=False, lazy=False, models=False):
+        if sum(1 for mode in (raw, lazy, models) if mode) > 1:
+            raise ValueError('raw, lazy and models are mutually exclusive')
+        self.backend = backend
+        if backend != 'auto':
+            self.loads = json_loads(backend)
+        self.raw = raw
+        self.lazy = lazy
+        self.models = frozenset(MODELS if models is True else models or ())
+
+    def loads(self, content):
+        """ Decode JSON with the fastest installed backend, imported on first use, for backend='auto'. """
+        # From now on, the instance attribute takes precedence over this method.
+        self.loads = json_loads(self.backend)
+        return self.loads(content)
+
+    def _model(self, url):
+        model = model_for(url) if self.models and url else None
+        return model if model is not None and model.KIND in self.models else None
+
+    def decode(self, content, url=None):
+        """ Decode a single object response.
+
+        :param content: the bytes of the response.
+        :param url: the partial URL of the request, choosing the model of the entity.
+        """
+        if self.raw:
+            return content
+        if self.lazy:
+            return LazyEntity(content, self.loads)
+        body = self.loads(content)
+        model = self._model(url)
+        return model.from_dict(body) if model is not None else body
+
+    def decode_page(self, content, response_key, url=None):
+        """ Decode a list response.
+
+        In raw mode, the entities are the bytes of the whole page. In lazy mode, the page is decoded
+        eagerly, as its offset is needed to follow the pagination.
+
+        :param content: the bytes of the response.
+        :param response_key: the key of the entities array, e.g., 'data'
+        :param url: the partial URL of the request, choosing the model of the entities.
+        :return: an (entities, offset of the next page) tuple.
+        """
+        if self.raw:
+            return [content], page_offset(content, response_key)
+        body = self.loads(content)
+        model = self._model(url)
+        if model is not None:
+            return [model.from_dict(entity) for entity in body[response_key]], body.get('offset')
+        return body[response_key], body.get('offset')
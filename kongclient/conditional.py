@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+""" Change detection of polled reads.
+
+A ChangeTracker remembers the last response of every read. Requests are sent with If-None-Match or
+If-Modified-Since when the server returned an ETag or a Last-Modified header, and otherwise the
+response bytes are hashed before decoding. Either way, an unchanged response returns the object
+decoded the previous time instead of being parsed again::
+
+    kong_client = KongClient(kong_url, tracker=ChangeTracker())
+    kong_client.info.get_node_info()  # decoded
+    kong_client.info.get_node_info()  # same body, the previous object is returned
+
+Like cached responses, returned objects are shared between calls and must not be mutated.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def digest(content):
+    """ Return the digest of response bytes. """
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+class _Entry:
+    __slots__ = ('etag', 'last_modified', 'digest', 'value')
+
+    def __init__(self, etag, last_modified, digest, value):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.digest = digest
+        self.value = value
+
+
+class ChangeTracker:
+    """ Remembers the last response of reads, to skip decoding unchanged ones.
+
+    :param maxsize: The maximum number of reads remembered, the least recently used ones are forgotten first.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.not_modified = 0
+        self.unchanged = 0
+        self.changed = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, key):
+        """ Return what is remembered of a read, None if nothing is.
+
+        :param key: a cache key as returned by `kongclient.cache.cache_key`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    @staticmethod
+    def headers(entry):
+        """ Return the conditional headers of a read, None when the server sent no validator. """
+        if entry is None:
+            return None
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers or None
+
+    def decode(self, key, entry, resp, decode):
+        """ Return the decoded response, or the previous one when it did not change.
+
+        :param key: a cache key as returned by `kongclient.cache.cache_key`.
+        :param entry: the entry returned by `lookup` before sending the request.
+        :param resp: the response, with a 200 or 304 status.
+        :param decode: the function decoding the response bytes.
+        """
+        if resp.status_code == 304 and entry is not None:
+            self.not_modified += 1
+            return entry.value
+        content_digest = digest(resp.content)
+        if entry is not None and entry.digest == content_digest:
+            self.unchanged += 1
+            value = entry.value
+        else:
+            self.changed += 1
+            value = decode(resp.content)
+        with self._lock:
+            self._entries[key] = _Entry(resp.headers.get('ETag'), resp.headers.get('Last-Modified'),
+                                        content_digest, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        """ Forget every read. """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def stats(self):
+        """ Return how many reads were not modified, unchanged or changed, and the current size. """
+        return {'not_modified': self.not_modified, 'unchanged': self.unchanged, 'changed': self.changed,
+                'size': len(self._entries)}
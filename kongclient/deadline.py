@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import contextvars
+import time
+
+from kongclient.exceptions import DeadlineExceeded
+
+_current_deadline = contextvars.ContextVar('kongclient_deadline', default=None)
+
+
+def current_deadline():
+    """ Return the Deadline of the current context, None if there is none. """
+    return _current_deadline.get()
+
+
+def in_current_context(func):
+    """ Wrap a function so that it runs in a copy of the current context, e.g., with its deadline,
+    whatever the thread it is called from.
+
+    :param func: the function to wrap, e.g., a task submitted to a ThreadPoolExecutor.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        # Every call gets its own copy, a context can only be entered by one thread at a time.
+        return context.copy().run(func, *args, **kwargs)
+    return run
+
+
+class Deadline:
+    """ A time budget shared by every request sent while it is active.
+
+    Use it as a context manager: requests sent in the block, including every page of a paginated
+    listing and every item of a bulk operation, have their timeouts capped by the remaining time,
+    and raise DeadlineExceeded once it is spent. Nested deadlines never extend an outer one::
+
+        with kong_client.deadline(5):
+            kong_client.consumers.list()
+
+    :param seconds: The time budget, in seconds.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self._tokens = []
+
+    def remaining(self):
+        """ Return the remaining time, in seconds. """
+        return self.expires_at - time.monotonic()
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def timeout(self, default=None, method=None, url=None):
+        """ Return the timeout of a request, the default timeout capped by the remaining time.
+
+        :param default: the default timeout of the transport, a number, a (connect, read) tuple or None.
+        :param method: the http method of the request, for the error message.
+        :param url: the URL of the request, for the error message.
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(method=method, url=url)
+        if isinstance(default, tuple):
+            return tuple(remaining if value is None else min(value, remaining) for value in default)
+        return remaining if default is None else min(default, remaining)
+
+    def __enter__(self):
+        outer = _current_deadline.get()
+        active = outer if outer is not None and outer.expires_at < self.expires_at else self
+        self._tokens.append(_current_deadline.set(active))
+        return self
+
+    def __exit__(self, *exc_info):
+        _current_deadline.reset(self._tokens.pop())
@@ -27,3 +27,50 @@ class APIException(Exception):
         if self.url:
             formatted_string += ' (Url %s)' % self.url
         return formatted_string
+
+
+class TransportException(Exception):
+    """ The exception class for requests that never got a response from the Kong API,
+    e.g., connection refused, connection reset or timed out.
+
+    :param message: The error message returned by the transport.
+    :param method: The http method used to make request to the Kong API.
+    :param url: The URL of the Kong API.
+    """
+
+    message = 'Could not reach the Kong API'
+
+    def __init__(self, message=None, method=None, url=None):
+        super(TransportException, self).__init__(message)
+        self.message = message or self.__class__.message
+        self.method = method
+        self.url = url
+
+    def __str__(self):
+        """ Return a string representing for transport error. """
+        formatted_string = self.message
+        if self.method:
+            formatted_string += ' (Method %s)' % self.method
+        if self.url:
+            formatted_string += ' (Url %s)' % self.url
+        return formatted_string
+
+
+class ConnectException(TransportException):
+    """ The exception class for requests that could not connect to the Kong API, which therefore never received them,
+    e.g., connection refused, unknown host or connect timeout.
+    """
+
+    message = 'Could not connect to the Kong API'
+
+
+class TimeoutException(TransportException):
+    """ The exception class for requests that timed out before the Kong API responded. """
+
+    message = 'The Kong API did not respond in time'
+
+
+class DeadlineExceeded(TimeoutException):
+    """ The exception class for requests that could not be sent because their deadline had passed. """
+
+    message = 'Deadline exceeded'
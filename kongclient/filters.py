@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+""" Filters of list calls.
+
+Kong filters collections by tags, either entities having all the given tags or any of them::
+
+    kong_client.services.list(tags=['admin', 'example'])        # admin AND example
+    kong_client.services.list(tags=any_tags('admin', 'example'))  # admin OR example
+    kong_client.consumers.list(custom_id='1234', fields=('id', 'username'))
+"""
+
+
+def _check_tags(tags):
+    if not tags:
+        raise ValueError('At least one tag is required')
+    for tag in tags:
+        if ',' in tag or '/' in tag:
+            raise ValueError('Tags can not contain "," or "/", got %r' % tag)
+
+
+def all_tags(*tags):
+    """ Return the tags filter of entities having all the given tags. """
+    _check_tags(tags)
+    return ','.join(tags)
+
+
+def any_tags(*tags):
+    """ Return the tags filter of entities having any of the given tags. """
+    _check_tags(tags)
+    return '/'.join(tags)
+
+
+def tags_param(tags):
+    """ Return the `tags` query string parameter of a filter.
+
+    :param tags: a string sent as is, e.g., 'admin,example', or a list of tags all required.
+    """
+    if tags is None or isinstance(tags, str):
+        return tags
+    return all_tags(*tags)
+
+
+def project(entity, fields):
+    """ Return a dict holding only some keys of an entity.
+
+    :param entity: an entity, as returned by the Kong API.
+    :param fields: the keys to keep, e.g., ('id', 'name').
+    """
+    return {field: entity[field] for field in fields if field in entity}
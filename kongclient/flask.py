@@ -1,5 +1,49 @@
 # -*- coding: utf-8 -*-
+""" Kong client for Python-Flask apps.
+
+The client is shared by every thread of the app. Each app context, e.g., each request, sends its
+requests through its own `requests.Session`, created on first use and released on teardown, while
+connections are kept in one pool shared by the whole app. It is configured by the app config:
+
+    KONG_ADMIN_URL: the URL of the Kong admin API.
+    KONG_ADMIN_VERIFY_SSL: whether the SSL certificate of the Kong admin API is verified.
+    KONG_ADMIN_TIMEOUT: the timeout of requests in seconds, either a number or a (connect, read) tuple.
+    KONG_ADMIN_POOL_MAXSIZE: the maximum number of connections kept open, e.g., the number of threads.
+    KONG_ADMIN_POOL_BLOCK: whether a request waits for a free connection when all of them are in use,
+    instead of opening a connection that is discarded afterwards.
+"""
+from flask import g, has_app_context
+
 from kongclient import client
+from kongclient.transport import RequestsTransport
+
+
+class FlaskRequestsTransport(RequestsTransport):
+    """ RequestsTransport giving every Flask app context its own session, and every thread
+    its own session outside of app contexts.
+    """
+
+    def __init__(self, base_url, **options):
+        options.setdefault('per_thread_sessions', True)
+        super(FlaskRequestsTransport, self).__init__(base_url, **options)
+        self._g_key = '_kongclient_session_%x' % id(self)
+
+    @property
+    def session(self):
+        if not has_app_context():
+            return super(FlaskRequestsTransport, self).session
+        session = g.get(self._g_key)
+        if session is None:
+            session = self.new_session()
+            setattr(g, self._g_key, session)
+        return session
+
+    def release_session(self):
+        """ Forget the session of the current app context, or of the current thread outside of app contexts. """
+        if has_app_context():
+            g.pop(self._g_key, None)
+        else:
+            super(FlaskRequestsTransport, self).release_session()
 
 
 class KongClient(client.KongClient):
@@ -13,6 +57,23 @@ class KongClient(client.KongClient):
         # Configuration defaults
         app.config.setdefault('KONG_ADMIN_URL', 'https://localhost:8444')
         app.config.setdefault('KONG_ADMIN_VERIFY_SSL', False)
+        app.config.setdefault('KONG_ADMIN_TIMEOUT', client.DEFAULT_TIMEOUT)
+        app.config.setdefault('KONG_ADMIN_POOL_MAXSIZE', 10)
+        app.config.setdefault('KONG_ADMIN_POOL_BLOCK', False)
+        timeout = app.config['KONG_ADMIN_TIMEOUT']
+        # Config loaded from JSON or environment variables holds lists, transports expect a tuple.
+        if isinstance(timeout, list):
+            timeout = tuple(timeout)
         super(KongClient, self).__init__(
             kong_url=app.config['KONG_ADMIN_URL'],
-            verify_ssl=app.config['KONG_ADMIN_VERIFY_SSL'])
+            verify_ssl=app.config['KONG_ADMIN_VERIFY_SSL'],
+            transport=FlaskRequestsTransport,
+            timeout=timeout,
+            pool_maxsize=app.config['KONG_ADMIN_POOL_MAXSIZE'],
+            pool_block=app.config['KONG_ADMIN_POOL_BLOCK'])
+        app.extensions['kongclient'] = self
+        app.teardown_appcontext(self.teardown)
+
+    def teardown(self, exception=None):
+        """ Release the session of the app context being torn down. """
+        self.client.release_session()
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+""" In-memory relational index of Kong entities.
+
+The index loads every entity once, then answers lookups and joins locally::
+
+    index = KongIndex.load(kong_client)
+    route = index.get('routes', 'httpbin')
+    index.service_of(route)
+    index.plugins_of(route=route['id'])
+    index.refresh(kong_client)
+"""
+from collections.abc import Mapping
+
+from kongclient.sync import FOREIGN_KEYS, KINDS, Syncer
+
+# The fields entities are looked up by, besides their id.
+NAME_FIELDS = {
+    'services': ('name',),
+    'routes': ('name',),
+    'consumers': ('username', 'custom_id'),
+    'upstreams': ('name',),
+    'snis': ('name',),
+}
+
+
+class KongIndex:
+    """ Hash indexes of Kong entities by id, name, tag and foreign keys.
+
+    :param entities: a dict mapping every kind (e.g. 'services') to a list of entities.
+    """
+
+    def __init__(self, entities=None):
+        self.by_id = {kind: {} for kind in KINDS}
+        self.by_name = {kind: {} for kind in NAME_FIELDS}
+        self.by_tag = {}
+        # Reverse foreign keys: (kind, field) -> {referenced id: set of ids}, e.g.,
+        # ('routes', 'service') -> {service_id: {route_id, ...}}
+        self.children = {(kind, field): {} for kind, fields in FOREIGN_KEYS.items() for field in fields}
+        # The ids of the plugins scoped to no service, route or consumer.
+        self.global_plugins = set()
+        for kind, collection in (entities or {}).items():
+            for entity in collection:
+                self.add(kind, entity)
+
+    @classmethod
+    def load(cls, kong, max_workers=10):
+        """ Build an index of every entity, fetched in parallel.
+
+        :param kong: instance of KongClient.
+        :param max_workers: The maximum number of requests running at the same time.
+        """
+        return cls(Syncer(kong, max_workers=max_workers).fetch())
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """ Build an index from a Snapshot, see `kongclient.snapshot.load_snapshot`. """
+        return cls(snapshot.entities)
+
+    def __len__(self):
+        return sum(len(entities) for entities in self.by_id.values())
+
+    def add(self, kind, entity):
+        """ Index an entity, replacing the one with the same id.
+
+        :param kind: The kind of the entity, e.g., 'services'
+        :param entity: The entity, as returned by the Kong API.
+        """
+        if entity['id'] in self.by_id[kind]:
+            self.remove(kind, entity['id'])
+        self.by_id[kind][entity['id']] = entity
+        for field in NAME_FIELDS.get(kind, ()):
+            if entity.get(field):
+                self.by_name[kind][entity[field]] = entity
+        for tag in entity.get('tags') or ():
+            self.by_tag.setdefault(tag, set()).add((kind, entity['id']))
+        for field in FOREIGN_KEYS.get(kind, ()):
+            ref = entity.get(field)
+            if ref:
+                self.children[(kind, field)].setdefault(ref['id'], set()).add(entity['id'])
+        if kind == 'plugins' and not any(entity.get(field) for field in FOREIGN_KEYS[kind]):
+            self.global_plugins.add(entity['id'])
+
+    def remove(self, kind, entity_id):
+        """ Remove an entity from the index.
+
+        :param kind: The kind of the entity, e.g., 'services'
+        :param entity_id: The unique identifier of the entity.
+        """
+        entity = self.by_id[kind].pop(entity_id, None)
+        if entity is None:
+            return
+        for field in NAME_FIELDS.get(kind, ()):
+            if entity.get(field) and self.by_name[kind].get(entity[field]) is entity:
+                del self.by_name[kind][entity[field]]
+        for tag in entity.get('tags') or ():
+            self.by_tag.get(tag, set()).discard((kind, entity_id))
+        for field in FOREIGN_KEYS.get(kind, ()):
+            ref = entity.get(field)
+            if ref:
+                self.children[(kind, field)].get(ref['id'], set()).discard(entity_id)
+        if kind == 'plugins':
+            self.global_plugins.discard(entity_id)
+
+    def refresh(self, kong, max_workers=10):
+        """ Bring the index up to date, re-indexing only the entities that changed and dropping
+        the ones that no longer exist.
+
+        :param kong: instance of KongClient.
+        :param max_workers: The maximum number of requests running at the same time.
+        :return: a dict counting the 'added', 'updated' and 'removed' entities.
+        """
+        counts = {'added': 0, 'updated': 0, 'removed': 0}
+        current = Syncer(kong, max_workers=max_workers).fetch()
+        for kind in KINDS:
+            indexed = self.by_id[kind]
+            seen = set()
+            for entity in current[kind]:
+                seen.add(entity['id'])
+                previous = indexed.get(entity['id'])
+                if previous is None:
+                    counts['added'] += 1
+                # Whole entities are compared, `updated_at` only has a one-second resolution.
+                elif previous != entity:
+                    counts['updated'] += 1
+                else:
+                    continue
+                self.add(kind, entity)
+            for entity_id in [entity_id for entity_id in indexed if entity_id not in seen]:
+                self.remove(kind, entity_id)
+                counts['removed'] += 1
+        return counts
+
+    def get(self, kind, id_or_name):
+        """ Return an entity by id or by name (username or custom_id for consumers), None if it does not exist.
+
+        :param kind: The kind of the entity, e.g., 'services'
+        :param id_or_name: The unique identifier or the name of the entity.
+        """
+        entity = self.by_id[kind].get(id_or_name)
+        if entity is None and kind in self.by_name:
+            entity = self.by_name[kind].get(id_or_name)
+        return entity
+
+    def _id(self, kind, entity_or_id):
+        """ Resolve an entity (a dict or a model), an id or a name to an id, None if it does not exist. """
+        if entity_or_id is None:
+            return None
+        if isinstance(entity_or_id, Mapping):
+            return entity_or_id['id']
+        entity = self.get(kind, entity_or_id)
+        return entity['id'] if entity else None
+
+    def _children(self, kind, field, parent_id):
+        return [self.by_id[kind][child_id] for child_id in self.children[(kind, field)].get(parent_id, ())]
+
+    def with_tag(self, tag, kind=None):
+        """ Return the entities having a tag.
+
+        :param tag: The tag, e.g., 'admin'
+        :param kind: Only return entities of this kind, e.g., 'services'
+        """
+        return [self.by_id[entity_kind][entity_id] for entity_kind, entity_id in self.by_tag.get(tag, ())
+                if kind is None or entity_kind == kind]
+
+    def routes_of(self, service):
+        """ Return the routes of a service, given as an entity, an id or a name. """
+        return self._children('routes', 'service', self._id('services', service))
+
+    def service_of(self, route):
+        """ Return the service of a route, given as an entity, an id or a name, None if it has none. """
+        route = route if isinstance(route, Mapping) else self.get('routes', route)
+        ref = route.get('service') if route else None
+        return self.by_id['services'].get(ref['id']) if ref else None
+
+    def targets_of(self, upstream):
+        """ Return the targets of an upstream, given as an entity, an id or a name. """
+        return self._children('targets', 'upstream', self._id('upstreams', upstream))
+
+    def snis_of(self, certificate):
+        """ Return the SNIs of a certificate, given as an entity or an id. """
+        return self._children('snis', 'certificate', self._id('certificates', certificate))
+
+    def plugins_of(self, service=None, route=None, consumer=None):
+        """ Return the plugins configured exactly on a service, route and consumer combination.
+
+        Each of them is given as an entity, an id or a name, None meaning the plugin is not scoped
+        to that kind of entity. With no argument, the global plugins are returned, and when one of
+        them does not exist, no plugin is.
+        """
+        given = {'service': service, 'route': route, 'consumer': consumer}
+        scope = {'service': self._id('services', service), 'route': self._id('routes', route),
+                 'consumer': self._id('consumers', consumer)}
+        if any(given[field] is not None and scope[field] is None for field in scope):
+            return []
+        candidates = None
+        for field, entity_id in scope.items():
+            if entity_id is not None:
+                ids = self.children[('plugins', field)].get(entity_id, set())
+                candidates = ids if candidates is None else candidates & ids
+        if candidates is None:
+            candidates = self.global_plugins
+        plugins = []
+        for plugin_id in candidates:
+            plugin = self.by_id['plugins'][plugin_id]
+            if all(((plugin.get(field) or {}).get('id')) == entity_id for field, entity_id in scope.items()):
+                plugins.append(plugin)
+        return plugins
+
+    def plugins_for_route(self, route):
+        """ Return the plugins configured on a route, on its service, or globally,
+        i.e. the plugins that may run for requests matching the route when no consumer is identified.
+
+        :param route: The route, given as an entity, an id or a name, no plugin is returned when it does not exist.
+        """
+        route_id = self._id('routes', route)
+        if route_id is None:
+            return []
+        service = self.service_of(route_id)
+        scopes = [self.children[('plugins', 'route')].get(route_id, ())]
+        if service is not None:
+            scopes.append(self.children[('plugins', 'service')].get(service['id'], ()))
+        scopes.append(self.global_plugins)
+        plugins = []
+        seen = set()
+        for plugin_ids in scopes:
+            for plugin_id in plugin_ids:
+                plugin = self.by_id['plugins'][plugin_id]
+                if plugin_id not in seen and not plugin.get('consumer'):
+                    seen.add(plugin_id)
+                    plugins.append(plugin)
+        return plugins
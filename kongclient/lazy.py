@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+""" Lazy imports and lazy managers, so that a cold start only pays for what it uses.
+
+Packages export names with a PEP 562 module `__getattr__`, importing the module defining a name
+on its first access::
+
+    __getattr__, __dir__ = lazy_exports(__name__, {'KongClient': 'kongclient.client'})
+
+and clients create their managers on first access::
+
+    class KongClient:
+        services = LazyManager('ServiceManager')
+"""
+import importlib
+import sys
+
+
+def lazy_exports(package, exports):
+    """ Return the module `__getattr__` and `__dir__` functions of a package exporting names lazily.
+
+    :param package: The name of the package, i.e., `__name__`.
+    :param exports: Maps every exported name to the module defining it, e.g., {'KongClient': 'kongclient.client'}.
+    """
+
+    def __getattr__(name):
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError('module %r has no attribute %r' % (package, name))
+        value = getattr(importlib.import_module(module), name)
+        # Set on the package so that the next accesses do not go through __getattr__.
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
+
+
+class LazyManager:
+    """ Descriptor creating a manager of a client on first access.
+
+    :param name: The name of the manager class in `kongclient.api`, e.g., 'ServiceManager'.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.attribute = None
+
+    def __set_name__(self, owner, attribute):
+        self.attribute = attribute
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        from kongclient import api
+        manager = getattr(api, self.name)(instance)
+        # Set on the instance, which takes precedence over this non-data descriptor from now on.
+        # Threads racing on the first access may each build a manager, the atomic setdefault
+        # makes all of them return the one stored first.
+        return instance.__dict__.setdefault(self.attribute, manager)
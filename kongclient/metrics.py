@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+""" Client-side instrumentation of the requests sent to the Kong admin API.
+
+Every request attempt is recorded per method and URL template, e.g., 'GET /services/{id}/routes':
+a latency histogram, the count of responses per status, transport errors, retries, received bytes
+and the number of requests in flight. Hooks forward the same events to tracing or metrics systems::
+
+    metrics = Metrics(hooks=[OpenTelemetryHook(), PrometheusHook()])
+    kong_client = KongClient(kong_url, metrics=metrics)
+    kong_client.services.list()
+    metrics.snapshot()
+
+A client without metrics pays a single attribute check per request.
+"""
+import bisect
+import functools
+import threading
+import time
+
+from kongclient.cache import ENTITY_TYPES
+
+# Latency histogram buckets, in seconds.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Path segments kept as is in URL templates, besides collection names.
+KEYWORDS = frozenset(('status', 'enabled', 'schema', 'health', 'healthy', 'unhealthy', 'all', 'upstream',
+                      'consumer'))
+
+
+@functools.lru_cache(maxsize=4096)
+def url_template(url):
+    """ Return the template of a partial URL, ids and names replaced with '{id}',
+    e.g., '/services/{id}/routes' for '/services/httpbin/routes'.
+    """
+    path = url.split('?', 1)[0]
+    segments = [segment if segment in ENTITY_TYPES or segment in KEYWORDS else '{id}'
+                for segment in path.strip('/').split('/') if segment]
+    return '/' + '/'.join(segments)
+
+
+class Histogram:
+    """ Histogram of observations, counted per bucket.
+
+    :param buckets: The upper bounds of the buckets, observations above the last one fall in an overflow bucket.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """ Return the upper bound of the bucket holding the q quantile, e.g., q=0.99, None without observations. """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def to_dict(self):
+        return {'buckets': dict(zip(self.buckets + (float('inf'),), self.counts)), 'count': self.count,
+                'sum': self.sum}
+
+
+class Hook:
+    """ Base class of instrumentation hooks, every method is a no-op. """
+
+    def start(self, method, template, url):
+        """ Called before a request attempt is sent, the returned value is passed to `end`. """
+        return None
+
+    def end(self, context, method, template, status, duration, size=None, error=None):
+        """ Called once a request attempt got a response or failed.
+
+        :param context: the value returned by `start`.
+        :param status: the http status code, None when no response was received.
+        :param duration: the duration of the attempt, in seconds.
+        :param size: the number of bytes of the response body.
+        :param error: the exception raised by the attempt, if any, usually a TransportException.
+        """
+
+    def retried(self, method, template):
+        """ Called when a request is about to be retried. """
+
+
+class Metrics:
+    """ Records the requests sent by a client, and forwards them to hooks.
+
+    :param buckets: The upper bounds of the latency histogram buckets, in seconds.
+    :param hooks: Hook instances receiving every request event, e.g., OpenTelemetryHook().
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, hooks=()):
+        self.buckets = tuple(buckets)
+        self.hooks = list(hooks)
+        # (method, template) -> Histogram
+        self.latency = {}
+        # (method, template, status) -> count, the status being 'error' for transport errors.
+        self.responses = {}
+        # (method, template) -> count
+        self.retries = {}
+        self.bytes_received = {}
+        self.in_flight = {}
+        self._lock = threading.Lock()
+
+    def start(self, method, url):
+        """ Record the start of a request attempt.
+
+        :return: a token to pass to `end`.
+        """
+        key = (method, url_template(url))
+        with self._lock:
+            self.in_flight[key] = self.in_flight.get(key, 0) + 1
+        contexts = [hook.start(method, key[1], url) for hook in self.hooks] if self.hooks else ()
+        return key, time.perf_counter(), contexts
+
+    def end(self, token, response=None, error=None):
+        """ Record the end of a request attempt.
+
+        :param token: the value returned by `start`.
+        :param response: the response, if one was received.
+        :param error: the exception raised by the attempt, if any, usually a TransportException.
+        """
+        key, started_at, contexts = token
+        duration = time.perf_counter() - started_at
+        status = response.status_code if response is not None else None
+        size = len(response.content) if response is not None and response.content is not None else None
+        with self._lock:
+            self.in_flight[key] -= 1
+            histogram = self.latency.get(key)
+            if histogram is None:
+                histogram = self.latency[key] = Histogram(self.buckets)
+            histogram.observe(duration)
+            response_key = key + (status if status is not None else 'error',)
+            self.responses[response_key] = self.responses.get(response_key, 0) + 1
+            if size:
+                self.bytes_received[key] = self.bytes_received.get(key, 0) + size
+        for hook, context in zip(self.hooks, contexts):
+            hook.end(context, key[0], key[1], status, duration, size=size, error=error)
+
+    def retried(self, method, url):
+        """ Record the retry of a request. """
+        key = (method, url_template(url))
+        with self._lock:
+            self.retries[key] = self.retries.get(key, 0) + 1
+        for hook in self.hooks:
+            hook.retried(method, key[1])
+
+    def snapshot(self):
+        """ Return every metric, per 'METHOD /template' endpoint. """
+        endpoints = {}
+
+        def endpoint(key):
+            return endpoints.setdefault('%s %s' % key, {'responses': {}, 'retries': 0, 'bytes_received': 0,
+                                                        'in_flight': 0, 'latency': None})
+
+        with self._lock:
+            for key, histogram in self.latency.items():
+                stats = endpoint(key)
+                stats['latency'] = dict(histogram.to_dict(), p50=histogram.quantile(0.5),
+                                        p99=histogram.quantile(0.99))
+            for (method, template, status), count in self.responses.items():
+                endpoint((method, template))['responses'][status] = count
+            for key, count in self.retries.items():
+                endpoint(key)['retries'] = count
+            for key, size in self.bytes_received.items():
+                endpoint(key)['bytes_received'] = size
+            for key, count in self.in_flight.items():
+                endpoint(key)['in_flight'] = count
+        return endpoints
+
+    def reset(self):
+        """ Forget every recorded request, requests in flight aside. """
+        with self._lock:
+            self.latency.clear()
+            self.responses.clear()
+            self.retries.clear()
+            self.bytes_received.clear()
+
+
+class OpenTelemetryHook(Hook):
+    """ Hook recording a client span per request attempt.
+
+    :param tracer: An OpenTelemetry tracer, the one of the global tracer provider when None.
+    """
+
+    def __init__(self, tracer=None):
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError('OpenTelemetryHook requires opentelemetry-api, '
+                              'install it with `pip install opentelemetry-api`') from e
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer('kongclient')
+
+    def start(self, method, template, url):
+        return self.tracer.start_span('%s %s' % (method, template), kind=self._trace.SpanKind.CLIENT,
+                                      attributes={'http.request.method': method, 'url.template': template,
+                                                  'url.path': url})
+
+    def end(self, context, method, template, status, duration, size=None, error=None):
+        if status is not None:
+            context.set_attribute('http.response.status_code', status)
+        if error is not None:
+            context.record_exception(error)
+        if error is not None or (status is not None and status >= 500):
+            context.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+        context.end()
+
+
+class PrometheusHook(Hook):
+    """ Hook exporting request metrics with prometheus_client.
+
+    :param registry: The prometheus_client registry, the default one when None.
+    :param namespace: The prefix of the metric names.
+    :param buckets: The upper bounds of the latency histogram buckets, in seconds.
+    """
+
+    def __init__(self, registry=None, namespace='kongclient', buckets=DEFAULT_BUCKETS):
+        try:
+            import prometheus_client
+        except ImportError as e:
+            raise ImportError('PrometheusHook requires prometheus_client, '
+                              'install it with `pip install prometheus-client`') from e
+        options = {'namespace': namespace}
+        if registry is not None:
+            options['registry'] = registry
+        labels = ('method', 'endpoint')
+        self.duration = prometheus_client.Histogram('request_duration_seconds', 'Kong admin API request latency',
+                                                    labels, buckets=buckets, **options)
+        self.requests = prometheus_client.Counter('requests', 'Kong admin API requests', labels + ('status',),
+                                                  **options)
+        self.retries = prometheus_client.Counter('retries', 'Kong admin API request retries', labels, **options)
+        self.received = prometheus_client.Counter('response_bytes', 'Kong admin API response bytes', labels,
+                                                  **options)
+        self.in_flight = prometheus_client.Gauge('requests_in_flight', 'Kong admin API requests in flight', labels,
+                                                 **options)
+
+    def start(self, method, template, url):
+        self.in_flight.labels(method, template).inc()
+
+    def end(self, context, method, template, status, duration, size=None, error=None):
+        self.in_flight.labels(method, template).dec()
+        self.duration.labels(method, template).observe(duration)
+        self.requests.labels(method, template, str(status) if status is not None else 'error').inc()
+        if size:
+            self.received.labels(method, template).inc(size)
+
+    def retried(self, method, template):
+        self.retries.labels(method, template).inc()
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+""" Compact entity models.
+
+Entities are stored in `__slots__` instead of a dict per entity, references to other entities are
+held as their id, lists as tuples, and repeated strings (protocols, methods, tags, referenced ids...)
+are interned, so that large route and plugin tables take a fraction of the memory of plain dicts.
+
+Models are read like the dicts returned by the Kong API, `route['service']['id']`, and through
+attributes, `route.service` being the id of the service. `to_dict` returns the API dict back::
+
+    kong_client = KongClient(kong_url, codec=Codec(models=True))
+    route = kong_client.routes.get('httpbin')
+    route.paths, route['paths'], route.to_dict()
+"""
+import sys
+from collections.abc import Mapping
+
+from kongclient.cache import ENTITY_TYPES
+
+# Path segments that are not ids, e.g., '/plugins/enabled'.
+_RESERVED = frozenset(('enabled', 'schema'))
+
+
+def _intern(value):
+    """ Intern a string, or the strings of a list. """
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return tuple(sys.intern(item) if isinstance(item, str) else item for item in value)
+    return value
+
+
+class Entity(Mapping):
+    """ Base class of entity models.
+
+    Subclasses list the fields of the entity in `__slots__`, the ones referring to another entity
+    in REFS and the ones holding repeated strings in INTERNED. Unknown fields, e.g., fields added
+    by a later Kong version, are kept in `extra`.
+    """
+
+    __slots__ = ('extra',)
+    KIND = None
+    REFS = ()
+    INTERNED = ()
+
+    def __init__(self, **fields):
+        extra = None
+        for key, value in fields.items():
+            if key in self.__slots__ and key != 'extra':
+                setattr(self, key, self._compact(key, value))
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        self.extra = extra
+
+    @classmethod
+    def _compact(cls, key, value):
+        if key in cls.REFS:
+            if isinstance(value, dict) and value.keys() == {'id'}:
+                return sys.intern(value['id'])
+            return value
+        if key in cls.INTERNED:
+            return _intern(value)
+        if isinstance(value, list):
+            return tuple(value)
+        return value
+
+    @classmethod
+    def from_dict(cls, data):
+        """ Build a model from an entity returned by the Kong API. """
+        return cls(**data)
+
+    def _expand(self, key, value):
+        if key in self.REFS and isinstance(value, str):
+            return {'id': value}
+        if isinstance(value, tuple):
+            return list(value)
+        return value
+
+    def __getattr__(self, name):
+        # Fields missing from the API response read as None.
+        if name in type(self).__slots__:
+            return None
+        raise AttributeError('%r object has no attribute %r' % (type(self).__name__, name))
+
+    def __getitem__(self, key):
+        if key != 'extra' and key in self.__slots__:
+            try:
+                value = object.__getattribute__(self, key)
+            except AttributeError:
+                raise KeyError(key)
+            return self._expand(key, value)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        for key in self.__slots__:
+            if key == 'extra':
+                continue
+            try:
+                object.__getattribute__(self, key)
+            except AttributeError:
+                continue
+            yield key
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def to_dict(self):
+        """ Return the entity as a dict, as returned by the Kong API. """
+        return {key: self[key] for key in self}
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, ', '.join('%s=%r' % (key, self[key]) for key in self))
+
+
+class Service(Entity):
+    KIND = 'services'
+    __slots__ = ('id', 'created_at', 'updated_at', 'name', 'retries', 'protocol', 'host', 'port', 'path',
+                 'connect_timeout', 'write_timeout', 'read_timeout', 'tags', 'client_certificate', 'enabled',
+                 'tls_verify', 'tls_verify_depth', 'ca_certificates')
+    REFS = ('client_certificate',)
+    INTERNED = ('protocol', 'host', 'path', 'tags')
+
+
+class Route(Entity):
+    KIND = 'routes'
+    __slots__ = ('id', 'created_at', 'updated_at', 'name', 'protocols', 'methods', 'hosts', 'paths', 'headers',
+                 'https_redirect_status_code', 'regex_priority', 'strip_path', 'path_handling', 'preserve_host',
+                 'snis', 'sources', 'destinations', 'request_buffering', 'response_buffering', 'tags', 'service')
+    REFS = ('service',)
+    INTERNED = ('protocols', 'methods', 'hosts', 'path_handling', 'snis', 'tags')
+
+
+class Plugin(Entity):
+    KIND = 'plugins'
+    __slots__ = ('id', 'created_at', 'updated_at', 'name', 'instance_name', 'route', 'service', 'consumer', 'config',
+                 'protocols', 'enabled', 'tags', 'run_on')
+    REFS = ('route', 'service', 'consumer')
+    INTERNED = ('name', 'protocols', 'tags', 'run_on')
+
+
+class Consumer(Entity):
+    KIND = 'consumers'
+    __slots__ = ('id', 'created_at', 'updated_at', 'username', 'custom_id', 'tags')
+    INTERNED = ('tags',)
+
+
+class Upstream(Entity):
+    KIND = 'upstreams'
+    __slots__ = ('id', 'created_at', 'updated_at', 'name', 'algorithm', 'hash_on', 'hash_fallback', 'hash_on_header',
+                 'hash_fallback_header', 'hash_on_cookie', 'hash_on_cookie_path', 'hash_on_query_arg',
+                 'hash_fallback_query_arg', 'hash_on_uri_capture', 'hash_fallback_uri_capture', 'slots',
+                 'healthchecks', 'tags', 'host_header', 'client_certificate', 'use_srv_name')
+    REFS = ('client_certificate',)
+    INTERNED = ('algorithm', 'hash_on', 'hash_fallback', 'hash_on_header', 'hash_fallback_header',
+                'hash_on_cookie', 'hash_on_cookie_path', 'hash_on_query_arg', 'hash_fallback_query_arg',
+                'hash_on_uri_capture', 'hash_fallback_uri_capture', 'tags')
+
+
+class Target(Entity):
+    KIND = 'targets'
+    __slots__ = ('id', 'created_at', 'updated_at', 'upstream', 'target', 'weight', 'tags')
+    REFS = ('upstream',)
+    INTERNED = ('tags',)
+
+
+MODELS = {model.KIND: model for model in (Service, Route, Plugin, Consumer, Upstream, Target)}
+
+
+def model_for(url):
+    """ Return the model of the entities an URL returns, None if it does not return entities with a model.
+
+    Entity URLs alternate collections and ids, e.g., '/services/xxx/routes' returns routes.
+
+    :param url: a partial URL, e.g., '/routes/xxx/service'
+    """
+    segments = [segment for segment in url.split('?', 1)[0].split('/') if segment]
+    if not segments:
+        return None
+    for position, segment in enumerate(segments):
+        if position % 2 == 0 and segment not in ENTITY_TYPES:
+            return None
+        if position % 2 == 1 and segment in _RESERVED:
+            return None
+    collection = segments[-1] if len(segments) % 2 else segments[-2]
+    return MODELS.get(ENTITY_TYPES[collection])
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+""" Resolve the plugins Kong runs for a request.
+
+When several instances of a plugin are configured, Kong runs the most specific one, i.e. the first
+one found in this order: consumer + route + service, consumer + route, consumer + service,
+route + service, consumer, route, service, and finally the global instance::
+
+    resolver = PluginResolver.load(kong_client)
+    resolver.resolve(route='httpbin-route', consumer='alice')
+    # {'rate-limiting': {...}, 'key-auth': {...}}
+"""
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+
+from kongclient.deadline import in_current_context
+
+# Plugin scopes, from the most specific to the least specific.
+PRECEDENCE = (
+    ('consumer', 'route', 'service'),
+    ('consumer', 'route'),
+    ('consumer', 'service'),
+    ('route', 'service'),
+    ('consumer',),
+    ('route',),
+    ('service',),
+    (),
+)
+
+SCOPE_FIELDS = ('consumer', 'route', 'service')
+
+
+def _ref_id(value):
+    """ Return the id of an entity given either as an entity (a dict or a model), a {'id': ...} reference or an id. """
+    if isinstance(value, Mapping):
+        return value.get('id')
+    return value
+
+
+class PluginResolver:
+    """ Effective plugin resolution from a local table of plugins.
+
+    The plugins are indexed by scope once, then every resolution costs a constant number of
+    dictionary lookups, without any request.
+
+    :param plugins: The plugins, as returned by the Kong API.
+    :param routes: The routes, used to find the service of a route when it is not given, and
+    to resolve route names.
+    :param services: The services, used to resolve service names.
+    :param consumers: The consumers, used to resolve usernames and custom ids.
+    """
+
+    def __init__(self, plugins, routes=(), services=(), consumers=()):
+        # (consumer id, route id, service id) -> {plugin name: plugin}
+        self._scopes = {}
+        for plugin in plugins:
+            if not plugin.get('enabled', True):
+                continue
+            scope = tuple(_ref_id(plugin.get(field)) for field in SCOPE_FIELDS)
+            self._scopes.setdefault(scope, {})[plugin['name']] = plugin
+        self._ids = {'consumer': {}, 'route': {}, 'service': {}}
+        self._route_services = {}
+        for route in routes:
+            self._route_services[route['id']] = _ref_id(route.get('service'))
+            if route.get('name'):
+                self._ids['route'][route['name']] = route['id']
+        for service in services:
+            if service.get('name'):
+                self._ids['service'][service['name']] = service['id']
+        for consumer in consumers:
+            for field in ('username', 'custom_id'):
+                if consumer.get(field):
+                    self._ids['consumer'][consumer[field]] = consumer['id']
+
+    @classmethod
+    def load(cls, kong, size=1000, max_workers=4):
+        """ Build a resolver from the plugins, routes, services and consumers of Kong, fetched in parallel.
+
+        :param kong: instance of KongClient.
+        :param size: The number of entities requested per page.
+        :param max_workers: The maximum number of requests running at the same time.
+        """
+        managers = (kong.plugins, kong.routes, kong.services, kong.consumers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(in_current_context(manager.list), size=size) for manager in managers]
+            plugins, routes, services, consumers = [future.result() for future in futures]
+        return cls(plugins, routes=routes, services=services, consumers=consumers)
+
+    @classmethod
+    def from_index(cls, index):
+        """ Build a resolver from a KongIndex, see `kongclient.index`. """
+        return cls(index.by_id['plugins'].values(), routes=index.by_id['routes'].values(),
+                   services=index.by_id['services'].values(), consumers=index.by_id['consumers'].values())
+
+    def _id(self, field, value):
+        value = _ref_id(value)
+        return self._ids[field].get(value, value)
+
+    def _scope(self, route=None, service=None, consumer=None):
+        """ Return the (consumer id, route id, service id) tuple of a request. """
+        route_id = self._id('route', route)
+        service_id = self._id('service', service)
+        if service_id is None and route_id is not None:
+            service_id = self._route_services.get(route_id)
+        return self._id('consumer', consumer), route_id, service_id
+
+    def _resolve(self, scope):
+        ids = dict(zip(SCOPE_FIELDS, scope))
+        effective = {}
+        # Apply the scopes from the least specific one, so that more specific instances win.
+        for fields in reversed(PRECEDENCE):
+            if any(ids[field] is None for field in fields):
+                continue
+            plugins = self._scopes.get(tuple(ids[field] if field in fields else None for field in SCOPE_FIELDS))
+            if plugins:
+                effective.update(plugins)
+        return effective
+
+    def resolve(self, route=None, service=None, consumer=None):
+        """ Return the plugins Kong runs for a request.
+
+        Each of route, service and consumer is given as an entity, an id or a name (username or
+        custom_id for consumers), None meaning the request does not match any. The service of
+        the route is used when no service is given.
+
+        :return: a dict mapping every plugin name to the plugin instance that runs.
+        """
+        return self._resolve(self._scope(route=route, service=service, consumer=consumer))
+
+    def resolve_many(self, requests):
+        """ Resolve the plugins of many requests, each distinct request being resolved once.
+
+        :param requests: an iterable of (route, service, consumer) tuples, see `resolve`.
+        :return: a list of dicts mapping every plugin name to the plugin instance that runs, in input order.
+        """
+        resolved = {}
+        results = []
+        for route, service, consumer in requests:
+            scope = self._scope(route=route, service=service, consumer=consumer)
+            effective = resolved.get(scope)
+            if effective is None:
+                effective = resolved[scope] = self._resolve(scope)
+            results.append(effective)
+        return results
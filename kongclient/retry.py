@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+# Methods replayed by default: they have the same effect whether they are sent once or twice.
+# Every PATCH sent by the managers targets a single object by id or name.
+IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'PATCH'))
+
+RETRY_STATUS_CODES = frozenset((429, 502, 503, 504))
+
+
+def parse_retry_after(value):
+    """ Return the number of seconds to wait from a Retry-After header value, None if it is invalid.
+
+    :param value: either a number of seconds or an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """ Retry policy of a KongClient, replaying failed requests with exponential backoff.
+
+    A request is replayed when it fails to get a response (TransportException) or gets one of
+    `status_codes`, as long as its method is in `methods`, fewer than `max_retries` retries were made
+    and the next attempt can start before `deadline` seconds have elapsed since the first one.
+
+    :param max_retries: The maximum number of retries of a request.
+    :param backoff_factor: The delay before the first retry, doubled on every retry, in seconds.
+    :param max_backoff: The maximum delay between two attempts, in seconds.
+    :param jitter: Whether delays are randomized between 0 and the computed backoff, so that
+    clients failing at the same time do not retry at the same time.
+    :param deadline: The maximum time spent on a request, retries included, in seconds.
+    :param status_codes: The http status codes that are retried.
+    :param methods: The http methods that are retried, POST is not replayed by default
+    because it would create duplicates.
+    :param respect_retry_after: Whether the Retry-After header of a response sets the delay.
+    """
+
+    def __init__(self, max_retries=3, backoff_factor=0.5, max_backoff=30, jitter=True, deadline=None,
+                 status_codes=RETRY_STATUS_CODES, methods=IDEMPOTENT_METHODS, respect_retry_after=True):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.deadline = deadline
+        self.status_codes = frozenset(status_codes)
+        self.methods = frozenset(method.upper() for method in methods)
+        self.respect_retry_after = respect_retry_after
+
+    def backoff(self, attempt):
+        """ Return the delay before a retry, in seconds.
+
+        :param attempt: the number of attempts already made, starting at 1.
+        """
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** (attempt - 1)))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def next_delay(self, method, attempt, started_at, response=None, error=None):
+        """ Decide whether a request is retried.
+
+        :param method: the http method of the request.
+        :param attempt: the number of attempts already made, starting at 1.
+        :param started_at: the time.monotonic() value of the first attempt.
+        :param response: the response of the last attempt, if any.
+        :param error: the TransportException raised by the last attempt, if any.
+        :return: the delay before the next attempt in seconds, or None if the request is not retried.
+        """
+        if method.upper() not in self.methods or attempt > self.max_retries:
+            return None
+        if response is not None and response.status_code not in self.status_codes:
+            return None
+        delay = self.backoff(attempt)
+        if response is not None and self.respect_retry_after:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                delay = retry_after
+        if self.deadline is not None and time.monotonic() + delay - started_at > self.deadline:
+            return None
+        return delay
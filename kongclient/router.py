@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+""" Simulate how Kong matches requests to routes, without sending traffic through a proxy.
+
+Routes are compiled once into a character trie of prefix paths and a table of regex paths
+ordered by `regex_priority`, then every request is matched in-process::
+
+    router = RouteMatcher.load(kong_client)
+    router.match('/status/200', host='httpbin.org', method='GET')
+    router.conflicts()
+
+Like the Kong router, a route matches a request when every attribute it configures (protocols,
+hosts, paths, methods, headers and snis) matches. When several routes match, the one configuring
+the most attributes wins, then the one configuring hosts, headers, paths, methods and snis in that
+order of importance, then regex paths by `regex_priority` before prefix paths by length,
+then plain hosts before wildcard hosts, then the oldest route.
+"""
+import re
+
+# Characters of plain prefix paths, any other character makes a path a regex.
+PLAIN_PATH = re.compile(r'^[a-zA-Z0-9.\-_~/%]*$')
+
+TLS_PROTOCOLS = frozenset(('https', 'grpcs', 'tls'))
+
+# Between routes configuring as many attributes, the ones configuring the heaviest attributes win.
+HOSTS, HEADERS, PATHS, METHODS, SNIS = 0x10, 0x08, 0x04, 0x02, 0x01
+
+
+def is_regex_path(path):
+    """ Return whether a route path is a regex, either prefixed with '~' or using regex characters. """
+    return path.startswith('~') or not PLAIN_PATH.match(path)
+
+
+def _host_matches(pattern, host):
+    """ Match a request host against a route host, which may start or end with a '*' wildcard. """
+    if pattern.startswith('*'):
+        return host.endswith(pattern[1:])
+    if pattern.endswith('*'):
+        return host.startswith(pattern[:-1])
+    return host == pattern
+
+
+class _CompiledRoute:
+    """ The match attributes of a route, normalized for fast comparisons. """
+
+    def __init__(self, route, position):
+        self.route = route
+        self.position = position
+        self.protocols = frozenset(route.get('protocols') or ('http', 'https'))
+        hosts = route.get('hosts') or ()
+        self.hosts = frozenset(host.lower() for host in hosts if '*' not in host)
+        self.wildcard_hosts = tuple(host.lower() for host in hosts if '*' in host)
+        self.methods = frozenset(method.upper() for method in route.get('methods') or ())
+        self.headers = {name.lower(): frozenset(value.lower() for value in values)
+                        for name, values in (route.get('headers') or {}).items() if name.lower() != 'host'}
+        self.snis = frozenset(route.get('snis') or ())
+        self.paths = tuple(route.get('paths') or ())
+        self.regex_priority = route.get('regex_priority') or 0
+        self.created_at = route.get('created_at') or 0
+        attributes = ((hosts, HOSTS), (self.headers, HEADERS), (self.paths, PATHS), (self.methods, METHODS),
+                      (self.snis, SNIS))
+        self.weight = sum(1 for attribute, _ in attributes if attribute)
+        self.category = sum(bit for attribute, bit in attributes if attribute)
+
+    def match_host(self, host):
+        """ Return 0 for a plain host match or no hosts configured, 1 for a wildcard match, None otherwise. """
+        if not self.hosts and not self.wildcard_hosts:
+            return 0
+        if host is None:
+            return None
+        host = host.lower()
+        if host in self.hosts:
+            return 0
+        name = host.rsplit(':', 1)[0] if ':' in host else host
+        if name in self.hosts:
+            return 0
+        if any(_host_matches(pattern, host) or _host_matches(pattern, name) for pattern in self.wildcard_hosts):
+            return 1
+        return None
+
+    def match_attributes(self, method, headers, sni, protocol):
+        """ Return whether the attributes other than paths and hosts match a request. """
+        if protocol not in self.protocols:
+            return False
+        if self.methods and method.upper() not in self.methods:
+            return False
+        for name, values in self.headers.items():
+            value = headers.get(name)
+            if value is None or value.lower() not in values:
+                return False
+        if self.snis and (protocol not in TLS_PROTOCOLS or sni not in self.snis):
+            return False
+        return True
+
+    def rank(self, regex, path_weight, host_kind):
+        """ Return the sort key of a matching route, the lowest one winning.
+
+        :param regex: Whether the route matched with a regex path.
+        :param path_weight: The regex_priority of the regex path, or the length of the prefix path.
+        :param host_kind: The value returned by `match_host`.
+        """
+        return (-self.weight, -self.category, not regex, -path_weight, host_kind, self.created_at, self.position)
+
+
+class RouteConflict:
+    """ Two routes matching the same requests.
+
+    :param kind: 'duplicate' when both routes have the same match attributes and the oldest one always wins,
+    'regex-overlap' when a regex path of `route` also matches the prefix path of `other` and wins over it.
+    :param route: The route winning the conflict.
+    :param other: The route losing the conflict.
+    :param host: The host both routes match, None for any host.
+    :param path: The path both routes match, None for any path.
+    """
+
+    def __init__(self, kind, route, other, host=None, path=None):
+        self.kind = kind
+        self.route = route
+        self.other = other
+        self.host = host
+        self.path = path
+
+    def __repr__(self):
+        return 'RouteConflict(%s %r %r host=%r path=%r)' % (
+            self.kind, self.route.get('name') or self.route.get('id'), self.other.get('name') or self.other.get('id'),
+            self.host, self.path)
+
+
+class RouteMatcher:
+    """ In-process route matching engine.
+
+    :param routes: The routes, as returned by the Kong API.
+    """
+
+    def __init__(self, routes):
+        self.routes = [_CompiledRoute(route, position) for position, route in enumerate(routes)]
+        # Character trie of prefix paths, every node is a (children, [(route, prefix path)]) tuple.
+        self._trie = ({}, [])
+        # Regex paths, in evaluation order.
+        self._regexes = []
+        # Routes without paths, they match any path.
+        self._any_path = []
+        for compiled in self.routes:
+            if not compiled.paths:
+                self._any_path.append(compiled)
+            for path in compiled.paths:
+                if is_regex_path(path):
+                    pattern = path[1:] if path.startswith('~') else path
+                    self._regexes.append((compiled, path, re.compile(pattern)))
+                else:
+                    node = self._trie
+                    for char in path:
+                        node = node[0].setdefault(char, ({}, []))
+                    node[1].append((compiled, path))
+        self._regexes.sort(key=lambda entry: (-entry[0].regex_priority, entry[0].created_at, entry[0].position))
+
+    @classmethod
+    def load(cls, kong, size=1000):
+        """ Build a matcher from the routes of Kong.
+
+        :param kong: instance of KongClient.
+        :param size: The number of routes requested per page.
+        """
+        return cls(kong.routes.list(size=size))
+
+    def _prefixes(self, path):
+        """ Yield the routes having a prefix path of a request path, with that prefix. """
+        node = self._trie
+        for entry in node[1]:
+            yield entry
+        for char in path:
+            node = node[0].get(char)
+            if node is None:
+                return
+            for entry in node[1]:
+                yield entry
+
+    def _candidates(self, path):
+        """ Yield (route, regex, path weight) tuples of the routes whose paths match a request path. """
+        for compiled, prefix in self._prefixes(path):
+            yield compiled, False, len(prefix)
+        for compiled, _, regex in self._regexes:
+            if regex.match(path):
+                yield compiled, True, compiled.regex_priority
+        for compiled in self._any_path:
+            yield compiled, False, 0
+
+    def match(self, path='/', host=None, method='GET', headers=None, sni=None, protocol='http'):
+        """ Return the route Kong would match a request with, None if no route matches.
+
+        :param path: The path of the request, without its query string.
+        :param host: The Host header of the request.
+        :param method: The http method of the request.
+        :param headers: The other headers of the request.
+        :param sni: The server name sent during the TLS handshake.
+        :param protocol: The protocol of the request, e.g., 'http' or 'https'.
+        """
+        headers = {name.lower(): value for name, value in (headers or {}).items()}
+        best_key = None
+        best = None
+        for compiled, regex, path_weight in self._candidates(path):
+            host_kind = compiled.match_host(host)
+            if host_kind is None or not compiled.match_attributes(method, headers, sni, protocol):
+                continue
+            key = compiled.rank(regex, path_weight, host_kind)
+            if best_key is None or key < best_key:
+                best_key = key
+                best = compiled
+        return best.route if best is not None else None
+
+    def match_many(self, requests):
+        """ Match many requests.
+
+        :param requests: an iterable of dicts of `match` arguments, e.g., {'path': '/', 'host': 'example.com'}.
+        :return: a list of matched routes or None, in input order.
+        """
+        return [self.match(**request) for request in requests]
+
+    @staticmethod
+    def _overlap(compiled, other):
+        """ Return whether two routes match the same requests, paths and hosts aside. """
+        return (compiled.protocols & other.protocols
+                and bool(compiled.methods) == bool(other.methods)
+                and (not compiled.methods or compiled.methods & other.methods)
+                and compiled.headers.keys() == other.headers.keys()
+                and all(values & other.headers[name] for name, values in compiled.headers.items())
+                and bool(compiled.snis) == bool(other.snis)
+                and (not compiled.snis or compiled.snis & other.snis))
+
+    @staticmethod
+    def _host_keys(compiled):
+        return sorted(compiled.hosts | set(compiled.wildcard_hosts)) or [None]
+
+    def conflicts(self):
+        """ Find the routes matching the same requests, to check a route table before pushing it.
+
+        Routes are grouped by host and path so that only routes sharing a host are compared.
+
+        :return: a list of RouteConflict.
+        """
+        conflicts = []
+        reported = set()
+        # Routes with the same host and path, and the prefix paths of every host.
+        by_host_path = {}
+        prefixes_by_host = {}
+        for compiled in self.routes:
+            for host in self._host_keys(compiled):
+                for path in compiled.paths or (None,):
+                    by_host_path.setdefault((host, path), []).append(compiled)
+                    if path is not None and not is_regex_path(path):
+                        prefixes_by_host.setdefault(host, []).append((compiled, path))
+
+        def report(kind, winner, loser, host, path):
+            pair = (kind, winner.position, loser.position)
+            if pair not in reported:
+                reported.add(pair)
+                conflicts.append(RouteConflict(kind, winner.route, loser.route, host=host, path=path))
+
+        for (host, path), group in by_host_path.items():
+            group = sorted(group, key=lambda compiled: (compiled.created_at, compiled.position))
+            for i, compiled in enumerate(group):
+                for other in group[i + 1:]:
+                    if compiled is not other and self._overlap(compiled, other):
+                        report('duplicate', compiled, other, host, path)
+        for compiled, path, regex in self._regexes:
+            for host in self._host_keys(compiled):
+                for other, prefix in prefixes_by_host.get(host, ()):
+                    if other is not compiled and compiled.weight >= other.weight and regex.match(prefix) \
+                            and self._overlap(compiled, other):
+                        report('regex-overlap', compiled, other, host, prefix)
+        return conflicts
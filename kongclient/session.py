@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+""" The session KongClient sent its requests through before transports were pluggable.
+
+KongClient no longer uses it, it is kept for the code creating its own sessions, e.g., to send
+requests the managers do not cover::
+
+    session = HttpSession('https://localhost:8444')
+    session.get('/status')
+"""
+import requests
+from requests.compat import urljoin
+
+
+class HttpSession(requests.Session):
+    """ A requests.Session sending requests relative to the URL of the Kong admin API.
+
+    :param base_url: The URL of the Kong admin API.
+    :param verify_ssl: Whether the SSL certificate of the Kong admin API is verified.
+    """
+
+    def __init__(self, base_url, verify_ssl=False):
+        super(HttpSession, self).__init__()
+        self.verify = bool(verify_ssl)
+        self.base_url = base_url
+
+    def request(self, method, url, *args, **kwargs):
+        url = urljoin(base=self.base_url, url=url)
+        return super(HttpSession, self).request(method, url, *args, **kwargs)
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+""" Coalescing of identical concurrent reads.
+
+While a GET is in flight, identical GETs wait for it and share its result instead of sending
+their own request, which caps the load on the Kong admin API during bursts::
+
+    kong_client = KongClient(kong_url, coalesce=True)
+
+Like cached responses, shared results must not be mutated.
+"""
+import threading
+
+from kongclient.deadline import current_deadline
+from kongclient.exceptions import DeadlineExceeded
+
+
+class _Call:
+    """ An in-flight call, and its outcome once it is done. """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """ Runs at most one call per key at a time, concurrent callers of the same key share its outcome. """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """ Call func, or wait for the in-flight call of the same key and return its result.
+
+        A caller waiting for another one gives up when the deadline of its context expires.
+
+        :param key: the key identifying identical calls, e.g., the URL of a GET.
+        :param func: the function to call, without arguments.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            deadline = current_deadline()
+            if not call.done.wait(deadline.remaining() if deadline is not None else None):
+                raise DeadlineExceeded(method='GET', url=key)
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    def forget(self):
+        """ Make the next calls start their own request instead of joining the in-flight ones,
+        e.g., after a write that in-flight reads may not see.
+        """
+        with self._lock:
+            self._calls.clear()
+
+
+class AsyncSingleFlight:
+    """ Asyncio version of SingleFlight. """
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, func):
+        """ Await func(), or the in-flight call of the same key, see `SingleFlight.do`.
+
+        :param key: the key identifying identical calls, e.g., the URL of a GET.
+        :param func: the coroutine function to call, without arguments.
+        """
+        import asyncio
+        task = self._calls.get(key)
+        if task is None:
+            # The call runs in its own task, which every caller awaits through a shield: cancelling
+            # any caller, the first one included, leaves the call running for the others.
+            task = self._calls[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda done: self._done(key, done))
+        return await asyncio.shield(task)
+
+    def _done(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Retrieve the exception so that it is not reported as never retrieved when every caller was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+    def forget(self):
+        """ Make the next calls start their own request, see `SingleFlight.forget`. """
+        self._calls.clear()
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+""" Export the whole gateway configuration, and load it back.
+
+Every collection is fetched in its own thread with full pagination, and entities are written as soon
+as they are decoded, so memory stays bounded by a few pages whatever the size of the configuration::
+
+    with open('kong.ndjson', 'w') as fp:
+        snapshot(kong_client, fp)
+    with open('kong.ndjson') as fp:
+        config = load_snapshot(fp)
+    config.get('services', 'httpbin')
+
+Two formats are supported: 'ndjson', one {"type": "services", "entity": {...}} object per line
+in the order entities arrive, and 'json', a single {"services": [...], "routes": [...], ...} object.
+"""
+import itertools
+import json
+import queue
+import threading
+
+from kongclient.codec import ensure_decoded
+from kongclient.deadline import in_current_context
+
+# Collections in dependency order, an entity only refers to entities of the collections before it.
+COLLECTIONS = ('certificates', 'snis', 'services', 'routes', 'consumers', 'upstreams', 'targets', 'plugins')
+
+_DONE = object()
+
+
+class _Failure:
+    """ Carries the exception raised by a producer thread to the writer. """
+
+    def __init__(self, error):
+        self.error = error
+
+
+def _plain(entity):
+    """ Return an entity as a dict, e.g., a model returned by a client decoding entities into models. """
+    return entity if isinstance(entity, dict) else dict(entity)
+
+
+def _iterate(kong, kind, size):
+    """ Iterate over all the entities of a collection. """
+    if kind != 'targets':
+        return getattr(kong, kind).iter(size=size)
+    # Targets can only be listed per upstream.
+    return (target for upstream in kong.upstreams.iter(size=size)
+            for target in kong.upstreams.iter_targets(upstream['id'], size=size))
+
+
+def snapshot(kong, fp, format='ndjson', size=1000, buffer_size=None, collections=COLLECTIONS):
+    """ Fetch every entity collection in parallel and stream it to a file.
+
+    :param kong: instance of KongClient, decoding responses, i.e., not with Codec(raw=True).
+    :param fp: a path or a text file-like object.
+    :param format: 'ndjson' or 'json'.
+    :param size: The number of entities requested per page.
+    :param buffer_size: The maximum number of entities buffered per collection, waiting to be written.
+    Defaults to two pages.
+    :param collections: The collections to export.
+    :return: a dict mapping every collection to its number of entities.
+    """
+    if format not in ('ndjson', 'json'):
+        raise ValueError('Unknown snapshot format %r, expected ndjson or json' % format)
+    ensure_decoded(kong, 'snapshot')
+    if isinstance(fp, str):
+        with open(fp, 'w') as f:
+            return snapshot(kong, f, format=format, size=size, buffer_size=buffer_size, collections=collections)
+
+    buffer_size = buffer_size or 2 * size
+    stop = threading.Event()
+    # NDJSON interleaves collections in arrival order, JSON writes them one after the other,
+    # so that collections waiting for their turn block on their own full buffer.
+    shared = queue.Queue(maxsize=buffer_size) if format == 'ndjson' else None
+    queues = {kind: shared if shared is not None else queue.Queue(maxsize=buffer_size) for kind in collections}
+
+    def put(q, item):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(kind):
+        try:
+            for entity in _iterate(kong, kind, size):
+                if not put(queues[kind], (kind, entity)):
+                    return
+            put(queues[kind], (kind, _DONE))
+        except Exception as e:
+            put(queues[kind], (kind, _Failure(e)))
+
+    threads = [threading.Thread(target=in_current_context(produce), args=(kind,),
+                                name='kongclient-snapshot-%s' % kind, daemon=True) for kind in collections]
+    for thread in threads:
+        thread.start()
+    counts = {kind: 0 for kind in collections}
+    try:
+        if format == 'ndjson':
+            remaining = len(collections)
+            while remaining:
+                kind, entity = shared.get()
+                if entity is _DONE:
+                    remaining -= 1
+                    continue
+                if isinstance(entity, _Failure):
+                    raise entity.error
+                fp.write(json.dumps({'type': kind, 'entity': _plain(entity)}))
+                fp.write('\n')
+                counts[kind] += 1
+        else:
+            fp.write('{')
+            for position, kind in enumerate(collections):
+                fp.write('%s\n%s: [' % (',' if position else '', json.dumps(kind)))
+                while True:
+                    _, entity = queues[kind].get()
+                    if entity is _DONE:
+                        break
+                    if isinstance(entity, _Failure):
+                        raise entity.error
+                    fp.write('%s\n  %s' % (',' if counts[kind] else '', json.dumps(_plain(entity))))
+                    counts[kind] += 1
+                fp.write('\n]')
+            fp.write('\n}\n')
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return counts
+
+
+class Snapshot:
+    """ In-memory model of a gateway configuration, indexed by id and by name.
+
+    :param entities: a dict mapping every collection to a list of entities.
+    """
+
+    def __init__(self, entities):
+        self.entities = {kind: list(entities.get(kind) or ()) for kind in COLLECTIONS}
+        self.by_id = {}
+        self.by_name = {}
+        for kind, collection in self.entities.items():
+            self.by_id[kind] = {entity['id']: entity for entity in collection if 'id' in entity}
+            name_key = 'username' if kind == 'consumers' else 'target' if kind == 'targets' else 'name'
+            if kind not in ('certificates', 'plugins', 'targets'):
+                self.by_name[kind] = {entity[name_key]: entity for entity in collection if entity.get(name_key)}
+
+    def __getitem__(self, kind):
+        return self.entities[kind]
+
+    def __len__(self):
+        return sum(len(collection) for collection in self.entities.values())
+
+    def get(self, kind, id_or_name):
+        """ Return an entity by id, or by name (username for consumers), None if it does not exist.
+
+        :param kind: The collection of the entity, e.g., 'services'
+        :param id_or_name: The unique identifier or the name of the entity.
+        """
+        entity = self.by_id[kind].get(id_or_name)
+        if entity is None:
+            entity = self.by_name.get(kind, {}).get(id_or_name)
+        return entity
+
+
+def load_snapshot(fp, format=None):
+    """ Load a snapshot written by `snapshot`.
+
+    :param fp: a path or a text file-like object.
+    :param format: 'ndjson' or 'json', guessed from the first line when None.
+    :return: a Snapshot.
+    """
+    if isinstance(fp, str):
+        with open(fp) as f:
+            return load_snapshot(f, format=format)
+    first_line = fp.readline()
+    if format is None and not first_line.strip():
+        # An NDJSON snapshot of an empty gateway is an empty file.
+        format = 'ndjson'
+    elif format is None:
+        try:
+            first = json.loads(first_line)
+            format = 'ndjson' if isinstance(first, dict) and 'type' in first and 'entity' in first else 'json'
+        except ValueError:
+            format = 'json'
+    if format == 'json':
+        return Snapshot(json.loads(first_line + fp.read()))
+    entities = {kind: [] for kind in COLLECTIONS}
+    for line in itertools.chain([first_line], fp):
+        line = line.strip()
+        if line:
+            item = json.loads(line)
+            entities.setdefault(item['type'], []).append(item['entity'])
+    return Snapshot(entities)
+
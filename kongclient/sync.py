@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+""" Declarative configuration sync, in the spirit of decK.
+
+The desired state is a dictionary of entity lists. Routes and plugins may be nested
+in services, routes and consumers, targets in upstreams and SNIs in certificates::
+
+    desired = {
+        'services': [{
+            'name': 'httpbin',
+            'url': 'https://httpbin.org',
+            'routes': [{'name': 'httpbin', 'hosts': ['httpbin.org'], 'plugins': [{'name': 'cors'}]}],
+            'plugins': [{'name': 'rate-limiting', 'config': {'minute': 20}}],
+        }],
+        'consumers': [{'username': 'alice'}],
+        'plugins': [{'name': 'prometheus'}],
+        'upstreams': [{'name': 'httpbin.org', 'targets': [{'target': '10.0.0.1:80', 'weight': 100}]}],
+        'certificates': [{'cert': '...', 'key': '...', 'snis': ['httpbin.org']}],
+    }
+    plan = sync(kong_client, desired, dry_run=True)
+
+Entities refer to each other by name (service, route, upstream, SNI), username (consumer)
+or id. Only the fields present in the desired state are compared, so Kong defaults never
+show up as changes.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from kongclient.codec import ensure_decoded
+from kongclient.deadline import in_current_context
+
+# Entity kinds in dependency order: an entity only refers to entities of the kinds before it.
+KINDS = ('certificates', 'snis', 'services', 'routes', 'consumers', 'upstreams', 'targets', 'plugins')
+
+# The fields holding a reference to another entity, and the kind they refer to.
+FOREIGN_KEYS = {
+    'snis': {'certificate': 'certificates'},
+    'routes': {'service': 'services'},
+    'targets': {'upstream': 'upstreams'},
+    'plugins': {'service': 'services', 'route': 'routes', 'consumer': 'consumers'},
+}
+
+# Fields of the desired state never compared with the current state.
+IGNORED_FIELDS = ('id', 'created_at', 'updated_at')
+
+DEFAULT_PORTS = {'http': 80, 'https': 443, 'grpc': 80, 'grpcs': 443}
+
+
+class Change:
+    """ A create, update or delete of one entity.
+
+    :param action: One of 'create', 'update' or 'delete'.
+    :param kind: The entity kind, e.g., 'services'
+    :param key: The identity of the entity, e.g., the service name.
+    :param fields: The fields sent to Kong, only the changed ones for an update.
+    :param current: The entity currently stored in Kong, None for a create.
+    :param refs: The keys of the entities referred to, e.g., {'service': 'httpbin'}
+    """
+
+    def __init__(self, action, kind, key, fields=None, current=None, refs=None):
+        self.action = action
+        self.kind = kind
+        self.key = key
+        self.fields = fields or {}
+        self.current = current
+        self.refs = refs or {}
+        self.result = None
+        self.error = None
+
+    def __repr__(self):
+        return 'Change(%s %s %r%s)' % (self.action, self.kind, self.key,
+                                       ' %s' % sorted(self.fields) if self.action == 'update' else '')
+
+
+class SyncPlan:
+    """ The ordered list of changes turning the current state into the desired one.
+
+    :param changes: The changes, creates and updates in dependency order followed by deletes
+    in reverse dependency order.
+    :param ids: The ids of the entities already stored in Kong, as a {kind: {key: id}} dict.
+    """
+
+    def __init__(self, changes, ids=None):
+        self.changes = changes
+        self.ids = ids or {}
+        self.applied = False
+
+    def __iter__(self):
+        return iter(self.changes)
+
+    def __len__(self):
+        return len(self.changes)
+
+    @property
+    def errors(self):
+        return [change for change in self.changes if change.error is not None]
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def summary(self):
+        """ Count the changes per action, e.g., {'create': 2, 'update': 1, 'delete': 0}. """
+        counts = {'create': 0, 'update': 0, 'delete': 0}
+        for change in self.changes:
+            counts[change.action] += 1
+        return counts
+
+
+def _matches(desired, current):
+    """ Whether a desired value is satisfied by the current one, dicts only compare the desired keys. """
+    if isinstance(desired, dict):
+        return isinstance(current, dict) and all(_matches(v, current.get(k)) for k, v in desired.items())
+    if isinstance(desired, (list, tuple)):
+        return (isinstance(current, (list, tuple)) and len(desired) == len(current) and
+                all(_matches(d, c) for d, c in zip(desired, current)))
+    return desired == current
+
+
+def _split_url(url):
+    """ Expand the `url` shorthand of a service into the fields Kong stores. """
+    parsed = urlparse(url)
+    return {
+        'protocol': parsed.scheme,
+        'host': parsed.hostname,
+        'port': parsed.port or DEFAULT_PORTS.get(parsed.scheme, 80),
+        'path': parsed.path or None,
+    }
+
+
+def _entity_key(kind, entity, refs):
+    """ Return the identity of an entity, given the keys of the entities it refers to. """
+    if kind == 'certificates':
+        return entity.get('id') or entity['cert'].strip()
+    if kind == 'consumers':
+        return entity.get('username') or entity.get('custom_id')
+    if kind == 'targets':
+        return refs['upstream'], entity['target']
+    if kind == 'plugins':
+        return entity['name'], refs.get('service'), refs.get('route'), refs.get('consumer')
+    return entity['name']
+
+
+def flatten(desired, select_tags=None):
+    """ Turn a desired state document into one flat list of entities per kind.
+
+    Nested entities get a reference to their parent, e.g., a route nested in the
+    service 'httpbin' gets {'service': 'httpbin'}.
+
+    :param desired: The desired state document.
+    :param select_tags: Tags added to every entity.
+    """
+    state = {kind: [] for kind in KINDS}
+
+    def add(kind, entity, **parent):
+        entity = dict(entity, **parent)
+        if select_tags:
+            tags = list(entity.get('tags') or [])
+            entity['tags'] = tags + [tag for tag in select_tags if tag not in tags]
+        state[kind].append(entity)
+        return entity
+
+    def add_plugins(plugins, **parent):
+        for plugin in plugins or ():
+            add('plugins', plugin, **parent)
+
+    for certificate in desired.get('certificates') or ():
+        certificate = dict(certificate)
+        snis = certificate.pop('snis', None) or ()
+        certificate = add('certificates', certificate)
+        for sni in snis:
+            add('snis', {'name': sni} if isinstance(sni, str) else sni,
+                certificate=certificate.get('id') or certificate['cert'].strip())
+    for sni in desired.get('snis') or ():
+        add('snis', sni)
+    for service in desired.get('services') or ():
+        service = dict(service)
+        routes = service.pop('routes', None) or ()
+        plugins = service.pop('plugins', None)
+        if service.get('url'):
+            service.update(_split_url(service.pop('url')))
+        add('services', service)
+        add_plugins(plugins, service=service['name'])
+        for route in routes:
+            route = dict(route)
+            route_plugins = route.pop('plugins', None)
+            add('routes', route, service=service['name'])
+            add_plugins(route_plugins, route=route['name'])
+    for route in desired.get('routes') or ():
+        route = dict(route)
+        route_plugins = route.pop('plugins', None)
+        add('routes', route)
+        add_plugins(route_plugins, route=route['name'])
+    for consumer in desired.get('consumers') or ():
+        consumer = dict(consumer)
+        plugins = consumer.pop('plugins', None)
+        add('consumers', consumer)
+        add_plugins(plugins, consumer=consumer.get('username') or consumer.get('custom_id'))
+    for upstream in desired.get('upstreams') or ():
+        upstream = dict(upstream)
+        targets = upstream.pop('targets', None) or ()
+        add('upstreams', upstream)
+        for target in targets:
+            add('targets', target, upstream=upstream['name'])
+    for target in desired.get('targets') or ():
+        add('targets', target)
+    add_plugins(desired.get('plugins'))
+    return state
+
+
+class Syncer:
+    """ Compute and apply the minimal set of changes between a desired state and Kong.
+
+    :param kong: instance of KongClient, decoding responses, i.e., not with Codec(raw=True).
+    :param max_workers: The maximum number of requests running at the same time,
+    both to fetch the current state and to apply changes.
+    :param select_tags: When set, only the entities having all these tags are managed,
+    and the tags are added to every entity created.
+    """
+
+    def __init__(self, kong, max_workers=10, select_tags=None):
+        ensure_decoded(kong, type(self).__name__)
+        self.kong = kong
+        self.max_workers = max_workers
+        self.select_tags = list(select_tags or ())
+
+    def _managed(self, entity):
+        tags = entity.get('tags') or ()
+        return all(tag in tags for tag in self.select_tags)
+
+    def fetch(self):
+        """ Fetch all entities of every kind from Kong, in parallel.
+
+        :return: a dict mapping every kind to a list of entities.
+        """
+        collections = {
+            'certificates': self.kong.certificates, 'snis': self.kong.snis, 'services': self.kong.services,
+            'routes': self.kong.routes, 'consumers': self.kong.consumers, 'upstreams': self.kong.upstreams,
+            'plugins': self.kong.plugins,
+        }
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {kind: executor.submit(in_current_context(manager.list), size=1000)
+                       for kind, manager in collections.items()}
+            current = {kind: future.result() for kind, future in futures.items()}
+            list_targets = in_current_context(
+                lambda upstream: self.kong.upstreams.list_targets(upstream['id'], size=1000))
+            targets = executor.map(list_targets, current['upstreams'])
+            current['targets'] = [target for upstream_targets in targets for target in upstream_targets]
+        for kind in KINDS:
+            current[kind] = [entity for entity in current[kind] if self._managed(entity)]
+        return current
+
+    def _index(self, current):
+        """ Index the current entities by kind and key, and map ids to keys. """
+        by_key = {kind: {} for kind in KINDS}
+        id_to_key = {kind: {} for kind in KINDS}
+        for kind in KINDS:
+            for entity in current[kind]:
+                refs = {}
+                for field, ref_kind in FOREIGN_KEYS.get(kind, {}).items():
+                    ref = entity.get(field)
+                    refs[field] = id_to_key[ref_kind].get(ref['id']) if ref else None
+                key = _entity_key(kind, entity, refs)
+                by_key[kind][key] = (entity, refs)
+                id_to_key[kind][entity['id']] = key
+                if kind == 'certificates':
+                    # Certificates have no name, their PEM-encoded content is an alias of their id.
+                    id_to_key[kind][entity['cert'].strip()] = key
+        return by_key, id_to_key
+
+    def diff(self, desired, current=None):
+        """ Compute the changes turning the current state into the desired one.
+
+        :param desired: The desired state document.
+        :param current: The current state as returned by `fetch`, fetched when None.
+        :return: a SyncPlan.
+        :raise ValueError: when an entity refers to an entity that is neither desired nor in Kong.
+        """
+        current = self.fetch() if current is None else current
+        state = flatten(desired, select_tags=self.select_tags)
+        by_key, id_to_key = self._index(current)
+        # The keys of the desired entities, which the entities of the next kinds may refer to.
+        desired_keys = {kind: set() for kind in KINDS}
+        matched = set()
+        changes = []
+        for kind in KINDS:
+            foreign_keys = FOREIGN_KEYS.get(kind, {})
+            for entity in state[kind]:
+                refs = {}
+                for field, ref_kind in foreign_keys.items():
+                    ref = entity.get(field)
+                    if ref is None:
+                        refs[field] = None
+                        continue
+                    refs[field] = id_to_key[ref_kind].get(ref, ref)
+                    if refs[field] not in desired_keys[ref_kind] and refs[field] not in by_key[ref_kind]:
+                        raise ValueError('%s %r refers to the %s %r, which is neither desired nor in Kong'
+                                         % (kind, entity.get('name') or entity.get('target'), field, ref))
+                key = _entity_key(kind, entity, refs)
+                if kind == 'certificates':
+                    key = id_to_key[kind].get(key, key)
+                desired_keys[kind].add(key)
+                fields = {k: v for k, v in entity.items() if k not in foreign_keys and k not in IGNORED_FIELDS}
+                existing, existing_refs = by_key[kind].get(key, (None, None))
+                if existing is None:
+                    changes.append(Change('create', kind, key, fields=fields, refs=refs))
+                    continue
+                matched.add((kind, existing['id']))
+                changed = {k: v for k, v in fields.items() if not _matches(v, existing.get(k))}
+                if kind == 'certificates':
+                    changed.pop('snis', None)
+                moved = {field: ref for field, ref in refs.items() if ref != existing_refs.get(field)}
+                if changed or moved:
+                    changed.update(moved)
+                    changes.append(Change('update', kind, key, fields=changed, current=existing, refs=refs))
+        for kind in reversed(KINDS):
+            for entity in current[kind]:
+                if (kind, entity['id']) not in matched:
+                    changes.append(Change('delete', kind, id_to_key[kind][entity['id']], current=entity))
+        ids = {kind: {key: entity['id'] for key, (entity, _) in by_key[kind].items()} for kind in KINDS}
+        return SyncPlan(changes, ids=ids)
+
+    @staticmethod
+    def _ref_id(ids, kind, field, key):
+        """ Return the id of the entity a foreign key refers to, None when the foreign key is not set. """
+        if key is None:
+            return None
+        ref_id = ids[FOREIGN_KEYS[kind][field]].get(key)
+        if ref_id is None:
+            # Never send a null reference for a set one, e.g., a plugin of a service would become global.
+            raise ValueError('%s: the %s %r does not exist' % (kind, field, key))
+        return ref_id
+
+    def _apply_change(self, change, ids):
+        """ Send one change to Kong, ids maps every kind to a {key: id} dict. """
+        kong = self.kong
+        kind = change.kind
+        foreign_keys = FOREIGN_KEYS.get(kind, {})
+        fields = dict(change.fields)
+        if change.action == 'delete':
+            if kind == 'targets':
+                return kong.targets.delete_target_by_upstream(change.current['upstream']['id'], change.current['id'])
+            return getattr(kong, kind).delete(change.current['id'])
+        if change.action == 'update':
+            for field in foreign_keys:
+                if field in fields:
+                    fields[field] = self._ref_id(ids, kind, field, fields[field])
+            if kind == 'targets':
+                return kong.targets.update_target_by_upstream(change.current['upstream']['id'], change.current['id'],
+                                                              **fields)
+            return getattr(kong, kind).update(change.current['id'], **fields)
+        ref_ids = {field: self._ref_id(ids, kind, field, change.refs.get(field)) for field in foreign_keys}
+        if kind == 'targets':
+            return kong.upstreams.add_target(ref_ids['upstream'], **fields)
+        if kind == 'snis':
+            return kong.snis.create(certificate_id=ref_ids['certificate'], **fields)
+        if kind == 'routes':
+            return kong.routes.create(service_id=ref_ids['service'], **fields)
+        if kind == 'plugins':
+            return kong.plugins.create(service_id=ref_ids['service'], route_id=ref_ids['route'],
+                                       consumer_id=ref_ids['consumer'], **fields)
+        if kind == 'consumers':
+            fields.setdefault('username', None)
+        return getattr(kong, kind).create(**fields)
+
+    def apply(self, plan):
+        """ Apply a plan, one dependency level at a time with the changes of a level sent concurrently.
+
+        Failed changes keep their exception in `error`, and the levels after a failure are not applied.
+
+        :param plan: a SyncPlan returned by `diff`.
+        :return: the plan.
+        """
+        ids = {kind: dict(plan.ids.get(kind, {})) for kind in KINDS}
+        levels = [[c for c in plan if c.kind == kind and c.action != 'delete'] for kind in KINDS]
+        levels += [[c for c in plan if c.kind == kind and c.action == 'delete'] for kind in reversed(KINDS)]
+
+        def run(change):
+            try:
+                change.result = self._apply_change(change, ids)
+            except Exception as e:
+                change.error = e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for level in levels:
+                list(executor.map(in_current_context(run), level))
+                for change in level:
+                    if change.action == 'create' and change.error is None and change.result:
+                        ids[change.kind][change.key] = change.result['id']
+                if any(change.error is not None for change in level):
+                    break
+        plan.applied = True
+        return plan
+
+
+def sync(kong, desired, dry_run=False, max_workers=10, select_tags=None):
+    """ Make Kong match a desired state, sending only the entities that changed.
+
+    :param kong: instance of KongClient, decoding responses, i.e., not with Codec(raw=True).
+    :param desired: The desired state document, see the module documentation.
+    :param dry_run: When True, the plan is computed but not applied.
+    :param max_workers: The maximum number of requests running at the same time.
+    :param select_tags: When set, only the entities having all these tags are managed.
+    :return: a SyncPlan, check `plan.ok` and `plan.errors` once applied.
+    """
+    syncer = Syncer(kong, max_workers=max_workers, select_tags=select_tags)
+    current = syncer.fetch()
+    plan = syncer.diff(desired, current=current)
+    if dry_run:
+        return plan
+    return syncer.apply(plan)
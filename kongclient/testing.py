@@ -0,0 +1,609 @@
+# -*- coding: utf-8 -*-
+""" An in-process fake of the Kong admin API, for tests.
+
+FakeKong keeps services, routes, plugins, consumers, certificates, SNIs, upstreams and targets in
+memory and answers the admin API requests of the managers: pagination, tag filters, unique names
+and referential integrity behave like Kong, with the same status codes. It plugs into a client as
+a transport, so that no socket is opened::
+
+    kong = FakeKong()
+    kong_client = KongClient(kong_url='http://kong:8001', transport=FakeKongTransport(kong))
+    kong_client.services.create(name='httpbin', url='https://httpbin.org')
+    kong_client.routes.create(service_id='httpbin', name='httpbin', paths=['/'])
+    kong_client.services.delete('httpbin')  # APIException, the route refers to the service
+
+    async_kong_client = AsyncKongClient(kong_url='http://kong:8001', transport=AsyncFakeKongTransport(kong))
+"""
+import json as jsonlib
+import threading
+import time
+import uuid
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from kongclient.transport import AsyncTransport, Response, Transport
+
+VERSION = '2.8.1'
+
+DEFAULT_PLUGINS = (
+    'acl', 'acme', 'aws-lambda', 'azure-functions', 'basic-auth', 'bot-detection', 'correlation-id', 'cors',
+    'datadog', 'file-log', 'grpc-gateway', 'grpc-web', 'hmac-auth', 'http-log', 'ip-restriction', 'jwt',
+    'key-auth', 'ldap-auth', 'loggly', 'oauth2', 'post-function', 'pre-function', 'prometheus', 'proxy-cache',
+    'rate-limiting', 'request-size-limiting', 'request-termination', 'request-transformer',
+    'response-ratelimiting', 'response-transformer', 'session', 'statsd', 'syslog', 'tcp-log', 'udp-log', 'zipkin',
+)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443, 'grpc': 80, 'grpcs': 443, 'tcp': 80, 'tls': 443}
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class _Schema:
+    """ What FakeKong checks of the entities of a collection.
+
+    :param name_field: The unique field an entity can be addressed by instead of its id.
+    :param unique: The fields unique in the collection.
+    :param foreign: Maps the fields referring to another entity to (collection, on_delete),
+    on_delete being 'cascade' or 'restrict'.
+    :param required: The fields every entity must have.
+    :param defaults: The values of the fields missing from a created entity.
+    """
+
+    def __init__(self, name_field=None, unique=(), foreign=None, required=(), defaults=None):
+        self.name_field = name_field
+        self.unique = unique
+        self.foreign = foreign or {}
+        self.required = required
+        self.defaults = defaults or {}
+
+
+SCHEMAS = {
+    'certificates': _Schema(required=('cert', 'key'), defaults={'cert_alt': None, 'key_alt': None, 'tags': None}),
+    'snis': _Schema(name_field='name', unique=('name',), foreign={'certificate': ('certificates', 'cascade')},
+                    required=('name', 'certificate'), defaults={'tags': None}),
+    'services': _Schema(name_field='name', unique=('name',),
+                        foreign={'client_certificate': ('certificates', 'restrict')}, required=('host',),
+                        defaults={'protocol': 'http', 'port': 80, 'path': None, 'retries': 5,
+                                  'connect_timeout': 60000, 'write_timeout': 60000, 'read_timeout': 60000,
+                                  'client_certificate': None, 'tls_verify': None, 'ca_certificates': None,
+                                  'enabled': True, 'tags': None}),
+    'routes': _Schema(name_field='name', unique=('name',), foreign={'service': ('services', 'restrict')},
+                      defaults={'protocols': ['http', 'https'], 'methods': None, 'hosts': None, 'paths': None,
+                                'headers': None, 'snis': None, 'sources': None, 'destinations': None,
+                                'https_redirect_status_code': 426, 'regex_priority': 0, 'strip_path': True,
+                                'path_handling': 'v0', 'preserve_host': False, 'request_buffering': True,
+                                'response_buffering': True, 'service': None, 'tags': None}),
+    'consumers': _Schema(name_field='username', unique=('username', 'custom_id'),
+                         defaults={'username': None, 'custom_id': None, 'tags': None}),
+    'upstreams': _Schema(name_field='name', unique=('name',), required=('name',),
+                         defaults={'algorithm': 'round-robin', 'hash_on': 'none', 'hash_fallback': 'none',
+                                   'hash_on_header': None, 'hash_fallback_header': None, 'hash_on_cookie': None,
+                                   'hash_on_cookie_path': '/', 'slots': 10000, 'healthchecks': None,
+                                   'host_header': None, 'client_certificate': None, 'tags': None}),
+    'targets': _Schema(name_field='target', foreign={'upstream': ('upstreams', 'cascade')},
+                       required=('target', 'upstream'), defaults={'weight': 100, 'tags': None}),
+    'plugins': _Schema(foreign={'service': ('services', 'cascade'), 'route': ('routes', 'cascade'),
+                                'consumer': ('consumers', 'cascade')},
+                       required=('name',),
+                       defaults={'config': {}, 'enabled': True, 'protocols': ['grpc', 'grpcs', 'http', 'https'],
+                                 'service': None, 'route': None, 'consumer': None, 'tags': None}),
+}
+
+# Collections nested in an entity, e.g., /services/{id}/routes, and the field referring to the entity.
+NESTED = {
+    ('services', 'routes'): 'service', ('services', 'plugins'): 'service', ('routes', 'plugins'): 'route',
+    ('consumers', 'plugins'): 'consumer', ('certificates', 'snis'): 'certificate',
+    ('certificates', 'services'): 'client_certificate', ('upstreams', 'targets'): 'upstream',
+}
+
+
+class KongError(Exception):
+    """ An error response of FakeKong.
+
+    :param status: The http status code.
+    :param body: The JSON body of the response.
+    """
+
+    def __init__(self, status, body):
+        super(KongError, self).__init__(status, body)
+        self.status = status
+        self.body = body
+
+
+def _not_found():
+    return KongError(404, {'message': 'Not found'})
+
+
+def _schema_violation(message, fields=None):
+    return KongError(400, {'code': 2, 'name': 'schema violation', 'message': 'schema violation (%s)' % message,
+                           'fields': fields or {}})
+
+
+def _is_uuid(value):
+    try:
+        uuid.UUID(value)
+    except (TypeError, ValueError, AttributeError):
+        return False
+    return True
+
+
+def _ref(entity):
+    return {'id': entity['id']} if entity is not None else None
+
+
+class FakeKong:
+    """ An in-memory Kong admin API.
+
+    :param plugins: The names of the plugins that can be configured.
+    :param version: The Kong version reported by the node info.
+    """
+
+    def __init__(self, plugins=DEFAULT_PLUGINS, version=VERSION):
+        self.plugins = tuple(plugins)
+        self.version = version
+        self.node_id = str(uuid.uuid4())
+        self.request_count = 0
+        self.collections = {kind: {} for kind in SCHEMAS}
+        # kind -> {name: id}, names of targets being (upstream_id, target) tuples.
+        self._names = {kind: {} for kind in SCHEMAS}
+        # target id -> {'health': ..., 'addresses': {address: health}}
+        self._health = {}
+        self._lock = threading.RLock()
+
+    # Entities.
+
+    def find(self, kind, key, parent=None):
+        """ Return the entity of a collection having key as id or name, None if there is none.
+
+        :param kind: The collection, e.g., 'services'.
+        :param key: The id or the name of the entity.
+        :param parent: The (field, id) tuple of the entity it must belong to, e.g., ('service', 'xxx_id').
+        """
+        entities = self.collections[kind]
+        entity = entities.get(key)
+        if entity is None and SCHEMAS[kind].name_field:
+            name = (parent[1], key) if kind == 'targets' and parent is not None else key
+            entity = entities.get(self._names[kind].get(name))
+        if entity is not None and parent is not None and (entity.get(parent[0]) or {}).get('id') != parent[1]:
+            return None
+        return entity
+
+    def _name(self, kind, entity):
+        name_field = SCHEMAS[kind].name_field
+        name = entity.get(name_field) if name_field else None
+        if name is not None and kind == 'targets':
+            return entity['upstream']['id'], name
+        return name
+
+    def _check(self, kind, entity, previous=None):
+        """ Check the fields, unique constraints and foreign keys of an entity about to be stored. """
+        schema = SCHEMAS[kind]
+        missing = {field: 'required field missing' for field in schema.required if entity.get(field) is None}
+        if missing:
+            raise _schema_violation(', '.join('%s: required field missing' % field for field in missing), missing)
+        if kind == 'consumers' and entity.get('username') is None and entity.get('custom_id') is None:
+            raise _schema_violation("at least one of these fields must be non-empty: 'custom_id', 'username'")
+        if kind == 'routes' and {'http', 'https'} & set(entity.get('protocols') or ()):
+            if not any(entity.get(field) for field in ('methods', 'hosts', 'headers', 'paths', 'snis')):
+                raise _schema_violation("must set one of 'methods', 'hosts', 'headers', 'paths' when "
+                                        "'protocols' is 'http' or 'https'")
+        name_field = schema.name_field
+        if name_field and entity.get(name_field) is not None and not isinstance(entity[name_field], str):
+            raise _schema_violation('%s: expected a string' % name_field, {name_field: 'expected a string'})
+        tags = entity.get('tags')
+        if tags is not None and (not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags)):
+            raise _schema_violation('tags: expected a set of strings', {'tags': 'expected a set of strings'})
+        if kind == 'plugins' and entity['name'] not in self.plugins:
+            raise _schema_violation("plugin '%s' not enabled; add it to the 'plugins' configuration property"
+                                    % entity['name'], {'name': 'plugin not enabled'})
+        for field, (ref_kind, _) in schema.foreign.items():
+            ref = entity.get(field)
+            if ref is None:
+                continue
+            if not isinstance(ref, dict):
+                raise _schema_violation('%s: expected a record' % field, {field: 'expected a record'})
+            for key in ('id', 'name'):
+                if ref.get(key) is not None and not isinstance(ref[key], str):
+                    raise _schema_violation('%s.%s: expected a string' % (field, key),
+                                            {field: {key: 'expected a string'}})
+            target = self.find(ref_kind, ref.get('id') or ref.get('name'))
+            if target is None:
+                raise KongError(400, {'code': 3, 'name': 'foreign key violation',
+                                      'message': "the foreign key '%s' does not reference an existing '%s' entity."
+                                                 % (jsonlib.dumps(ref), ref_kind)})
+            entity[field] = _ref(target)
+        for field in schema.unique:
+            value = entity.get(field)
+            if value is None or (previous is not None and previous.get(field) == value):
+                continue
+            if field == schema.name_field:
+                duplicate = self._names[kind].get(value) not in (None, entity['id'])
+            else:
+                duplicate = any(other.get(field) == value for other in self.collections[kind].values()
+                                if other is not previous)
+            if duplicate:
+                raise KongError(409, {'code': 5, 'name': 'unique constraint violation',
+                                      'message': 'UNIQUE violation detected on \'{%s="%s"}\'' % (field, value)})
+        if kind == 'plugins':
+            scope = tuple((entity.get(field) or {}).get('id') for field in ('service', 'route', 'consumer'))
+            for other in self.collections[kind].values():
+                if other is not previous and other['name'] == entity['name'] and scope == tuple(
+                        (other.get(field) or {}).get('id') for field in ('service', 'route', 'consumer')):
+                    raise KongError(409, {'code': 5, 'name': 'unique constraint violation',
+                                          'message': "UNIQUE violation detected on '{name=\"%s\"}'" % entity['name']})
+
+    def add(self, kind, fields, entity_id=None):
+        """ Create an entity like POST /{kind} does, and return it.
+
+        :param kind: The collection, e.g., 'services'.
+        :param fields: The fields of the entity, foreign keys being {'id': ...} dicts.
+        :param entity_id: The id of the entity, a random one when None.
+        :raise KongError: when the entity is not valid.
+        """
+        with self._lock:
+            fields = dict(fields)
+            snis = fields.pop('snis', None) if kind == 'certificates' else None
+            if kind == 'services' and fields.get('url'):
+                fields.update(self._split_url(fields.pop('url')))
+            fields.pop('url', None)
+            if kind == 'targets' and fields.get('target') and ':' not in fields['target']:
+                fields['target'] += ':8000'
+            now = int(time.time())
+            entity = dict(SCHEMAS[kind].defaults, **fields)
+            entity.update(id=entity_id or str(uuid.uuid4()), created_at=now)
+            if kind not in ('targets', 'snis', 'certificates'):
+                entity['updated_at'] = now
+            self._check(kind, entity)
+            if kind == 'targets' and self.find('targets', entity['target'],
+                                               parent=('upstream', entity['upstream']['id'])) is not None:
+                # Targets are unique per upstream since Kong 2.x, they are updated with PATCH.
+                raise KongError(409, {'code': 5, 'name': 'unique constraint violation',
+                                      'message': "UNIQUE violation detected on '{upstream={id=\"%s\"},"
+                                                 "target=\"%s\"}'" % (entity['upstream']['id'], entity['target'])})
+            self.collections[kind][entity['id']] = entity
+            name = self._name(kind, entity)
+            if name is not None:
+                self._names[kind][name] = entity['id']
+            for sni in snis or ():
+                self.add('snis', {'name': sni, 'certificate': {'id': entity['id']}})
+            return entity
+
+    def update(self, kind, entity, fields):
+        """ Update an entity like PATCH /{kind}/{id} does, and return it.
+
+        :raise KongError: when the updated entity is not valid.
+        """
+        with self._lock:
+            fields = dict(fields)
+            if kind == 'services' and fields.get('url'):
+                fields.update(self._split_url(fields.pop('url')))
+            if kind == 'certificates':
+                fields.pop('snis', None)
+            updated = dict(entity)
+            for field, value in fields.items():
+                if field in ('id', 'created_at'):
+                    continue
+                if field == 'config' and isinstance(value, dict) and isinstance(entity.get(field), dict):
+                    value = dict(entity[field], **value)
+                updated[field] = value
+            if 'updated_at' in entity:
+                updated['updated_at'] = int(time.time())
+            self._check(kind, updated, previous=entity)
+            previous_name = self._name(kind, entity)
+            if previous_name is not None:
+                self._names[kind].pop(previous_name, None)
+            entity.clear()
+            entity.update(updated)
+            name = self._name(kind, entity)
+            if name is not None:
+                self._names[kind][name] = entity['id']
+            return entity
+
+    def delete(self, kind, entity):
+        """ Delete an entity like DELETE /{kind}/{id} does, with the entities referring to it
+        when their foreign key cascades.
+
+        :raise KongError: when an entity refers to it and its foreign key does not cascade.
+        """
+        with self._lock:
+            referring = []
+            for ref_kind, schema in SCHEMAS.items():
+                for field, (target_kind, on_delete) in schema.foreign.items():
+                    if target_kind != kind:
+                        continue
+                    for other in self.collections[ref_kind].values():
+                        if (other.get(field) or {}).get('id') == entity['id']:
+                            if on_delete == 'restrict':
+                                raise KongError(400, {'code': 4, 'name': 'foreign keys violation',
+                                                      'message': "an existing '%s' entity references this '%s' "
+                                                                 "entity" % (ref_kind, kind)})
+                            referring.append((ref_kind, other))
+            for ref_kind, other in referring:
+                if other['id'] in self.collections[ref_kind]:
+                    self.delete(ref_kind, other)
+            self._remove(kind, entity)
+
+    def _remove(self, kind, entity):
+        del self.collections[kind][entity['id']]
+        name = self._name(kind, entity)
+        if name is not None:
+            self._names[kind].pop(name, None)
+        if kind == 'targets':
+            self._health.pop(entity['id'], None)
+
+    @staticmethod
+    def _split_url(url):
+        parsed = urlsplit(url)
+        return {'protocol': parsed.scheme, 'host': parsed.hostname,
+                'port': parsed.port or DEFAULT_PORTS.get(parsed.scheme, 80), 'path': parsed.path or None}
+
+    def reset(self):
+        """ Delete every entity. """
+        with self._lock:
+            for kind in SCHEMAS:
+                self.collections[kind].clear()
+                self._names[kind].clear()
+            self._health.clear()
+
+    # Rendering.
+
+    def _render(self, kind, entity):
+        if kind == 'certificates':
+            return dict(entity, snis=[sni['name'] for sni in self.collections['snis'].values()
+                                      if sni['certificate']['id'] == entity['id']])
+        return entity
+
+    def _page(self, kind, entities, query):
+        tags = query.get('tags')
+        if tags:
+            if ',' in tags and '/' in tags:
+                raise KongError(400, {'code': 9, 'name': 'invalid search query',
+                                      'message': 'invalid option (tags: invalid filter syntax)'})
+            if '/' in tags:
+                wanted = set(tags.split('/'))
+                entities = [e for e in entities if wanted.intersection(e.get('tags') or ())]
+            else:
+                required = tags.split(',')
+                entities = [e for e in entities if all(tag in (e.get('tags') or ()) for tag in required)]
+        size = query.get('size') or DEFAULT_PAGE_SIZE
+        try:
+            size = int(size)
+            start = int(query.get('offset') or 0)
+        except ValueError:
+            raise KongError(400, {'code': 9, 'name': 'invalid search query', 'message': 'invalid size or offset'})
+        if not 0 < size <= MAX_PAGE_SIZE or start < 0:
+            raise KongError(400, {'code': 9, 'name': 'invalid search query',
+                                  'message': 'invalid option (size: must be an integer between 0 and %d)'
+                                             % MAX_PAGE_SIZE})
+        end = start + size
+        data = [self._render(kind, entity) for entity in entities[start:end]]
+        offset = str(end) if end < len(entities) else None
+        return {'data': data, 'offset': offset, 'next': None}
+
+    # Requests.
+
+    def handle(self, method, path, query=None, body=None):
+        """ Answer an admin API request.
+
+        :param method: The http method, e.g., 'GET'
+        :param path: The path of the URL, e.g., '/services/httpbin/routes'
+        :param query: The query string parameters, as a dict.
+        :param body: The decoded JSON body.
+        :return: a (status, body) tuple, body being None when the response has no body.
+        """
+        with self._lock:
+            self.request_count += 1
+            try:
+                return self._handle(method, [unquote(part) for part in path.split('/') if part], query or {},
+                                    body or {})
+            except KongError as e:
+                return e.status, e.body
+
+    def _handle(self, method, parts, query, body):
+        if not parts:
+            return 200, self.node_info()
+        if parts == ['status']:
+            return 200, {'database': {'reachable': True},
+                         'server': {'connections_active': 1, 'total_requests': self.request_count}}
+        if parts[0] == 'tags':
+            return self._tags(method, parts, query)
+        if parts[0] == 'plugins' and len(parts) >= 2 and parts[1] in ('enabled', 'schema'):
+            return self._plugin_info(method, parts)
+        if parts[0] == 'upstreams' and len(parts) >= 3 and parts[2] in ('health', 'targets'):
+            handled = self._upstream(method, parts, body)
+            if handled is not None:
+                return handled
+        kind = parts[0]
+        if kind not in SCHEMAS:
+            raise _not_found()
+        if len(parts) == 1:
+            return self._collection(method, kind, query, body)
+        if len(parts) == 2:
+            return self._entity(method, kind, parts[1], body)
+        entity = self.find(kind, parts[1])
+        if entity is None:
+            raise _not_found()
+        child = parts[2]
+        field = NESTED.get((kind, child))
+        if field is not None:
+            parent = (field, entity['id'])
+            if len(parts) == 3:
+                return self._collection(method, child, query, body, parent=parent)
+            if len(parts) == 4:
+                return self._entity(method, child, parts[3], body, parent=parent)
+        elif len(parts) == 3 and child in SCHEMAS[kind].foreign:
+            return self._reference(method, kind, entity, child, body)
+        raise _not_found()
+
+    def _collection(self, method, kind, query, body, parent=None):
+        if method == 'GET':
+            entities = list(self.collections[kind].values())
+            if parent is not None:
+                entities = [e for e in entities if (e.get(parent[0]) or {}).get('id') == parent[1]]
+            if kind == 'consumers' and query.get('custom_id') is not None:
+                entities = [e for e in entities if e.get('custom_id') == query['custom_id']]
+            return 200, self._page(kind, entities, query)
+        if method == 'POST':
+            fields = dict(body)
+            if parent is not None:
+                fields[parent[0]] = {'id': parent[1]}
+            return 201, self._render(kind, self.add(kind, fields))
+        raise KongError(405, {'message': 'Method not allowed'})
+
+    def _entity(self, method, kind, key, body, parent=None):
+        entity = self.find(kind, key, parent=parent)
+        if method == 'DELETE':
+            if entity is not None:
+                self.delete(kind, entity)
+            return 204, None
+        if method == 'PUT':
+            fields = dict(body)
+            if parent is not None:
+                fields[parent[0]] = {'id': parent[1]}
+            if entity is not None:
+                self._remove(kind, entity)
+            name_field = SCHEMAS[kind].name_field
+            if not _is_uuid(key) and name_field:
+                fields[name_field] = key
+            try:
+                created = self.add(kind, fields, entity_id=entity['id'] if entity is not None else
+                                   key if _is_uuid(key) else None)
+            except KongError:
+                if entity is not None:
+                    self.collections[kind][entity['id']] = entity
+                    name = self._name(kind, entity)
+                    if name is not None:
+                        self._names[kind][name] = entity['id']
+                raise
+            return 200, self._render(kind, created)
+        if entity is None:
+            raise _not_found()
+        if method == 'GET':
+            return 200, self._render(kind, entity)
+        if method == 'PATCH':
+            return 200, self._render(kind, self.update(kind, entity, body))
+        raise KongError(405, {'message': 'Method not allowed'})
+
+    def _reference(self, method, kind, entity, field, body):
+        """ Handle /{kind}/{id}/{field}, the entity a foreign key of an entity refers to. """
+        ref_kind = SCHEMAS[kind].foreign[field][0]
+        ref = self.find(ref_kind, (entity.get(field) or {}).get('id'))
+        if method == 'DELETE':
+            if ref is not None:
+                self.delete(ref_kind, ref)
+            return 204, None
+        if ref is None:
+            raise _not_found()
+        if method == 'GET':
+            return 200, self._render(ref_kind, ref)
+        if method in ('PATCH', 'PUT'):
+            return 200, self._render(ref_kind, self.update(ref_kind, ref, body))
+        raise KongError(405, {'message': 'Method not allowed'})
+
+    def _upstream(self, method, parts, body):
+        """ Handle the target health and the target listing endpoints of an upstream, None for the others. """
+        upstream = self.find('upstreams', parts[1])
+        if upstream is None:
+            raise _not_found()
+        targets = [t for t in self.collections['targets'].values() if t['upstream']['id'] == upstream['id']]
+        if parts[2] == 'health' and len(parts) == 3 and method == 'GET':
+            return 200, {'data': [dict(target, **self._target_health(target)) for target in targets],
+                         'node_id': self.node_id, 'next': None}
+        if parts[2:4] == ['targets', 'all'] and len(parts) == 4 and method == 'GET':
+            return 200, self._page('targets', targets, {'size': MAX_PAGE_SIZE})
+        if len(parts) in (5, 6) and parts[-1] in ('healthy', 'unhealthy') and method == 'POST':
+            target = self.find('targets', parts[3], parent=('upstream', upstream['id']))
+            if target is None:
+                raise _not_found()
+            health = self._health.setdefault(target['id'], {'health': 'HEALTHY', 'addresses': {}})
+            state = parts[-1].upper()
+            if len(parts) == 6:
+                health['addresses'][parts[4]] = state
+            else:
+                health['health'] = state
+                health['addresses'] = {address: state for address in health['addresses']}
+            return 204, None
+        return None
+
+    def _target_health(self, target):
+        health = self._health.get(target['id'], {'health': 'HEALTHY', 'addresses': {}})
+        addresses = dict.fromkeys([target['target']], health['health'])
+        addresses.update(health['addresses'])
+        data = []
+        for address, state in addresses.items():
+            host, _, port = address.rpartition(':')
+            data.append({'ip': host, 'port': int(port) if port.isdigit() else port, 'health': state,
+                         'weight': target['weight']})
+        states = set(addresses.values())
+        return {'health': 'HEALTHY' if 'HEALTHY' in states else 'UNHEALTHY', 'data': {'addresses': data}}
+
+    def _tags(self, method, parts, query):
+        if method != 'GET' or len(parts) > 2:
+            raise _not_found()
+        entries = [{'entity_name': kind, 'entity_id': entity['id'], 'tag': tag}
+                   for kind, entities in self.collections.items() for entity in entities.values()
+                   for tag in entity.get('tags') or ()]
+        if len(parts) == 2:
+            entries = [entry for entry in entries if entry['tag'] == parts[1]]
+        query = {key: value for key, value in query.items() if key != 'tags'}
+        return 200, self._page('tags', entries, query)
+
+    def _plugin_info(self, method, parts):
+        if method != 'GET':
+            raise KongError(405, {'message': 'Method not allowed'})
+        if parts == ['plugins', 'enabled']:
+            return 200, {'enabled_plugins': list(self.plugins)}
+        if len(parts) == 3 and parts[2] in self.plugins:
+            return 200, {'fields': [{'config': {'type': 'record', 'fields': []}}]}
+        raise KongError(404, {'message': 'No plugin named \'%s\'' % parts[-1]})
+
+    def node_info(self):
+        """ Return what GET / answers. """
+        return {
+            'version': self.version, 'hostname': 'fake-kong', 'node_id': self.node_id,
+            'tagline': 'Welcome to kong', 'lua_version': 'LuaJIT 2.1.0-beta3',
+            'plugins': {'available_on_server': {name: True for name in self.plugins},
+                        'enabled_in_cluster': sorted({p['name'] for p in self.collections['plugins'].values()})},
+            'configuration': {'database': 'memory', 'admin_listen': ['127.0.0.1:8001']},
+        }
+
+
+class FakeKongTransport(Transport):
+    """ Transport sending requests to a FakeKong, in process.
+
+    :param kong: The FakeKong answering requests, a new one when None.
+    :param base_url: The URL the partial URLs of the managers are joined with.
+    """
+
+    def __init__(self, kong=None, base_url='http://localhost:8001', verify_ssl=True, timeout=None, headers=None,
+                 **options):
+        super(FakeKongTransport, self).__init__(base_url, verify_ssl=verify_ssl, timeout=timeout, headers=headers)
+        self.kong = kong if kong is not None else FakeKong()
+
+    def send(self, method, url, params=None, json=None, headers=None, timeout=None):
+        return _send(self.kong, method, url, params, json)
+
+
+class AsyncFakeKongTransport(AsyncTransport):
+    """ Asyncio transport sending requests to a FakeKong, in process, see `FakeKongTransport`. """
+
+    def __init__(self, kong=None, base_url='http://localhost:8001', verify_ssl=True, timeout=None, headers=None,
+                 max_concurrency=None, **options):
+        super(AsyncFakeKongTransport, self).__init__(base_url, verify_ssl=verify_ssl, timeout=timeout,
+                                                     headers=headers, max_concurrency=max_concurrency)
+        self.kong = kong if kong is not None else FakeKong()
+
+    async def send(self, method, url, params=None, json=None, headers=None, timeout=None):
+        return _send(self.kong, method, url, params, json)
+
+
+def _send(kong, method, url, params, json):
+    """ Answer a request with a FakeKong, going through JSON like a real response. """
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query.update({key: str(value) for key, value in (params or {}).items() if value is not None})
+    body = jsonlib.loads(jsonlib.dumps(json)) if json is not None else None
+    status, payload = kong.handle(method.upper(), parts.path, query, body)
+    content = jsonlib.dumps(payload).encode('utf-8') if payload is not None else b''
+    return Response(status_code=status, content=content, headers={'Content-Type': 'application/json; charset=utf-8'},
+                    url=url)
@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+import importlib.util
+import json as jsonlib
+import threading
+from urllib.parse import urlencode, urljoin
+
+from kongclient.exceptions import ConnectException, TimeoutException, TransportException
+
+
+class Response:
+    """ Minimal HTTP response returned by transports that have no response type of their own.
+
+    :param status_code: The http status code.
+    :param content: The raw response body, as bytes.
+    :param headers: The response headers.
+    :param url: The URL the request was sent to.
+    """
+
+    def __init__(self, status_code, content, headers=None, url=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.url = url
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return jsonlib.loads(self.content)
+
+
+class Transport:
+    """ Base class of the HTTP transports the managers send their requests through.
+
+    A transport joins the partial URLs built by the managers with the Kong admin URL
+    and returns a response exposing `status_code`, `text`, `content`, `headers`, `url`
+    and `json()`. Subclasses only have to implement `send`.
+
+    :param base_url: The URL of the Kong admin API.
+    :param verify_ssl: Whether the SSL certificate of the Kong admin API is verified.
+    :param timeout: The default timeout in seconds, either a number or a (connect, read) tuple.
+    :param headers: Headers sent with every request, e.g., {'Kong-Admin-Token': 'xxx'}
+    """
+
+    def __init__(self, base_url, verify_ssl=True, timeout=None, headers=None):
+        self.base_url = base_url
+        self.verify_ssl = bool(verify_ssl)
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+
+    def request(self, method, url, params=None, json=None, headers=None, timeout=None):
+        """ Send a request to the Kong admin API.
+
+        :param method: The http method, e.g., 'GET'
+        :param url: A partial URL, e.g., '/services'
+        :param params: Query string parameters.
+        :param json: Data that will be encoded as JSON and sent as request body.
+        :param headers: Headers sent with this request only.
+        :param timeout: Overrides the default timeout of the transport for this request.
+        """
+        url = urljoin(base=self.base_url, url=url)
+        return self.send(method, url, params=params, json=json, headers=headers,
+                         timeout=self.timeout if timeout is None else timeout)
+
+    def send(self, method, url, params=None, json=None, headers=None, timeout=None):
+        """ Send a request to an absolute URL and return the response. """
+        raise NotImplementedError()
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request('PATCH', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def close(self):
+        """ Release all pooled connections. """
+
+
+class RequestsTransport(Transport):
+    """ Transport backed by a `requests.Session`, the default one.
+
+    :param pool_connections: The number of per-host connection pools to cache.
+    :param pool_maxsize: The maximum number of connections kept in each per-host pool.
+    :param pool_block: Whether a request waits for a free connection when the pool is full,
+    instead of opening a connection that is discarded afterwards.
+    :param max_retries: The number of retries urllib3 makes on connection failures.
+    :param keep_alive: Whether connections are kept open between requests.
+    :param per_thread_sessions: Whether every thread sends its requests through its own `requests.Session`,
+    all of them sharing one connection pool, so that the transport can be shared between threads, e.g., by
+    the workers of bulk operations. When False, every thread sends its requests through the same session.
+    """
+
+    def __init__(self, base_url, verify_ssl=True, timeout=None, headers=None, pool_connections=10,
+                 pool_maxsize=10, pool_block=False, max_retries=0, keep_alive=True, per_thread_sessions=True):
+        super(RequestsTransport, self).__init__(base_url, verify_ssl=verify_ssl, timeout=timeout, headers=headers)
+        if not keep_alive:
+            self.headers['Connection'] = 'close'
+        self.per_thread_sessions = per_thread_sessions
+        self._adapter_options = {'pool_connections': pool_connections, 'pool_maxsize': pool_maxsize,
+                                 'max_retries': max_retries, 'pool_block': pool_block}
+        self._requests = None
+        self._new_connection_error = None
+        self._adapter = None
+        self._session = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def adapter(self):
+        """ The `requests` adapter holding the connection pool, created with the first session. """
+        if self._adapter is None:
+            with self._lock:
+                if self._adapter is None:
+                    # requests is imported on first use, so that creating a client stays cheap.
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    from urllib3.exceptions import NewConnectionError
+                    self._requests = requests
+                    self._new_connection_error = NewConnectionError
+                    # The default headers of the transport, shared by its sessions from now on.
+                    headers = requests.utils.default_headers()
+                    headers.update(self.headers)
+                    self.headers = headers
+                    self._adapter = HTTPAdapter(**self._adapter_options)
+        return self._adapter
+
+    def new_session(self):
+        """ Return a `requests.Session` sending requests through the connection pool of the transport. """
+        adapter = self.adapter
+        session = self._requests.Session()
+        session.verify = self.verify_ssl
+        session.headers = self.headers
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    @property
+    def session(self):
+        """ The session requests are sent through, the one of the current thread with per_thread_sessions. """
+        if not self.per_thread_sessions:
+            if self._session is None:
+                # Created outside of the lock, which new_session takes to create the adapter. A session
+                # losing the race is dropped, without being closed as that would close the shared adapter.
+                session = self.new_session()
+                with self._lock:
+                    if self._session is None:
+                        self._session = session
+            return self._session
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self.new_session()
+        return session
+
+    def release_session(self):
+        """ Forget the session of the current thread, its connections stay in the shared pool. """
+        self._local.__dict__.pop('session', None)
+
+    def send(self, method, url, params=None, json=None, headers=None, timeout=None):
+        session = self.session
+        try:
+            return session.request(method, url, params=params, json=json, headers=headers, timeout=timeout)
+        except self._requests.ConnectTimeout as e:
+            raise ConnectException(message=str(e), method=method, url=url) from e
+        except self._requests.Timeout as e:
+            raise TimeoutException(message=str(e), method=method, url=url) from e
+        except self._requests.ConnectionError as e:
+            # Also raised when the connection is reset once the request was sent, only a failure to
+            # open the connection guarantees that Kong did not receive it.
+            reason = getattr(e.args[0], 'reason', None) if e.args else None
+            if isinstance(reason, self._new_connection_error):
+                raise ConnectException(message=str(e), method=method, url=url) from e
+            raise TransportException(message=str(e), method=method, url=url) from e
+        except self._requests.RequestException as e:
+            # e.g. ChunkedEncodingError or ContentDecodingError on a broken response.
+            raise TransportException(message=str(e), method=method, url=url) from e
+
+    def close(self):
+        if self._adapter is not None:
+            self._adapter.close()
+
+
+class Urllib3Transport(Transport):
+    """ Transport using a `urllib3.PoolManager` directly, without the `requests` overhead.
+
+    :param pool_connections: The number of per-host connection pools to cache.
+    :param pool_maxsize: The maximum number of connections kept in each per-host pool.
+    :param pool_block: Whether a request waits for a free connection when the pool is full.
+    :param max_retries: The number of retries urllib3 makes on connection failures.
+    """
+
+    def __init__(self, base_url, verify_ssl=True, timeout=None, headers=None, pool_connections=10,
+                 pool_maxsize=10, pool_block=False, max_retries=0):
+        import urllib3
+        super(Urllib3Transport, self).__init__(base_url, verify_ssl=verify_ssl, timeout=timeout, headers=headers)
+        self._urllib3 = urllib3
+        self.pool = urllib3.PoolManager(num_pools=pool_connections, maxsize=pool_maxsize, block=pool_block,
+                                        retries=urllib3.Retry(total=max_retries, redirect=False),
+                                        cert_reqs='CERT_REQUIRED' if self.verify_ssl else 'CERT_NONE')
+
+    def _timeout(self, timeout):
+        if isinstance(timeout, tuple):
+            return self._urllib3.Timeout(connect=timeout[0], read=timeout[1])
+        return self._urllib3.Timeout(total=timeout) if timeout is not None else None
+
+    def send(self, method, url, params=None, json=None, headers=None, timeout=None):
+        # Parameters set to None are left out, as requests and httpx do.
+        params = {key: value for key, value in (params or {}).items() if value is not None}
+        if params:
+            url = '%s%s%s' % (url, '&' if '?' in url else '?', urlencode(params, doseq=True))
+        request_headers = dict(self.headers, **(headers or {}))
+        body = None
+        if json is not None:
+            body = jsonlib.dumps(json).encode('utf-8')
+            request_headers['Content-Type'] = 'application/json'
+        try:
+            resp = self.pool.request(method, url, body=body, headers=request_headers,
+                                     timeout=self._timeout(timeout), redirect=False)
+        except self._urllib3.exceptions.HTTPError as e:
+            reason = getattr(e, 'reason', e)
+            # NewConnectionError, e.g., a refused connection, subclasses ConnectTimeoutError.
+            if isinstance(reason, self._urllib3.exceptions.ConnectTimeoutError):
+                raise ConnectException(message=str(e), method=method, url=url) from e
+            if isinstance(reason, self._urllib3.exceptions.TimeoutError):
+                raise TimeoutException(message=str(e), method=method, url=url) from e
+            raise TransportException(message=str(e), method=method, url=url) from e
+        return Response(status_code=resp.status, content=resp.data, headers=resp.headers, url=url)
+
+    def close(self):
+        self.pool.clear()
+
+
+def _http2_available():
+    return importlib.util.find_spec('h2') is not None
+
+
+def _httpx_timeout(httpx, timeout):
+    if isinstance(timeout, tuple):
+        return httpx.Timeout(None, connect=timeout[0], read=timeout[1])
+    return httpx.Timeout(timeout)
+
+
+class HttpxTransport(Transport):
+    """ Transport backed by a `httpx.Client`, supporting HTTP/2.
+
+    :param pool_maxsize: The maximum number of connections kept in the pool.
+    :param max_keepalive_connections: The maximum number of idle connections kept alive.
+    :param http2: Whether HTTP/2 is negotiated, None enables it when the `h2` package is installed.
+    """
+
+    def __init__(self, base_url, verify_ssl=True, timeout=None, headers=None, pool_maxsize=100,
+                 max_keepalive_connections=20, http2=None):
+        import httpx
+        super(HttpxTransport, self).__init__(base_url, verify_ssl=verify_ssl, timeout=timeout, headers=headers)
+        self._httpx = httpx
+        self.session = httpx.Client(
+            verify=self.verify_ssl, headers=self.headers,
+            http2=_http2_available() if http2 is None else http2,
+            limits=httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=max_keepalive_connections))
+        self.headers = self.session.headers
+
+    def send(self, method, url, params=None, json=None, headers=None, timeout=None):
+        try:
+            return self.session.request(method, url, params=params, json=json, headers=headers,
+                                        timeout=_httpx_timeout(self._httpx, timeout))
+        except (self._httpx.ConnectError, self._httpx.ConnectTimeout) as e:
+            raise ConnectException(message=str(e), method=method, url=url) from e
+        except self._httpx.TimeoutException as e:
+            raise TimeoutException(message=str(e), method=method, url=url) from e
+        except self._httpx.TransportError as e:
+            raise TransportException(message=str(e), method=method, url=url) from e
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncTransport(Transport):
+    """ Base class of the asyncio transports used by AsyncKongClient.
+
+    :param max_concurrency: The maximum number of requests in flight at the same time,
+    None means it is only bounded by the connection pool.
+    """
+
+    def __init__(self, base_url, verify_ssl=True, timeout=None, headers=None, max_concurrency=None):
+        super(AsyncTransport, self).__init__(base_url, verify_ssl=verify_ssl, timeout=timeout, headers=headers)
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+
+    async def request(self, method, url, params=None, json=None, headers=None, timeout=None):
+        url = urljoin(base=self.base_url, url=url)
+        timeout = self.timeout if timeout is None else timeout
+        if not self.max_concurrency:
+            return await self.send(method, url, params=params, json=json, headers=headers, timeout=timeout)
+        if self._semaphore is None:
+            # Created lazily so that it is bound to the running event loop.
+            import asyncio
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await self.send(method, url, params=params, json=json, headers=headers, timeout=timeout)
+
+    async def send(self, method, url, params=None, json=None, headers=None, timeout=None):
+        raise NotImplementedError()
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    async def patch(self, url, **kwargs):
+        return await self.request('PATCH', url, **kwargs)
+
+    async def put(self, url, **kwargs):
+        return await self.request('PUT', url, **kwargs)
+
+    async def delete(self, url, **kwargs):
+        return await self.request('DELETE', url, **kwargs)
+
+    async def close(self):
+        """ Release all pooled connections. """
+
+
+class AsyncHttpxTransport(AsyncTransport):
+    """ Asyncio transport backed by a pooled `httpx.AsyncClient`.
+
+    :param pool_maxsize: The maximum number of connections kept in the pool.
+    :param max_keepalive_connections: The maximum number of idle connections kept alive.
+    :param http2: Whether HTTP/2 is negotiated, None enables it when the `h2` package is installed.
+    """
+
+    def __init__(self, base_url, verify_ssl=True, timeout=None, headers=None, max_concurrency=None,
+                 pool_maxsize=100, max_keepalive_connections=20, http2=None):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError('AsyncKongClient requires httpx, install it with '
+                              '`pip install python-kongclient[async]`')
+        super(AsyncHttpxTransport, self).__init__(base_url, verify_ssl=verify_ssl, timeout=timeout,
+                                                  headers=headers, max_concurrency=max_concurrency)
+        self._httpx = httpx
+        self.session = httpx.AsyncClient(
+            verify=self.verify_ssl, headers=self.headers,
+            http2=_http2_available() if http2 is None else http2,
+            limits=httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=max_keepalive_connections))
+        self.headers = self.session.headers
+
+    async def send(self, method, url, params=None, json=None, headers=None, timeout=None):
+        try:
+            return await self.session.request(method, url, params=params, json=json, headers=headers,
+                                              timeout=_httpx_timeout(self._httpx, timeout))
+        except (self._httpx.ConnectError, self._httpx.ConnectTimeout) as e:
+            raise ConnectException(message=str(e), method=method, url=url) from e
+        except self._httpx.TimeoutException as e:
+            raise TimeoutException(message=str(e), method=method, url=url) from e
+        except self._httpx.TransportError as e:
+            raise TransportException(message=str(e), method=method, url=url) from e
+
+    async def close(self):
+        await self.session.aclose()
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+""" Watch the health of upstreams, yielding only the changes.
+
+Every upstream is polled on its own schedule: its interval doubles each time its health did not
+change, up to `max_interval`, and goes back to `interval` as soon as it changes::
+
+    watcher = HealthWatcher(kong_client, upstreams=['backend', 'api'])
+    for event in watcher:
+        print(event.upstream, event.target, event.previous, '->', event.current)
+
+    async for event in AsyncHealthWatcher(async_kong_client):
+        ...
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from kongclient.codec import ensure_decoded
+from kongclient.deadline import in_current_context
+from kongclient.exceptions import APIException, TransportException
+
+
+class HealthEvent:
+    """ A change of health of a target, or of one of its addresses.
+
+    :param upstream: The id or name of the upstream, as watched.
+    :param target: The host:port of the target.
+    :param address: The ip:port of the address, None for the target itself.
+    :param previous: The previous health, e.g., 'HEALTHY', None for a new target.
+    :param current: The current health, e.g., 'UNHEALTHY', None for a removed target.
+    :param at: The time.time() value of the poll detecting the change.
+    """
+
+    def __init__(self, upstream, target, address, previous, current, at):
+        self.upstream = upstream
+        self.target = target
+        self.address = address
+        self.previous = previous
+        self.current = current
+        self.at = at
+
+    def __repr__(self):
+        return 'HealthEvent(%s %s%s %s -> %s)' % (self.upstream, self.target,
+                                                  ' %s' % self.address if self.address else '',
+                                                  self.previous, self.current)
+
+
+def _transition_states(health):
+    """ Map every (target, address) of an upstream health response to its health, address None for the target. """
+    states = {}
+    for target in health.get('data') or ():
+        states[(target.get('target'), None)] = target.get('health')
+        for address in (target.get('data') or {}).get('addresses') or ():
+            states[(target.get('target'), '%s:%s' % (address.get('ip'), address.get('port')))] = address.get('health')
+    return states
+
+
+class HealthWatcher:
+    """ Poll the health of many upstreams concurrently and yield a HealthEvent for every change.
+
+    :param kong: instance of KongClient, decoding responses, i.e., not with Codec(raw=True).
+    :param upstreams: The ids or names of the upstreams to watch, every upstream when None.
+    :param discover_interval: When upstreams is None, the delay between two listings of every upstream,
+    in seconds.
+    :param interval: The shortest delay between two polls of an upstream, in seconds.
+    :param max_interval: The longest delay between two polls of an upstream, in seconds.
+    :param backoff: The factor applied to the delay of an upstream each time its health did not change.
+    :param max_workers: The maximum number of requests running at the same time.
+    :param emit_initial: Whether the first poll of every upstream yields an event per target,
+    with a previous health of None.
+    """
+
+    def __init__(self, kong, upstreams=None, interval=1, max_interval=30, backoff=2, max_workers=10,
+                 emit_initial=False, discover_interval=30):
+        ensure_decoded(kong, type(self).__name__)
+        self.kong = kong
+        self.upstreams = list(upstreams) if upstreams is not None else None
+        self.discover_interval = discover_interval
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_workers = max_workers
+        self.emit_initial = emit_initial
+        # upstream -> {(target, address): health}, for the upstreams polled at least once.
+        self.states = {}
+        self._delays = {}
+        self._next_poll = {}
+        self._next_discovery = 0.0
+        self._stopped = threading.Event()
+
+    def _watched(self, upstream_ids):
+        """ Schedule new upstreams right away and forget the ones no longer watched. """
+        for upstream_id in upstream_ids:
+            self._next_poll.setdefault(upstream_id, 0.0)
+        for upstream_id in set(self._next_poll) - set(upstream_ids):
+            for mapping in (self._next_poll, self._delays, self.states):
+                mapping.pop(upstream_id, None)
+
+    def _discovery_due(self):
+        return self.upstreams is None and self._next_discovery <= time.monotonic()
+
+    def _discovered(self, upstream_ids):
+        """ Watch the upstreams listed by a discovery, or list them again after the shortest delay
+        when the listing failed, i.e., upstream_ids is None.
+        """
+        if upstream_ids is None:
+            self._next_discovery = time.monotonic() + self.interval
+        else:
+            self._watched(upstream_ids)
+            self._next_discovery = time.monotonic() + self.discover_interval
+
+    def _due(self):
+        now = time.monotonic()
+        return [upstream_id for upstream_id, at in self._next_poll.items() if at <= now]
+
+    def _wait_time(self):
+        wakeups = list(self._next_poll.values())
+        if self.upstreams is None:
+            wakeups.append(self._next_discovery)
+        if not wakeups:
+            return self.interval
+        return max(0.0, min(wakeups) - time.monotonic())
+
+    def _changes(self, upstream_id, health, at):
+        """ Record the health of an upstream, reschedule its next poll and return the events. """
+        states = _transition_states(health)
+        previous = self.states.get(upstream_id)
+        self.states[upstream_id] = states
+        events = []
+        if previous is not None or self.emit_initial:
+            previous = previous or {}
+            for key in states.keys() | previous.keys():
+                if states.get(key) != previous.get(key):
+                    events.append(HealthEvent(upstream_id, key[0], key[1], previous.get(key), states.get(key), at))
+        delay = self._delays.get(upstream_id)
+        if delay is None or events:
+            delay = self.interval
+        else:
+            delay = min(self.max_interval, delay * self.backoff)
+        self._delays[upstream_id] = delay
+        self._next_poll[upstream_id] = time.monotonic() + delay
+        return sorted(events, key=lambda event: (event.target, event.address or ''))
+
+    def _failed(self, upstream_id):
+        """ Poll an upstream that could not be polled again after the shortest delay. """
+        self._next_poll[upstream_id] = time.monotonic() + self.interval
+
+    def _discover(self):
+        try:
+            return [upstream['id'] for upstream in self.kong.upstreams.iter(size=1000)]
+        except (APIException, TransportException):
+            return None
+
+    def _fetch(self, upstream_id):
+        try:
+            return self.kong.upstreams.get_upstream_health(upstream_id)
+        except (APIException, TransportException):
+            return None
+
+    def poll(self):
+        """ Poll the upstreams that are due, concurrently.
+
+        :return: the list of HealthEvent of this round.
+        """
+        if self.upstreams is not None:
+            self._watched(self.upstreams)
+        elif self._discovery_due():
+            self._discovered(self._discover())
+        due = self._due()
+        if not due:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(due))) as executor:
+            healths = list(executor.map(in_current_context(self._fetch), due))
+        events = []
+        at = time.time()
+        for upstream_id, health in zip(due, healths):
+            if health is None:
+                self._failed(upstream_id)
+            else:
+                events.extend(self._changes(upstream_id, health, at))
+        return events
+
+    def __iter__(self):
+        while not self._stopped.is_set():
+            for event in self.poll():
+                yield event
+            self._stopped.wait(self._wait_time())
+
+    def close(self):
+        """ Stop watching, the iteration ends after the current round. """
+        self._stopped.set()
+
+
+class AsyncHealthWatcher(HealthWatcher):
+    """ Asyncio version of HealthWatcher, iterated with `async for`.
+
+    :param kong: instance of AsyncKongClient, decoding responses, i.e., not with Codec(raw=True).
+    """
+
+    async def _discover(self):
+        try:
+            return [upstream['id'] async for upstream in self.kong.upstreams.iter(size=1000)]
+        except (APIException, TransportException):
+            return None
+
+    async def _fetch(self, upstream_id):
+        try:
+            return await self.kong.upstreams.get_upstream_health(upstream_id)
+        except (APIException, TransportException):
+            return None
+
+    async def poll(self):
+        """ Poll the upstreams that are due, concurrently, see `HealthWatcher.poll`. """
+        import asyncio
+        if self.upstreams is not None:
+            self._watched(self.upstreams)
+        elif self._discovery_due():
+            self._discovered(await self._discover())
+        due = self._due()
+        if not due:
+            return []
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def fetch(upstream_id):
+            async with semaphore:
+                return await self._fetch(upstream_id)
+
+        healths = await asyncio.gather(*[fetch(upstream_id) for upstream_id in due])
+        events = []
+        at = time.time()
+        for upstream_id, health in zip(due, healths):
+            if health is None:
+                self._failed(upstream_id)
+            else:
+                events.extend(self._changes(upstream_id, health, at))
+        return events
+
+    def __iter__(self):
+        raise TypeError('AsyncHealthWatcher is iterated with async for')
+
+    async def __aiter__(self):
+        import asyncio
+        while not self._stopped.is_set():
+            for event in await self.poll():
+                yield event
+            await asyncio.sleep(self._wait_time())
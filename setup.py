@@ -16,6 +16,7 @@ setuptools.setup(
     url='https://github.com/haintd/python-kongclient',
     packages=setuptools.find_packages(),
     install_requires=['requests'],
+    extras_require={'async': ['httpx'], 'fast': ['orjson']},
     include_package_data=True,
     license='BSD',
     classifiers=[
@@ -26,5 +27,5 @@ setuptools.setup(
         'Topic :: Internet :: WWW/HTTP :: Dynamic Content',
         'Topic :: Software Development :: Libraries :: Python Modules'
     ],
-    python_requires='>=3.6'
+    python_requires='>=3.7'
 )
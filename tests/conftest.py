@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+from kongclient import AsyncKongClient, KongClient
+from kongclient.testing import AsyncFakeKongTransport, FakeKong, FakeKongTransport
+from kongclient.transport import Response
+
+
+class CountingTransport(FakeKongTransport):
+    """ FakeKongTransport recording the (method, url) of every request in `requests`.
+
+    The next requests raise or answer the exceptions or status codes appended to `failures`, in order.
+    """
+
+    def __init__(self, kong=None, base_url='http://localhost:8001', **options):
+        super(CountingTransport, self).__init__(kong, base_url=base_url, **options)
+        self.requests = []
+        self.failures = []
+
+    def send(self, method, url, params=None, json=None, headers=None, timeout=None):
+        self.requests.append((method, url))
+        if self.failures:
+            failure = self.failures.pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            return Response(status_code=failure, content=b'{"message": "failure"}', url=url)
+        return super(CountingTransport, self).send(method, url, params=params, json=json, headers=headers,
+                                                   timeout=timeout)
+
+    def count(self, method=None):
+        return sum(1 for request in self.requests if method is None or request[0] == method)
+
+
+class SlowAsyncTransport(AsyncFakeKongTransport):
+    """ AsyncFakeKongTransport answering after a delay, counting the requests sent and in flight. """
+
+    def __init__(self, kong=None, delay=0.01, **options):
+        super(SlowAsyncTransport, self).__init__(kong, **options)
+        self.delay = delay
+        self.sent = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def send(self, method, url, params=None, json=None, headers=None, timeout=None):
+        self.sent += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return await super(SlowAsyncTransport, self).send(method, url, params=params, json=json,
+                                                              headers=headers, timeout=timeout)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def kong():
+    return FakeKong()
+
+
+@pytest.fixture
+def transport(kong):
+    return CountingTransport(kong)
+
+
+@pytest.fixture
+def kong_client(transport):
+    return KongClient('http://localhost:8001', transport=transport)
+
+
+@pytest.fixture
+def async_kong_client(kong):
+    return AsyncKongClient('http://localhost:8001', transport=AsyncFakeKongTransport(kong))
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+from conftest import SlowAsyncTransport
+from kongclient import AsyncKongClient
+from kongclient.exceptions import APIException
+
+
+def test_crud(async_kong_client):
+    async def main():
+        service = await async_kong_client.services.create('httpbin', url='https://httpbin.org')
+        await async_kong_client.services.add_route('httpbin', name='route', hosts=['httpbin.org'])
+        assert (await async_kong_client.services.get('httpbin'))['id'] == service['id']
+        assert [route['name'] for route in await async_kong_client.services.list_routes('httpbin')] == ['route']
+        assert (await async_kong_client.services.update('httpbin', retries=2))['retries'] == 2
+        await async_kong_client.routes.delete('route')
+        await async_kong_client.services.delete('httpbin')
+        with pytest.raises(APIException):
+            await async_kong_client.services.get('httpbin')
+
+    asyncio.run(main())
+
+
+def test_pagination(async_kong_client):
+    async def main():
+        await asyncio.gather(*[async_kong_client.consumers.create('user-%02d' % i) for i in range(25)])
+        listed = await async_kong_client.consumers.list(size=10)
+        iterated = [consumer async for consumer in async_kong_client.consumers.iter(size=7)]
+        return listed, iterated
+
+    listed, iterated = asyncio.run(main())
+    assert len(listed) == 25
+    assert [consumer['id'] for consumer in iterated] == [consumer['id'] for consumer in listed]
+
+
+def test_max_concurrency(kong):
+    transport = SlowAsyncTransport(kong, max_concurrency=2)
+    async_kong_client = AsyncKongClient('http://localhost:8001', transport=transport)
+
+    async def main():
+        await asyncio.gather(*[async_kong_client.consumers.create('user-%d' % i) for i in range(6)])
+
+    asyncio.run(main())
+    assert transport.max_in_flight == 2
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+import json
+
+from benchmarks import run
+from benchmarks.fake_kong import FakeKongServer, seed
+from kongclient import KongClient
+from kongclient.testing import FakeKong
+
+
+def test_seed():
+    kong = seed(FakeKong(), services=3, consumers=2, plugins=4, upstreams=2, targets=3)
+
+    assert {kind: len(kong.collections[kind]) for kind in ('services', 'routes', 'consumers', 'plugins',
+                                                            'upstreams', 'targets')} == \
+        {'services': 3, 'routes': 3, 'consumers': 2, 'plugins': 4, 'upstreams': 2, 'targets': 6}
+
+
+def test_fake_kong_server():
+    server = FakeKongServer(kong=seed(FakeKong(), services=3))
+    try:
+        with KongClient(server.start()) as kong_client:
+            assert len(kong_client.services.list(size=2)) == 3
+            assert kong_client.routes.get('route-1')['paths'] == ['/s1']
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_run_in_process(tmp_path):
+    output = tmp_path / 'results.json'
+    argv = ['--in-process', '--services', '20', '--consumers', '10', '--plugins', '5', '--iterations', '2',
+            '--warmup', '0', '--batch', '2', '--sync-services', '3', '--sync-changes', '1', '--output', str(output)]
+
+    assert run.main(argv) == 0
+    results = json.loads(output.read_text())['results']
+
+    assert sorted((result['client'], result['scenario']) for result in results) == sorted(
+        [('sync', scenario) for scenario in run.SCENARIOS] + [('async', scenario) for scenario in run.ASYNC_SCENARIOS])
+    assert all(result['first_error'] is None and result['throughput'] > 0 for result in results)
+
+    slower = [dict(result, throughput=result['throughput'] / 2) for result in results]
+    assert len(run.compare(slower, {'results': results}, tolerance=0.1)) == len(results)
+    assert run.compare(results, {'results': slower}, tolerance=0.1) == []
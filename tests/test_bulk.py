@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+from conftest import SlowAsyncTransport
+from kongclient import AsyncKongClient
+
+
+def create_consumers(kong_client, count, **kwargs):
+    return [kong_client.consumers.create('user-%03d' % i, custom_id=str(i), **kwargs) for i in range(count)]
+
+
+def test_bulk_results_keep_input_order_and_errors(kong_client):
+    items = [{'username': 'user-%d' % i} for i in range(20)] + [{'username': 'user-3'}]
+
+    results = kong_client.consumers.bulk_create(items, max_workers=4)
+
+    assert [result.item for result in results] == items
+    assert all(result.ok for result in results[:20])
+    assert not results[20].ok and results[20].error.http_status == 409
+    assert len(kong_client.consumers.list()) == 20
+
+
+def test_bulk_update_and_delete(kong_client):
+    consumers = create_consumers(kong_client, 5)
+
+    updated = kong_client.consumers.bulk_update([(c['id'], {'custom_id': 'x%s' % c['custom_id']}) for c in consumers])
+    assert [result.result['custom_id'] for result in updated] == ['x0', 'x1', 'x2', 'x3', 'x4']
+
+    deleted = kong_client.consumers.bulk_delete([c['id'] for c in consumers] + ['missing'])
+    assert all(result.ok for result in deleted)
+    assert kong_client.consumers.list() == []
+
+
+def test_bulk_is_bounded(kong):
+    transport = SlowAsyncTransport(kong)
+    async_kong_client = AsyncKongClient('http://localhost:8001', transport=transport)
+
+    results = asyncio.run(async_kong_client.consumers.bulk_create(
+        [{'username': 'user-%d' % i} for i in range(12)] + [{'username': 'user-0'}], max_workers=3))
+
+    assert [result.item['username'] for result in results][:3] == ['user-0', 'user-1', 'user-2']
+    assert sum(1 for result in results if result.ok) == 12
+    assert transport.max_in_flight == 3
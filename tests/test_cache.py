@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+import time
+
+from conftest import SlowAsyncTransport
+from kongclient import AsyncKongClient, KongClient
+from kongclient.cache import EntityCache, cache_key, url_types, written_type
+from kongclient.testing import FakeKongTransport
+
+
+def test_url_types():
+    assert url_types('/services/xxx/routes?size=100') == {'services', 'routes'}
+    assert written_type('/routes/xxx/service') == 'services'
+    assert written_type('/status') is None
+    assert cache_key('/services', {'tags': 'a', 'size': 10}) == '/services?size=10&tags=a'
+
+
+def test_lru_and_ttls():
+    cache = EntityCache(maxsize=2, ttl=60, ttls={'plugins': 0, 'consumers': 0.01})
+    cache.set('/services/a', 1)
+    cache.set('/services/b', 2)
+    cache.get('/services/a')
+    cache.set('/services/c', 3)
+    assert cache.get('/services/b') == (False, None)
+    assert cache.get('/services/a') == (True, 1)
+    assert cache.stats['evictions'] == 1
+
+    cache.set('/plugins/a', 4)
+    cache.set('/upstreams/a/health', 5)
+    assert len(cache) == 2
+
+    cache.set('/consumers/a', 6)
+    time.sleep(0.02)
+    assert cache.get('/consumers/a') == (False, None)
+
+
+def test_invalidation_cascades():
+    cache = EntityCache()
+    for key in ('/services/a', '/services/a/routes', '/routes/r', '/plugins', '/consumers/c', '/tags/x'):
+        cache.set(key, key)
+
+    cache.invalidate('/services/a')
+
+    assert set(cache._entries) == {'/routes/r', '/consumers/c'}
+
+
+def test_stale_read_is_not_stored():
+    cache = EntityCache()
+    generation = cache.generation('/services/a')
+    cache.invalidate('/services/a')
+    cache.set('/services/a', 'stale', generation)
+    assert cache.get('/services/a') == (False, None)
+
+    cache.set('/services/a', 'fresh', cache.generation('/services/a'))
+    assert cache.get('/services/a') == (True, 'fresh')
+
+    generation = cache.generation('/services/a')
+    cache.clear()
+    cache.set('/services/a', 'stale', generation)
+    assert len(cache) == 0
+
+
+def test_reads_are_cached_and_writes_invalidate(kong_client, transport):
+    kong_client.cache = EntityCache()
+    kong_client.services.create('httpbin', host='a.org')
+    kong_client.services.add_route('httpbin', name='route', hosts=['a.org'])
+    transport.requests.clear()
+
+    kong_client.services.get('httpbin')
+    kong_client.services.get('httpbin')
+    kong_client.services.list_routes('httpbin')
+    kong_client.services.list_routes('httpbin')
+    assert transport.count('GET') == 2
+
+    kong_client.routes.update('route', hosts=['b.org'])
+    assert kong_client.services.list_routes('httpbin')[0]['hosts'] == ['b.org']
+    kong_client.services.get('httpbin')
+    assert transport.count('GET') == 3
+
+
+def test_async_reads_are_cached_and_writes_invalidate(kong):
+    transport = SlowAsyncTransport(kong, delay=0)
+    async_kong_client = AsyncKongClient('http://localhost:8001', transport=transport, cache=EntityCache())
+
+    async def main():
+        await async_kong_client.services.create('httpbin', host='a.org')
+        await async_kong_client.services.get('httpbin')
+        await async_kong_client.services.get('httpbin')
+        sent = transport.sent
+        await async_kong_client.services.update('httpbin', host='b.org')
+        return sent, await async_kong_client.services.get('httpbin')
+
+    sent, service = asyncio.run(main())
+    assert sent == 2
+    assert service['host'] == 'b.org'
+
+
+class SlowReads(FakeKongTransport):
+    """ FakeKongTransport delaying the responses to the GETs of the thread named 'slow'. """
+
+    def send(self, method, url, params=None, json=None, headers=None, timeout=None):
+        resp = super(SlowReads, self).send(method, url, params=params, json=json, headers=headers, timeout=timeout)
+        if method == 'GET' and threading.current_thread().name == 'slow':
+            time.sleep(0.2)
+        return resp
+
+
+def test_read_overlapping_a_write_is_not_cached():
+    kong_client = KongClient('http://localhost:8001', transport=SlowReads(), cache=EntityCache())
+    kong_client.services.create('svc', host='x.org')
+
+    reader = threading.Thread(target=kong_client.services.get, args=('svc',), name='slow')
+    reader.start()
+    time.sleep(0.05)
+    kong_client.services.update('svc', host='new.org')
+    reader.join()
+
+    assert kong_client.services.get('svc')['host'] == 'new.org'
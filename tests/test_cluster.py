@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+import functools
+import threading
+
+import pytest
+
+from conftest import CountingTransport
+from kongclient.cluster import ClusterKongClient, ClusterTransport
+from kongclient.exceptions import ConnectException, TimeoutException, TransportException
+
+URLS = ['http://kong-a:8001', 'http://kong-b:8001', 'http://kong-c:8001']
+
+
+@pytest.fixture
+def cluster(kong):
+    return ClusterTransport(URLS, transport=functools.partial(CountingTransport, kong))
+
+
+def counts(cluster, method=None):
+    return [node.transport.count(method) for node in cluster.nodes]
+
+
+def test_reads_are_balanced_round_robin(cluster):
+    for _ in range(6):
+        assert cluster.request('GET', '/services').status_code == 200
+    assert counts(cluster) == [2, 2, 2]
+
+
+def test_least_outstanding(kong):
+    cluster = ClusterTransport(URLS, strategy='least-outstanding',
+                               transport=functools.partial(CountingTransport, kong))
+    for _ in range(3):
+        cluster.request('GET', '/services')
+    assert counts(cluster) == [1, 1, 1]
+
+    cluster.nodes[0].outstanding = 5
+    for _ in range(4):
+        cluster.request('GET', '/services')
+    assert counts(cluster)[0] == 1 and min(counts(cluster)[1:]) >= 2
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        ClusterTransport(URLS, strategy='random')
+
+
+def test_reads_fail_over(cluster):
+    cluster.nodes[0].transport.failures = [TransportException('refused')]
+    cluster.nodes[1].transport.failures = [503]
+
+    assert cluster.request('GET', '/services').status_code == 200
+    assert counts(cluster) == [1, 1, 1]
+    assert [node.healthy for node in cluster.nodes] == [False, False, True]
+
+    cluster.request('GET', '/services')
+    assert counts(cluster) == [1, 1, 2]
+
+
+def test_every_node_failing(cluster):
+    for node in cluster.nodes:
+        node.transport.failures = [TransportException('refused')] * 2
+
+    with pytest.raises(TransportException):
+        cluster.request('GET', '/services')
+    with pytest.raises(TransportException):
+        cluster.request('GET', '/services')
+    assert counts(cluster) == [2, 2, 2]
+
+
+def test_writes_go_to_the_preferred_node(kong):
+    cluster = ClusterTransport(URLS, preferred=1, transport=functools.partial(CountingTransport, kong))
+    cluster.request('POST', '/consumers', json={'username': 'alice'})
+    cluster.request('POST', '/consumers', json={'username': 'bob'})
+    assert counts(cluster, 'POST') == [0, 2, 0]
+
+    cluster.nodes[1].transport.failures = [ConnectException('refused')]
+    assert cluster.request('POST', '/consumers', json={'username': 'carol'}).status_code == 201
+    assert counts(cluster, 'POST') == [1, 3, 0]
+    assert cluster.request('POST', '/consumers', json={'username': 'dave'}).status_code == 201
+    assert counts(cluster, 'POST') == [2, 3, 0]
+    assert len(kong.collections['consumers']) == 4
+
+
+@pytest.mark.parametrize('error', [TimeoutException('read timeout'), TransportException('connection reset')])
+def test_writes_that_may_have_been_applied_are_not_replayed(cluster, error):
+    cluster.nodes[0].transport.failures = [error]
+
+    with pytest.raises(TransportException) as raised:
+        cluster.request('POST', '/consumers', json={'username': 'alice'})
+    assert raised.value is error
+    assert counts(cluster, 'POST') == [1, 0, 0]
+
+
+def test_check_health(cluster):
+    cluster.nodes[2].transport.failures = [TransportException('refused')]
+    assert cluster.check_health() == {URLS[0]: True, URLS[1]: True, URLS[2]: False}
+    assert cluster.check_health() == {URLS[0]: True, URLS[1]: True, URLS[2]: True}
+
+
+def test_health_checks_survive_errors(kong, caplog):
+    checked = threading.Event()
+    calls = []
+
+    def check_health():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError('boom')
+        checked.set()
+
+    kong_client = ClusterKongClient(URLS, transport=functools.partial(CountingTransport, kong))
+    kong_client.check_health = check_health
+    thread = threading.Thread(target=kong_client._check_health_forever, args=(0.01,))
+    thread.start()
+    try:
+        assert checked.wait(5)
+    finally:
+        kong_client.close()
+        thread.join()
+    assert 'Health check of the Kong admin nodes failed' in caplog.text
+    assert kong_client.services.list() == []
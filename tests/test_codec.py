@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+
+import pytest
+
+from kongclient.codec import Codec, LazyEntity, json_loads, page_offset
+from kongclient.snapshot import snapshot
+from kongclient.sync import sync
+from kongclient.watch import HealthWatcher
+
+
+def test_backends():
+    assert json_loads() is json.loads and Codec().loads is json.loads
+    assert json_loads('auto')(b'{"a": 1}') == {'a': 1}
+    assert Codec(backend='auto').decode(b'{"a": 1}') == {'a': 1}
+    with pytest.raises(ValueError):
+        json_loads('yaml')
+
+
+def test_modes_are_exclusive():
+    with pytest.raises(ValueError):
+        Codec(raw=True, lazy=True)
+
+
+def test_page_offset():
+    assert page_offset(b'{"data": [{"offset": "no"}], "offset": "WyJh\\/Il0", "next": "/x"}') == 'WyJh/Il0'
+    assert page_offset(b'{"offset": "abc", "data": []}') == 'abc'
+    assert page_offset(b'{"data": [{"offset": "no"}], "offset": null, "next": null}') is None
+
+
+def test_raw_mode(kong_client):
+    kong_client.codec = Codec(raw=True)
+    for i in range(3):
+        kong_client.consumers.create('user-%d' % i)
+
+    pages = kong_client.consumers.list(size=2)
+    service = kong_client.consumers.get('user-0')
+
+    assert len(pages) == 2 and all(isinstance(page, bytes) for page in pages)
+    assert [len(json.loads(page)['data']) for page in pages] == [2, 1]
+    assert json.loads(service)['username'] == 'user-0'
+
+
+def test_lazy_mode(kong_client):
+    kong_client.codec = Codec(lazy=True, backend='json')
+    kong_client.services.create('httpbin', host='httpbin.org')
+
+    service = kong_client.services.get('httpbin')
+
+    assert isinstance(service, LazyEntity) and service._value is None
+    assert service['host'] == 'httpbin.org'
+    assert dict(service)['name'] == 'httpbin'
+    assert isinstance(kong_client.services.list()[0], dict)
+
+
+@pytest.mark.parametrize('use', [
+    lambda kong: sync(kong, {'consumers': [{'username': 'alice'}]}),
+    lambda kong: snapshot(kong, io.StringIO()),
+    lambda kong: HealthWatcher(kong, upstreams=['backend']),
+])
+def test_raw_clients_are_rejected_by_entity_readers(kong_client, transport, use):
+    kong_client.codec = Codec(raw=True)
+
+    with pytest.raises(ValueError, match='raw'):
+        use(kong_client)
+    assert transport.requests == []
+
+
+@pytest.mark.parametrize('codec', [Codec(lazy=True), Codec(models=True)])
+def test_entity_readers_accept_decoding_codecs(kong_client, codec):
+    kong_client.codec = codec
+    desired = {'services': [{'name': 'httpbin', 'host': 'httpbin.org',
+                             'routes': [{'name': 'route', 'hosts': ['httpbin.org']}]}],
+               'upstreams': [{'name': 'backend', 'targets': [{'target': '10.0.0.1:80'}]}]}
+
+    assert sync(kong_client, desired).ok and len(sync(kong_client, desired)) == 0
+    assert snapshot(kong_client, io.StringIO())['routes'] == 1
+    assert HealthWatcher(kong_client, upstreams=['backend'], emit_initial=True).poll()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+from kongclient import KongClient
+from kongclient.conditional import ChangeTracker, digest
+from kongclient.testing import FakeKongTransport
+
+
+class ETagTransport(FakeKongTransport):
+    """ FakeKongTransport sending an ETag with every GET response, and 304 to matching conditional GETs. """
+
+    def send(self, method, url, params=None, json=None, headers=None, timeout=None):
+        resp = super(ETagTransport, self).send(method, url, params=params, json=json, headers=headers,
+                                               timeout=timeout)
+        if method == 'GET' and resp.status_code == 200:
+            etag = '"%s"' % digest(resp.content).hex()
+            resp.headers['ETag'] = etag
+            if (headers or {}).get('If-None-Match') == etag:
+                resp.status_code = 304
+                resp.content = b''
+        return resp
+
+
+def test_unchanged_responses_return_the_previous_object(kong_client):
+    kong_client.tracker = ChangeTracker()
+    kong_client.services.create('httpbin', host='a.org')
+
+    first = kong_client.services.get('httpbin')
+    second = kong_client.services.get('httpbin')
+    kong_client.services.update('httpbin', host='b.org')
+    third = kong_client.services.get('httpbin')
+
+    assert second is first
+    assert third is not first and third['host'] == 'b.org'
+    assert kong_client.tracker.stats == {'not_modified': 0, 'unchanged': 1, 'changed': 2, 'size': 1}
+
+
+def test_lists_are_tracked_per_page(kong_client):
+    kong_client.tracker = ChangeTracker()
+    for i in range(3):
+        kong_client.consumers.create('user-%d' % i)
+
+    first = kong_client.consumers.list(size=2)
+    second = kong_client.consumers.list(size=2)
+
+    assert second == first
+    assert kong_client.tracker.stats['unchanged'] == 2
+
+
+def test_conditional_requests():
+    kong_client = KongClient('http://localhost:8001', transport=ETagTransport(), tracker=ChangeTracker())
+    kong_client.services.create('httpbin', host='a.org')
+
+    first = kong_client.services.get('httpbin')
+    second = kong_client.services.get('httpbin')
+
+    assert second is first
+    assert kong_client.tracker.stats['not_modified'] == 1
+
+
+def test_least_recently_used_reads_are_forgotten(kong_client):
+    kong_client.tracker = ChangeTracker(maxsize=2)
+    for name in ('a', 'b', 'c'):
+        kong_client.services.create(name, host='%s.org' % name)
+        kong_client.services.get(name)
+
+    assert len(kong_client.tracker) == 2
+    assert kong_client.tracker.lookup('/services/a') is None
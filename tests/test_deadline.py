@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import time
+
+import pytest
+
+from kongclient import KongClient
+from kongclient.client import DEFAULT_TIMEOUT
+from kongclient.deadline import Deadline, current_deadline
+from kongclient.exceptions import APIException, DeadlineExceeded
+from kongclient.retry import RetryPolicy
+from kongclient.testing import FakeKongTransport
+
+
+class TimeoutRecorder(FakeKongTransport):
+    """ FakeKongTransport recording the timeout of every request. """
+
+    def __init__(self, kong=None, **options):
+        super(TimeoutRecorder, self).__init__(kong, **options)
+        self.timeouts = []
+
+    def send(self, method, url, params=None, json=None, headers=None, timeout=None):
+        self.timeouts.append(timeout)
+        return super(TimeoutRecorder, self).send(method, url, params=params, json=json, headers=headers,
+                                                 timeout=timeout)
+
+
+def test_deadline_caps_timeouts():
+    with Deadline(10) as deadline:
+        assert current_deadline() is deadline
+        connect, read = deadline.timeout((3, 60))
+        assert connect == 3 and 9 < read <= 10
+        with Deadline(100):
+            assert current_deadline() is deadline
+    assert current_deadline() is None
+
+
+def test_requests_have_a_default_timeout_capped_by_the_deadline():
+    kong_client = KongClient('http://localhost:8001', transport=TimeoutRecorder)
+    kong_client.services.list()
+    with kong_client.deadline(5):
+        kong_client.services.list()
+
+    assert kong_client.client.timeouts[0] == DEFAULT_TIMEOUT
+    connect, read = kong_client.client.timeouts[1]
+    assert connect <= 5 and 4 < read <= 5
+
+
+def test_expired_deadline(kong_client, transport):
+    with kong_client.deadline(0.01):
+        time.sleep(0.02)
+        with pytest.raises(DeadlineExceeded):
+            kong_client.services.list()
+    assert transport.requests == []
+
+
+def test_retries_stop_at_the_deadline(kong_client, transport):
+    kong_client.retry = RetryPolicy(max_retries=10, backoff_factor=0.2, jitter=False)
+    transport.failures = [503] * 10
+
+    started_at = time.monotonic()
+    with kong_client.deadline(0.3):
+        with pytest.raises(APIException):
+            kong_client.services.get('httpbin')
+    assert time.monotonic() - started_at < 0.3
+    assert transport.count('GET') == 2
+
+
+def test_bulk_shares_the_deadline(kong_client):
+    for username in ('user-000', 'user-001', 'user-002'):
+        kong_client.consumers.create(username)
+    with kong_client.deadline(0.0001):
+        results = kong_client.consumers.bulk_delete(['user-000', 'user-001', 'user-002'])
+    assert all(not result.ok for result in results)
+    assert len(kong_client.consumers.list()) == 3
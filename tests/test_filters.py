@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from kongclient.filters import any_tags
+
+
+def test_tags_filters(kong_client):
+    kong_client.services.create('a', host='a.org', tags=['team-a', 'prod'])
+    kong_client.services.create('b', host='b.org', tags=['team-b', 'prod'])
+    kong_client.services.create('c', host='c.org', tags=['team-c'])
+
+    assert [s['name'] for s in kong_client.services.list(tags=['prod', 'team-a'])] == ['a']
+    assert [s['name'] for s in kong_client.services.list(tags='prod')] == ['a', 'b']
+    assert [s['name'] for s in kong_client.services.list(tags=any_tags('team-a', 'team-c'))] == ['a', 'c']
+
+
+def test_any_tags_rejects_separators():
+    with pytest.raises(ValueError):
+        any_tags('a,b')
+    with pytest.raises(ValueError):
+        any_tags()
+
+
+def test_custom_id_filter_and_fields(kong_client):
+    for i in range(5):
+        kong_client.consumers.create('user-%03d' % i, custom_id=str(i))
+
+    consumers = kong_client.consumers.list(custom_id='3', fields=('id', 'username'))
+
+    assert len(consumers) == 1
+    assert set(consumers[0]) == {'id', 'username'}
+    assert consumers[0]['username'] == 'user-003'
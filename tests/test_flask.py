@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from benchmarks.fake_kong import FakeKongServer
+
+flask = pytest.importorskip('flask')
+
+from kongclient.flask import KongClient  # noqa: E402
+
+
+def test_timeout_from_a_list():
+    app = flask.Flask(__name__)
+    app.config['KONG_ADMIN_TIMEOUT'] = [3, 30]
+    kong_client = KongClient(app)
+
+    assert kong_client.client.timeout == (3, 30)
+
+
+def test_every_app_context_has_its_own_session():
+    app = flask.Flask(__name__)
+    kong_client = KongClient(app)
+    transport = kong_client.client
+
+    with app.app_context():
+        session = transport.session
+        assert transport.session is session
+    with app.app_context():
+        assert transport.session is not session
+        assert transport.session.get_adapter('https://localhost:8444') is session.get_adapter('https://localhost:8444')
+
+
+def test_requests_in_a_view(kong):
+    server = FakeKongServer(kong=kong)
+    app = flask.Flask(__name__)
+    app.config['KONG_ADMIN_URL'] = server.start()
+    kong_client = KongClient(app)
+
+    @app.route('/services/<name>', methods=['POST'])
+    def create(name):
+        return kong_client.services.create(name, host='%s.org' % name)
+
+    try:
+        with app.test_client() as test_client:
+            assert test_client.post('/services/httpbin').get_json()['host'] == 'httpbin.org'
+        assert [service['name'] for service in kong_client.services.list()] == ['httpbin']
+    finally:
+        server.shutdown()
+        server.server_close()
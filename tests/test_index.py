@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from kongclient.index import KongIndex
+from kongclient.models import Route
+
+
+@pytest.fixture
+def entities(kong_client):
+    service = kong_client.services.create('httpbin', host='httpbin.org', tags=['team-a'])
+    route = kong_client.services.add_route(service['id'], name='route', hosts=['httpbin.org'])
+    consumer = kong_client.consumers.create('alice', custom_id='a-1')
+    kong_client.plugins.create('cors', route_id=route['id'])
+    kong_client.plugins.create('rate-limiting', service_id=service['id'], config={'minute': 20})
+    kong_client.plugins.create('key-auth', route_id=route['id'], consumer_id=consumer['id'])
+    kong_client.plugins.create('prometheus')
+    upstream = kong_client.upstreams.create('httpbin.org')
+    kong_client.upstreams.add_target(upstream['id'], '10.0.0.1:80')
+    return {'service': service, 'route': route, 'consumer': consumer}
+
+
+def names(plugins):
+    return sorted(plugin['name'] for plugin in plugins)
+
+
+def test_lookups(kong_client, transport, entities):
+    index = KongIndex.load(kong_client)
+    transport.requests.clear()
+
+    assert len(index) == 9
+    assert index.get('consumers', 'a-1')['id'] == entities['consumer']['id']
+    assert index.get('services', 'missing') is None
+    assert index.service_of('route')['name'] == 'httpbin'
+    assert [route['name'] for route in index.routes_of('httpbin')] == ['route']
+    assert [target['target'] for target in index.targets_of('httpbin.org')] == ['10.0.0.1:80']
+    assert [service['name'] for service in index.with_tag('team-a', kind='services')] == ['httpbin']
+    assert transport.requests == []
+
+
+def test_plugins(kong_client, entities):
+    index = KongIndex.load(kong_client)
+
+    assert names(index.plugins_of()) == ['prometheus']
+    assert names(index.plugins_of(route='route')) == ['cors']
+    assert names(index.plugins_of(route='route', consumer='alice')) == ['key-auth']
+    assert names(index.plugins_for_route(entities['route'])) == ['cors', 'prometheus', 'rate-limiting']
+
+
+def test_unknown_entities_have_no_plugins(kong_client, entities):
+    index = KongIndex.load(kong_client)
+
+    assert index.plugins_of(route='missing') == []
+    assert index.plugins_of(service='httpbin', consumer='missing') == []
+    assert index.plugins_for_route('missing') == []
+
+
+def test_models_are_accepted(kong_client, entities):
+    index = KongIndex.load(kong_client)
+    route = Route.from_dict(entities['route'])
+
+    assert index.service_of(route)['name'] == 'httpbin'
+    assert names(index.plugins_of(route=route)) == ['cors']
+
+
+def test_refresh(kong_client, entities):
+    index = KongIndex.load(kong_client)
+    assert index.refresh(kong_client) == {'added': 0, 'updated': 0, 'removed': 0}
+
+    kong_client.services.update('httpbin', retries=2)
+    kong_client.consumers.create('bob')
+    kong_client.consumers.delete('alice')
+
+    assert index.refresh(kong_client) == {'added': 1, 'updated': 1, 'removed': 2}
+    assert index.get('services', 'httpbin')['retries'] == 2
+    assert index.get('consumers', 'alice') is None
+    assert index.plugins_of(route='route', consumer=entities['consumer']['id']) == []
+
+
+def test_plugins_for_route_use_the_scope_indexes():
+    service = {'id': 's', 'name': 'httpbin'}
+    route = {'id': 'r', 'name': 'route', 'service': {'id': 's'}}
+    plugins = [{'id': 'p%d' % i, 'name': 'acl', 'service': {'id': 'other-%d' % i}} for i in range(100)]
+    plugins += [{'id': 'both', 'name': 'cors', 'route': {'id': 'r'}, 'service': {'id': 's'}},
+                {'id': 'global', 'name': 'prometheus'},
+                {'id': 'consumer', 'name': 'key-auth', 'consumer': {'id': 'c'}}]
+    index = KongIndex({'services': [service], 'routes': [route], 'plugins': plugins})
+
+    assert [plugin['id'] for plugin in index.plugins_for_route('route')] == ['both', 'global']
+    assert index.global_plugins == {'global'}
+
+    index.remove('plugins', 'global')
+    assert index.plugins_of() == []
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import subprocess
+import sys
+import threading
+import types
+
+import pytest
+
+import kongclient
+from kongclient import AsyncKongClient, KongClient
+from kongclient.api.service import AsyncServiceManager, ServiceManager
+from kongclient.lazy import LazyManager, lazy_exports
+
+
+def imported_modules(code):
+    """ Return the modules of `MODULES` imported by running code in a fresh interpreter. """
+    script = 'import sys\n%s\nprint(" ".join(name for name in MODULES if name in sys.modules))' % code
+    output = subprocess.check_output([sys.executable, '-c', script.replace('MODULES', repr(MODULES))])
+    return output.decode().split()
+
+
+MODULES = ('requests', 'urllib3', 'httpx', 'asyncio', 'kongclient.api.service', 'kongclient.api.route')
+
+
+def test_import_is_lazy():
+    assert imported_modules('import kongclient') == []
+    assert imported_modules("from kongclient import KongClient\nKongClient('http://localhost:8001')") == []
+    assert imported_modules("from kongclient import KongClient\nKongClient('http://localhost:8001').services") == [
+        'kongclient.api.service']
+
+
+def test_lazy_exports():
+    package = types.ModuleType('package')
+    sys.modules['package'] = package
+    try:
+        package.__getattr__, package.__dir__ = lazy_exports('package', {'dumps': 'json'})
+
+        assert 'dumps' in dir(package)
+        assert package.dumps.__module__ == 'json'
+        assert 'dumps' in vars(package)
+        with pytest.raises(AttributeError):
+            package.loads
+    finally:
+        del sys.modules['package']
+
+
+def test_exports():
+    assert kongclient.KongClient is KongClient and 'AsyncKongClient' in dir(kongclient)
+    with pytest.raises(AttributeError):
+        kongclient.Missing
+
+
+def test_managers_are_created_once_per_client():
+    kong_client = KongClient('http://localhost:8001')
+    other = KongClient('http://localhost:8001')
+
+    assert isinstance(KongClient.services, LazyManager)
+    assert isinstance(kong_client.services, ServiceManager) and kong_client.services is kong_client.services
+    assert 'services' in vars(kong_client) and 'routes' not in vars(kong_client)
+    assert other.services is not kong_client.services and other.services.api is other
+    assert isinstance(AsyncKongClient('http://localhost:8001').services, AsyncServiceManager)
+
+
+def test_threads_share_the_first_manager(monkeypatch):
+    created = []
+    barrier = threading.Barrier(8)
+
+    class SlowManager(ServiceManager):
+        def __init__(self, api):
+            created.append(self)
+            barrier.wait()
+            super(SlowManager, self).__init__(api)
+
+    monkeypatch.setattr('kongclient.api.SlowManager', SlowManager, raising=False)
+    monkeypatch.setattr(KongClient, 'slow', LazyManager('SlowManager'), raising=False)
+    KongClient.slow.__set_name__(KongClient, 'slow')
+    kong_client = KongClient('http://localhost:8001')
+    managers = []
+    threads = [threading.Thread(target=lambda: managers.append(kong_client.slow)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 8
+    assert all(manager is kong_client.slow for manager in managers)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from kongclient.exceptions import APIException
+
+
+def create_consumers(kong_client, count, **kwargs):
+    return [kong_client.consumers.create('user-%03d' % i, custom_id=str(i), **kwargs) for i in range(count)]
+
+
+def test_list_follows_every_page(kong_client, transport):
+    create_consumers(kong_client, 25)
+    transport.requests.clear()
+
+    consumers = kong_client.consumers.list(size=10)
+
+    assert [consumer['username'] for consumer in consumers] == ['user-%03d' % i for i in range(25)]
+    assert transport.count('GET') == 3
+
+
+def test_iter_requests_pages_lazily(kong_client, transport):
+    create_consumers(kong_client, 25)
+    transport.requests.clear()
+
+    consumers = kong_client.consumers.iter(size=10)
+    assert transport.requests == []
+    first = [next(consumers) for _ in range(10)]
+    assert len(first) == 10 and transport.count('GET') == 1
+    assert len(list(consumers)) == 15
+    assert transport.count('GET') == 3
+
+
+def test_nested_list(kong_client):
+    kong_client.services.create('httpbin', url='https://httpbin.org')
+    kong_client.services.create('other', url='https://other.org')
+    for i in range(3):
+        kong_client.services.add_route('httpbin', name='route-%d' % i, hosts=['httpbin.org'])
+    kong_client.services.add_route('other', name='other', hosts=['other.org'])
+
+    routes = kong_client.services.list_routes('httpbin', size=2)
+
+    assert sorted(route['name'] for route in routes) == ['route-0', 'route-1', 'route-2']
+
+
+def test_get_update_delete(kong_client):
+    service = kong_client.services.create('httpbin', url='https://httpbin.org:8443/anything')
+    assert (service['protocol'], service['host'], service['port'], service['path']) == \
+        ('https', 'httpbin.org', 8443, '/anything')
+
+    assert kong_client.services.get('httpbin')['id'] == service['id']
+    assert kong_client.services.update('httpbin', retries=1)['retries'] == 1
+    kong_client.services.delete('httpbin')
+    with pytest.raises(APIException) as error:
+        kong_client.services.get('httpbin')
+    assert error.value.http_status == 404
+
+
+def test_api_errors(kong_client):
+    kong_client.services.create('httpbin', host='httpbin.org')
+    with pytest.raises(APIException) as error:
+        kong_client.services.create('httpbin', host='httpbin.org')
+    assert error.value.http_status == 409
+
+    kong_client.services.add_route('httpbin', name='route', hosts=['httpbin.org'])
+    with pytest.raises(APIException) as error:
+        kong_client.services.delete('httpbin')
+    assert error.value.http_status == 400
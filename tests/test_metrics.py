@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+from kongclient import AsyncKongClient
+from kongclient.exceptions import APIException, TransportException
+from kongclient.metrics import Hook, Metrics, url_template
+from kongclient.testing import AsyncFakeKongTransport
+
+
+class RecordingHook(Hook):
+
+    def __init__(self):
+        self.ended = []
+
+    def end(self, context, method, template, status, duration, size=None, error=None):
+        self.ended.append((method, template, status, type(error).__name__ if error else None))
+
+
+def test_url_template():
+    assert url_template('/services/httpbin/routes') == '/services/{id}/routes'
+    assert url_template('/upstreams/api/targets/10.0.0.1:80/healthy?x=1') == '/upstreams/{id}/targets/{id}/healthy'
+
+
+def test_requests_are_recorded(kong_client, transport):
+    hook = RecordingHook()
+    kong_client.metrics = Metrics(hooks=[hook])
+    kong_client.services.create('httpbin', host='httpbin.org')
+    kong_client.services.get('httpbin')
+    with pytest.raises(APIException):
+        kong_client.services.get('missing')
+    transport.failures = [TransportException('refused')]
+    with pytest.raises(TransportException):
+        kong_client.services.get('httpbin')
+
+    snapshot = kong_client.metrics.snapshot()
+
+    assert snapshot['GET /services/{id}']['responses'] == {200: 1, 404: 1, 'error': 1}
+    assert snapshot['GET /services/{id}']['in_flight'] == 0
+    assert snapshot['POST /services']['bytes_received'] > 0
+    assert hook.ended[-1] == ('GET', '/services/{id}', None, 'TransportException')
+
+
+def test_unexpected_errors_end_the_request(kong_client, transport):
+    kong_client.metrics = Metrics()
+    transport.failures = [ValueError('bad response')]
+
+    with pytest.raises(ValueError):
+        kong_client.services.list()
+
+    assert kong_client.metrics.snapshot()['GET /services']['in_flight'] == 0
+
+
+def test_unexpected_errors_end_async_requests(kong):
+    class FailingTransport(AsyncFakeKongTransport):
+        async def send(self, method, url, params=None, json=None, headers=None, timeout=None):
+            raise ValueError('bad response')
+
+    kong_client = AsyncKongClient('http://localhost:8001', transport=FailingTransport(kong), metrics=Metrics())
+
+    with pytest.raises(ValueError):
+        asyncio.run(kong_client.services.list())
+
+    assert kong_client.metrics.snapshot()['GET /services']['responses'] == {'error': 1}
+    assert kong_client.metrics.snapshot()['GET /services']['in_flight'] == 0
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+import json
+import tracemalloc
+
+import pytest
+
+from kongclient.codec import Codec
+from kongclient.models import MODELS, Consumer, Plugin, Route, Service, Target, Upstream, model_for
+
+
+def test_models_mode(kong_client):
+    kong_client.codec = Codec(models=('routes',))
+    kong_client.services.create('httpbin', host='httpbin.org')
+    kong_client.services.add_route('httpbin', name='route', hosts=['httpbin.org'])
+
+    route = kong_client.routes.get('route')
+
+    assert isinstance(route, Route)
+    assert isinstance(kong_client.routes.list()[0], Route)
+    assert isinstance(kong_client.services.get('httpbin'), dict)
+    assert isinstance(kong_client.routes.get_service('route'), dict)
+
+
+def test_model_for():
+    assert model_for('/services/xxx/routes') is Route
+    assert model_for('/routes/xxx/service') is Service
+    assert model_for('/consumers') is Consumer
+    assert model_for('/plugins/enabled') is None
+    assert model_for('/status') is None
+
+
+def test_models_read_like_dicts():
+    route = Route.from_dict({'id': 'r', 'name': 'route', 'paths': ['/a'], 'methods': ['GET'],
+                             'service': {'id': 's'}, 'tags': ['team-a'], 'future_field': 1})
+
+    assert route.service == 's' and route['service'] == {'id': 's'}
+    assert route.paths == ('/a',) and route['paths'] == ['/a']
+    assert route['future_field'] == 1
+    assert route.hosts is None and 'hosts' not in route
+    with pytest.raises(KeyError):
+        route['hosts']
+    assert route.to_dict() == {'id': 'r', 'name': 'route', 'paths': ['/a'], 'methods': ['GET'],
+                               'service': {'id': 's'}, 'tags': ['team-a'], 'future_field': 1}
+
+
+def retained(build):
+    """ Return the number of bytes allocated by build() and still held by its result. """
+    tracemalloc.start()
+    try:
+        result = build()
+        return tracemalloc.get_traced_memory()[0], result
+    finally:
+        tracemalloc.stop()
+
+
+def test_models_are_compact(kong_client):
+    kong_client.services.create('httpbin', host='httpbin.org')
+    for i in range(200):
+        kong_client.services.add_route('httpbin', name='route-%d' % i, hosts=['httpbin.org'], paths=['/%d' % i],
+                                       tags=['team-a'])
+    content = kong_client.client.request('GET', '/routes', params={'size': 1000}).content
+
+    dict_size, routes = retained(lambda: json.loads(content)['data'])
+    model_size, models = retained(lambda: [Route.from_dict(route) for route in json.loads(content)['data']])
+
+    assert model_size < dict_size * 0.75
+    assert not hasattr(models[0], '__dict__')
+    assert models[0].protocols[0] is models[1].protocols[0]
+    assert models[0].service is models[1].service
+    assert [model.to_dict() for model in models] == routes
+
+
+def test_models_have_every_field_of_kong(kong_client):
+    kong_client.codec = Codec(models=True)
+    service = kong_client.services.create('httpbin', host='httpbin.org')
+    route = kong_client.services.add_route('httpbin', name='route', hosts=['httpbin.org'])
+    consumer = kong_client.consumers.create('alice')
+    upstream = kong_client.upstreams.create('backend')
+    entities = [service, route, consumer, upstream, kong_client.upstreams.add_target('backend', '10.0.0.1:80'),
+                kong_client.plugins.create('cors', service_id=service.id), kong_client.routes.get('route')]
+    entities += [kong_client.consumers.list()[0], kong_client.upstreams.list_targets('backend')[0]]
+
+    assert sorted({entity.KIND for entity in entities}) == sorted(MODELS)
+    assert [entity.extra for entity in entities] == [None] * len(entities)
+    assert route.request_buffering is True and consumer.updated_at and upstream.updated_at
+
+
+def test_kong_3_fields():
+    service = Service.from_dict({'id': 's', 'host': 'httpbin.org', 'enabled': False, 'tls_verify': True,
+                                 'tls_verify_depth': 2, 'ca_certificates': ['ca'], 'updated_at': 1})
+    plugin = Plugin.from_dict({'id': 'p', 'name': 'cors', 'instance_name': 'cors-a', 'updated_at': 1})
+    upstream = Upstream.from_dict({'id': 'u', 'name': 'backend', 'hash_on': 'query_arg', 'hash_on_query_arg': 'q',
+                                   'use_srv_name': False, 'updated_at': 1})
+    target = Target.from_dict({'id': 't', 'target': '10.0.0.1:80', 'updated_at': 1})
+
+    assert [model.extra for model in (service, plugin, upstream, target)] == [None] * 4
+    assert service.ca_certificates == ('ca',) and service['ca_certificates'] == ['ca']
+    assert not service.enabled and plugin.instance_name == 'cors-a' and upstream.hash_on_query_arg == 'q'
+    assert target.updated_at == 1
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+from kongclient.codec import Codec
+from kongclient.index import KongIndex
+from kongclient.models import Route
+from kongclient.resolver import PluginResolver
+
+SERVICE = {'id': 's', 'name': 'httpbin'}
+ROUTE = {'id': 'r', 'name': 'route', 'service': {'id': 's'}}
+CONSUMER = {'id': 'c', 'username': 'alice', 'custom_id': 'a-1'}
+PLUGINS = [
+    {'id': '1', 'name': 'rate-limiting', 'config': {'minute': 100}},
+    {'id': '2', 'name': 'rate-limiting', 'service': {'id': 's'}, 'config': {'minute': 50}},
+    {'id': '3', 'name': 'rate-limiting', 'route': {'id': 'r'}, 'config': {'minute': 20}},
+    {'id': '4', 'name': 'rate-limiting', 'consumer': {'id': 'c'}, 'config': {'minute': 5}},
+    {'id': '5', 'name': 'cors', 'service': {'id': 's'}},
+    {'id': '6', 'name': 'prometheus', 'enabled': False},
+]
+
+
+def resolver():
+    return PluginResolver(PLUGINS, routes=[ROUTE], services=[SERVICE], consumers=[CONSUMER])
+
+
+def ids(effective):
+    return {name: plugin['id'] for name, plugin in effective.items()}
+
+
+def test_most_specific_scope_wins():
+    assert ids(resolver().resolve()) == {'rate-limiting': '1'}
+    assert ids(resolver().resolve(service='httpbin')) == {'rate-limiting': '2', 'cors': '5'}
+    assert ids(resolver().resolve(route='route')) == {'rate-limiting': '3', 'cors': '5'}
+    assert ids(resolver().resolve(route=ROUTE, consumer='a-1')) == {'rate-limiting': '4', 'cors': '5'}
+
+
+def test_resolve_many():
+    requests = [('route', None, None), ('r', 's', None), (None, None, 'alice'), ('route', None, None)]
+
+    results = resolver().resolve_many(requests)
+
+    assert [ids(effective) for effective in results] == [
+        {'rate-limiting': '3', 'cors': '5'}, {'rate-limiting': '3', 'cors': '5'}, {'rate-limiting': '4'},
+        {'rate-limiting': '3', 'cors': '5'}]
+    assert results[3] is results[0]
+
+
+def test_load(kong_client):
+    service = kong_client.services.create('httpbin', host='httpbin.org')
+    route = kong_client.services.add_route(service['id'], name='route', hosts=['httpbin.org'])
+    kong_client.plugins.create('rate-limiting', service_id=service['id'], config={'minute': 50})
+    kong_client.plugins.create('cors', route_id=route['id'])
+
+    for plugin_resolver in (PluginResolver.load(kong_client), PluginResolver.from_index(KongIndex.load(kong_client))):
+        assert sorted(plugin_resolver.resolve(route='route')) == ['cors', 'rate-limiting']
+
+
+def test_models_are_resolved(kong_client):
+    kong_client.codec = Codec(models=True)
+    service = kong_client.services.create('httpbin', host='httpbin.org')
+    route = kong_client.services.add_route(service['id'], name='route', hosts=['httpbin.org'])
+    consumer = kong_client.consumers.create('alice')
+    kong_client.plugins.create('rate-limiting', route_id=route['id'], consumer_id=consumer['id'],
+                               config={'minute': 5})
+    kong_client.plugins.create('cors', service_id=service['id'])
+
+    plugin_resolver = PluginResolver.load(kong_client)
+    effective = plugin_resolver.resolve(route=kong_client.routes.get('route'),
+                                        consumer=kong_client.consumers.get('alice'))
+
+    assert isinstance(route, Route)
+    assert sorted(effective) == ['cors', 'rate-limiting']
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+import time
+
+import pytest
+
+from kongclient.exceptions import APIException, TransportException
+from kongclient.retry import RetryPolicy, parse_retry_after
+
+
+def test_next_delay():
+    policy = RetryPolicy(max_retries=2, backoff_factor=0.5, jitter=False)
+    started_at = time.monotonic()
+    error = TransportException('refused')
+
+    assert policy.next_delay('GET', 1, started_at, error=error) == 0.5
+    assert policy.next_delay('GET', 2, started_at, error=error) == 1
+    assert policy.next_delay('GET', 3, started_at, error=error) is None
+    assert policy.next_delay('POST', 1, started_at, error=error) is None
+
+
+def test_retry_after():
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after('Thu, 01 Jan 1970 00:00:00 GMT') == 0.0
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+
+
+def test_deadline_of_the_policy():
+    policy = RetryPolicy(backoff_factor=10, jitter=False, deadline=5)
+    assert policy.next_delay('GET', 1, time.monotonic(), error=TransportException()) is None
+
+
+def test_transient_failures_are_retried(kong_client, transport):
+    kong_client.retry = RetryPolicy(max_retries=3, backoff_factor=0, jitter=False)
+    kong_client.services.create('httpbin', host='httpbin.org')
+    transport.failures = [TransportException('reset'), 503, 429]
+    transport.requests.clear()
+
+    assert kong_client.services.get('httpbin')['name'] == 'httpbin'
+    assert transport.count('GET') == 4
+
+
+def test_retries_are_bounded(kong_client, transport):
+    kong_client.retry = RetryPolicy(max_retries=1, backoff_factor=0, jitter=False)
+    transport.failures = [503, 503]
+
+    with pytest.raises(APIException) as error:
+        kong_client.services.get('httpbin')
+    assert error.value.http_status == 503
+    assert transport.count('GET') == 2
+
+
+def test_post_is_not_replayed(kong_client, transport):
+    kong_client.retry = RetryPolicy(max_retries=3, backoff_factor=0, jitter=False)
+    transport.failures = [TransportException('reset')]
+
+    with pytest.raises(TransportException):
+        kong_client.services.create('httpbin', host='httpbin.org')
+    assert transport.count('POST') == 1
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+from kongclient.router import RouteMatcher, is_regex_path
+
+
+def route(name, created_at=0, **attributes):
+    return dict(attributes, id=name, name=name, created_at=created_at)
+
+
+def names(routes):
+    return [route['name'] if route else None for route in routes]
+
+
+def test_is_regex_path():
+    assert is_regex_path('~/users/\\d+')
+    assert is_regex_path('/users/[0-9]+')
+    assert not is_regex_path('/users/v1.0')
+
+
+def test_longest_prefix_wins():
+    matcher = RouteMatcher([route('root', paths=['/']), route('api', paths=['/api']),
+                            route('v1', paths=['/api/v1'])])
+
+    assert names(matcher.match_many([{'path': '/api/v1/users'}, {'path': '/api/v2'}, {'path': '/other'}])) == [
+        'v1', 'api', 'root']
+
+
+def test_regex_paths():
+    matcher = RouteMatcher([route('prefix', paths=['/users']), route('regex', paths=['~/users/\\d+$']),
+                            route('priority', paths=['~/users/1$'], regex_priority=10)])
+
+    assert names(matcher.match_many([{'path': '/users/42'}, {'path': '/users/1'}, {'path': '/users/me'}])) == [
+        'regex', 'priority', 'prefix']
+
+
+def test_hosts_and_attributes():
+    matcher = RouteMatcher([
+        route('any', paths=['/']),
+        route('wildcard', hosts=['*.example.com']),
+        route('plain', hosts=['api.example.com']),
+        route('post', hosts=['api.example.com'], methods=['POST']),
+        route('header', hosts=['api.example.com'], headers={'X-Version': ['2']}),
+        route('tls', paths=['/'], snis=['secure.example.com'], protocols=['https']),
+    ])
+
+    assert names(matcher.match_many([
+        {'host': 'api.example.com:8000'},
+        {'host': 'www.example.com'},
+        {'host': 'api.example.com', 'method': 'post'},
+        {'host': 'api.example.com', 'headers': {'x-version': '2'}},
+        {'host': 'other.org'},
+        {'sni': 'secure.example.com', 'protocol': 'https'},
+        {'protocol': 'grpc'},
+    ])) == ['plain', 'wildcard', 'post', 'header', 'any', 'tls', None]
+
+
+def test_oldest_route_wins_a_tie():
+    matcher = RouteMatcher([route('new', created_at=2, paths=['/']), route('old', created_at=1, paths=['/'])])
+    assert matcher.match('/')['name'] == 'old'
+
+
+def test_conflicts():
+    matcher = RouteMatcher([
+        route('old', created_at=1, hosts=['a.org'], paths=['/']),
+        route('new', created_at=2, hosts=['a.org'], paths=['/']),
+        route('other-host', created_at=3, hosts=['b.org'], paths=['/']),
+        route('regex', created_at=4, hosts=['a.org'], paths=['~/users/\\d+']),
+        route('users', created_at=5, hosts=['a.org'], paths=['/users/1']),
+        route('methods', created_at=6, hosts=['b.org'], paths=['/'], methods=['POST']),
+    ])
+
+    conflicts = [(conflict.kind, conflict.route['name'], conflict.other['name'], conflict.host, conflict.path)
+                 for conflict in matcher.conflicts()]
+
+    assert sorted(conflicts) == [('duplicate', 'old', 'new', 'a.org', '/'),
+                                 ('regex-overlap', 'regex', 'users', 'a.org', '/users/1')]
+
+
+def test_load(kong_client):
+    kong_client.services.create('httpbin', host='httpbin.org')
+    kong_client.services.add_route('httpbin', name='route', hosts=['httpbin.org'], paths=['/get'])
+
+    assert RouteMatcher.load(kong_client).match('/get/1', host='httpbin.org')['name'] == 'route'
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+import time
+
+import pytest
+
+from conftest import SlowAsyncTransport
+from kongclient import AsyncKongClient, KongClient
+from kongclient.deadline import Deadline
+from kongclient.exceptions import DeadlineExceeded
+from kongclient.singleflight import SingleFlight
+from kongclient.testing import FakeKongTransport
+
+
+class SlowTransport(FakeKongTransport):
+    """ FakeKongTransport answering GETs after a delay, counting them. """
+
+    def __init__(self, kong=None, delay=0.05, **options):
+        super(SlowTransport, self).__init__(kong, **options)
+        self.delay = delay
+        self.gets = 0
+        self._lock = threading.Lock()
+
+    def send(self, method, url, params=None, json=None, headers=None, timeout=None):
+        if method == 'GET':
+            with self._lock:
+                self.gets += 1
+            time.sleep(self.delay)
+        return super(SlowTransport, self).send(method, url, params=params, json=json, headers=headers,
+                                               timeout=timeout)
+
+
+def run_concurrently(func, count):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def run(i):
+        barrier.wait()
+        results[i] = func()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_identical_reads_share_one_request():
+    transport = SlowTransport()
+    kong_client = KongClient('http://localhost:8001', transport=transport, coalesce=True)
+    kong_client.services.create('httpbin', host='httpbin.org')
+
+    services = run_concurrently(lambda: kong_client.services.get('httpbin'), 8)
+
+    assert transport.gets == 1
+    assert all(service is services[0] for service in services)
+
+
+def test_reads_are_not_coalesced_by_default():
+    transport = SlowTransport(delay=0.01)
+    kong_client = KongClient('http://localhost:8001', transport=transport)
+    kong_client.services.create('httpbin', host='httpbin.org')
+
+    run_concurrently(lambda: kong_client.services.get('httpbin'), 4)
+
+    assert transport.gets == 4
+
+
+def test_errors_are_shared():
+    flights = SingleFlight()
+    calls = []
+
+    def fail():
+        calls.append(1)
+        time.sleep(0.05)
+        raise ValueError('boom')
+
+    def call():
+        try:
+            flights.do('key', fail)
+        except ValueError as e:
+            return e
+
+    errors = run_concurrently(call, 4)
+    assert len(calls) == 1
+    assert all(isinstance(error, ValueError) for error in errors)
+
+
+def test_waiters_give_up_at_their_deadline():
+    flights = SingleFlight()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        time.sleep(0.2)
+        return 'done'
+
+    leader = threading.Thread(target=flights.do, args=('key', slow))
+    leader.start()
+    started.wait()
+    with Deadline(0.01):
+        with pytest.raises(DeadlineExceeded):
+            flights.do('key', slow)
+    leader.join()
+
+
+def test_forget_starts_a_new_flight():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def first():
+        started.set()
+        release.wait()
+        return 'before'
+
+    leader = threading.Thread(target=flights.do, args=('key', first))
+    leader.start()
+    started.wait()
+    flights.forget()
+    assert flights.do('key', lambda: 'after') == 'after'
+    release.set()
+    leader.join()
+
+
+def test_async_identical_reads_share_one_request(kong):
+    transport = SlowAsyncTransport(kong, delay=0.05)
+    async_kong_client = AsyncKongClient('http://localhost:8001', transport=transport, coalesce=True)
+
+    async def main():
+        await async_kong_client.services.create('httpbin', host='httpbin.org')
+        return await asyncio.gather(*[async_kong_client.services.get('httpbin') for _ in range(10)])
+
+    services = asyncio.run(main())
+    assert transport.sent == 2
+    assert all(service is services[0] for service in services)
+
+
+def test_async_waiters_outlive_a_cancelled_first_caller(kong):
+    transport = SlowAsyncTransport(kong, delay=0.05)
+    async_kong_client = AsyncKongClient('http://localhost:8001', transport=transport, coalesce=True)
+
+    async def main():
+        await async_kong_client.services.create('httpbin', host='httpbin.org')
+        first = asyncio.ensure_future(async_kong_client.services.get('httpbin'))
+        await asyncio.sleep(0.01)
+        others = asyncio.gather(*[async_kong_client.services.get('httpbin') for _ in range(3)])
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await others
+
+    services = asyncio.run(main())
+    assert [service['name'] for service in services] == ['httpbin'] * 3
+    assert transport.sent == 2
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+
+import pytest
+
+from kongclient.exceptions import TransportException
+from kongclient.snapshot import load_snapshot, snapshot
+
+
+@pytest.fixture
+def configured(kong_client):
+    service = kong_client.services.create('httpbin', host='httpbin.org')
+    kong_client.services.add_route(service['id'], name='route', hosts=['httpbin.org'])
+    kong_client.consumers.create('alice')
+    kong_client.plugins.create('cors', service_id=service['id'])
+    upstream = kong_client.upstreams.create('backend')
+    for i in range(3):
+        kong_client.upstreams.add_target(upstream['id'], '10.0.0.%d:80' % i)
+    return kong_client
+
+
+@pytest.mark.parametrize('format', ['ndjson', 'json'])
+def test_round_trip(configured, format):
+    fp = io.StringIO()
+
+    counts = snapshot(configured, fp, format=format, size=2)
+    fp.seek(0)
+    loaded = load_snapshot(fp)
+
+    assert counts == {'certificates': 0, 'snis': 0, 'services': 1, 'routes': 1, 'consumers': 1, 'upstreams': 1,
+                      'targets': 3, 'plugins': 1}
+    assert len(loaded) == 8
+    assert loaded.get('services', 'httpbin') == configured.services.get('httpbin')
+    assert loaded.get('consumers', 'alice')['username'] == 'alice'
+    assert sorted(target['target'] for target in loaded['targets']) == ['10.0.0.0:80', '10.0.0.1:80', '10.0.0.2:80']
+
+
+@pytest.mark.parametrize('format', ['ndjson', 'json'])
+def test_round_trip_of_an_empty_gateway(kong_client, format):
+    fp = io.StringIO()
+
+    snapshot(kong_client, fp, format=format)
+    fp.seek(0)
+
+    assert len(load_snapshot(fp)) == 0
+    assert len(load_snapshot(io.StringIO(' \n'))) == 0
+
+
+def test_formats(configured):
+    ndjson, document = io.StringIO(), io.StringIO()
+    snapshot(configured, ndjson, collections=('services', 'consumers'))
+    snapshot(configured, document, format='json', collections=('services', 'consumers'))
+
+    lines = [json.loads(line) for line in ndjson.getvalue().splitlines()]
+    assert sorted(line['type'] for line in lines) == ['consumers', 'services']
+    assert sorted(json.loads(document.getvalue())) == ['consumers', 'services']
+
+
+def test_paths(configured, tmp_path):
+    path = str(tmp_path / 'kong.ndjson')
+
+    snapshot(configured, path)
+
+    assert load_snapshot(path).get('routes', 'route')['name'] == 'route'
+
+
+def test_failures_are_raised(configured, transport):
+    transport.failures = [TransportException('refused')]
+
+    with pytest.raises(TransportException):
+        snapshot(configured, io.StringIO(), collections=('services',))
+
+
+def test_unknown_format(kong_client):
+    with pytest.raises(ValueError):
+        snapshot(kong_client, io.StringIO(), format='yaml')
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from kongclient.sync import Syncer, flatten, sync
+
+DESIRED = {
+    'services': [{
+        'name': 'httpbin',
+        'url': 'https://httpbin.org',
+        'routes': [{'name': 'httpbin', 'hosts': ['httpbin.org'], 'plugins': [{'name': 'cors'}]}],
+        'plugins': [{'name': 'rate-limiting', 'config': {'minute': 20}}],
+    }],
+    'consumers': [{'username': 'alice', 'plugins': [{'name': 'key-auth'}]}],
+    'plugins': [{'name': 'prometheus'}],
+    'upstreams': [{'name': 'httpbin.org', 'targets': [{'target': '10.0.0.1:80', 'weight': 100}]}],
+}
+
+
+def test_flatten():
+    state = flatten(DESIRED, select_tags=['managed'])
+
+    assert state['services'][0]['port'] == 443 and 'url' not in state['services'][0]
+    assert state['routes'][0]['service'] == 'httpbin'
+    assert [(p['name'], p.get('service'), p.get('route'), p.get('consumer')) for p in state['plugins']] == [
+        ('rate-limiting', 'httpbin', None, None), ('cors', None, 'httpbin', None),
+        ('key-auth', None, None, 'alice'), ('prometheus', None, None, None)]
+    assert all(entity['tags'] == ['managed'] for entities in state.values() for entity in entities)
+
+
+def test_sync_creates_then_converges(kong_client, transport):
+    plan = sync(kong_client, DESIRED, dry_run=True)
+    assert plan.summary() == {'create': 9, 'update': 0, 'delete': 0}
+    assert not plan.applied and kong_client.services.list() == []
+
+    plan = sync(kong_client, DESIRED)
+    assert plan.ok and plan.applied
+    route = kong_client.routes.get('httpbin')
+    assert kong_client.routes.get_service('httpbin')['name'] == 'httpbin'
+    assert [p['name'] for p in kong_client.routes.list_plugins(route['id'])] == ['cors']
+    assert kong_client.upstreams.list_targets('httpbin.org')[0]['target'] == '10.0.0.1:80'
+
+    transport.requests.clear()
+    assert len(sync(kong_client, DESIRED)) == 0
+    assert transport.count() == transport.count('GET')
+
+
+def test_sync_sends_minimal_changes(kong_client, transport):
+    sync(kong_client, DESIRED)
+    desired = dict(DESIRED, consumers=[{'username': 'bob'}], plugins=[])
+    desired['services'] = [dict(DESIRED['services'][0], retries=2)]
+
+    plan = sync(kong_client, desired)
+
+    assert plan.ok
+    assert sorted((change.action, change.kind) for change in plan) == [
+        ('create', 'consumers'), ('delete', 'consumers'), ('delete', 'plugins'), ('delete', 'plugins'),
+        ('update', 'services')]
+    assert [change.fields for change in plan if change.action == 'update'] == [{'retries': 2}]
+    assert [c['username'] for c in kong_client.consumers.list()] == ['bob']
+    assert kong_client.services.get('httpbin')['retries'] == 2
+
+
+def test_moving_a_route(kong_client):
+    desired = {'services': [{'name': 'a', 'host': 'a.org'}, {'name': 'b', 'host': 'b.org'}],
+               'routes': [{'name': 'route', 'hosts': ['a.org'], 'service': 'a'}]}
+    sync(kong_client, desired)
+
+    desired['routes'][0]['service'] = 'b'
+    plan = sync(kong_client, desired)
+
+    assert [(change.action, change.kind, change.fields) for change in plan] == [
+        ('update', 'routes', {'service': 'b'})]
+    assert kong_client.routes.get_service('route')['name'] == 'b'
+
+
+def test_select_tags_leave_other_entities_alone(kong_client):
+    kong_client.consumers.create('manual')
+
+    plan = sync(kong_client, {'consumers': [{'username': 'alice'}]}, select_tags=['managed'])
+
+    assert plan.summary() == {'create': 1, 'update': 0, 'delete': 0}
+    assert sorted(c['username'] for c in kong_client.consumers.list()) == ['alice', 'manual']
+    assert kong_client.consumers.get('alice')['tags'] == ['managed']
+
+
+def test_failed_levels_stop_the_apply(kong_client):
+    desired = {'services': [{'name': 'httpbin', 'host': 'httpbin.org',
+                             'routes': [{'name': 'route', 'hosts': ['httpbin.org']}]}],
+               'plugins': [{'name': 'not-installed'}]}
+    syncer = Syncer(kong_client)
+
+    plan = syncer.apply(syncer.diff(desired))
+
+    assert not plan.ok
+    assert [(change.kind, change.key[0]) for change in plan.errors] == [('plugins', 'not-installed')]
+    assert kong_client.routes.get('route')['name'] == 'route'
+
+
+def test_unknown_references_are_rejected(kong_client, transport):
+    for desired in ({'plugins': [{'name': 'cors', 'service': 'typo-service'}]},
+                    {'routes': [{'name': 'route', 'hosts': ['a.org'], 'service': 'missing'}]},
+                    {'upstreams': [{'name': 'up'}], 'targets': [{'target': '10.0.0.1:80', 'upstream': 'down'}]}):
+        with pytest.raises(ValueError):
+            sync(kong_client, desired)
+    assert transport.count() == transport.count('GET')
+    assert kong_client.plugins.list() == []
+
+
+def test_references_to_existing_entities(kong_client):
+    service = kong_client.services.create('httpbin', host='httpbin.org')
+
+    plan = sync(kong_client, {'services': [{'name': 'httpbin', 'host': 'httpbin.org'}],
+                              'plugins': [{'name': 'cors', 'service': service['id']}]})
+
+    assert plan.ok
+    assert kong_client.plugins.list()[0]['service'] == {'id': service['id']}
+
+
+def test_failed_reference_is_not_sent_as_null(kong_client):
+    syncer = Syncer(kong_client)
+    plan = syncer.diff({'services': [{'name': 'httpbin', 'host': 'httpbin.org'}],
+                        'plugins': [{'name': 'cors', 'service': 'httpbin'}]})
+    plan.changes = [change for change in plan if change.kind == 'plugins']
+
+    syncer.apply(plan)
+
+    assert [type(change.error) for change in plan.errors] == [ValueError]
+    assert kong_client.plugins.list() == []
+
+
+def test_targets_are_updated_in_place(kong_client, transport):
+    sync(kong_client, DESIRED)
+    target = kong_client.upstreams.list_targets('httpbin.org')[0]
+    desired = dict(DESIRED, upstreams=[{'name': 'httpbin.org', 'targets': [{'target': '10.0.0.1:80', 'weight': 50}]}])
+    transport.requests.clear()
+
+    plan = sync(kong_client, desired)
+
+    assert plan.ok
+    assert [(change.action, change.kind, change.fields) for change in plan] == [
+        ('update', 'targets', {'weight': 50})]
+    assert transport.count('PATCH') == 1 and transport.count('POST') == 0
+    assert kong_client.upstreams.list_targets('httpbin.org') == [dict(target, weight=50)]
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+
+def test_target_health(kong_client):
+    kong_client.upstreams.create('backend')
+    target = kong_client.upstreams.add_target('backend', '10.0.0.1:80')
+    kong_client.upstreams.add_target('backend', '10.0.0.2:80')
+
+    results = kong_client.targets.bulk_set_unhealthy([('backend', target['id']), ('backend', 'missing:80')])
+
+    assert results[0].ok and not results[1].ok
+    health = {t['target']: t['health'] for t in kong_client.upstreams.get_upstream_health('backend')['data']}
+    assert health == {'10.0.0.1:80': 'UNHEALTHY', '10.0.0.2:80': 'HEALTHY'}
+    assert kong_client.upstreams.wait_for_health([('backend', target['id'])], healthy=False, timeout=1) == []
+    assert kong_client.upstreams.wait_for_health([('backend', target['id'])], timeout=0.2, interval=0.05) == \
+        [('backend', target['id'])]
+
+
+def test_address_health(kong_client):
+    kong_client.upstreams.create('backend')
+    kong_client.upstreams.add_target('backend', 'backend.local:80')
+
+    results = kong_client.targets.bulk_set_unhealthy([('backend', 'backend.local:80', '10.0.0.1:80')])
+
+    assert results[0].ok
+    target = kong_client.upstreams.get_upstream_health('backend')['data'][0]
+    addresses = {'%s:%s' % (a['ip'], a['port']): a['health'] for a in target['data']['addresses']}
+    assert addresses == {'backend.local:80': 'HEALTHY', '10.0.0.1:80': 'UNHEALTHY'}
+    assert target['health'] == 'HEALTHY'
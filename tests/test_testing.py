@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from kongclient.exceptions import APIException
+
+
+@pytest.mark.parametrize('path, body, message', [
+    ('/services', {'name': 1, 'host': 'a.org'}, 'name: expected a string'),
+    ('/services', {'name': 'a', 'host': 'a.org', 'tags': 'team-a'}, 'tags: expected a set of strings'),
+    ('/services', {'name': 'a', 'host': 'a.org', 'tags': ['team-a', 1]}, 'tags: expected a set of strings'),
+    ('/routes', {'name': 'a', 'hosts': ['a.org'], 'service': 'a'}, 'service: expected a record'),
+    ('/routes', {'name': 'a', 'hosts': ['a.org'], 'service': {'id': ['a']}}, 'service.id: expected a string'),
+    ('/routes', {'name': 'a', 'paths': ['/'], 'service': {'name': 1}}, 'service.name: expected a string'),
+    ('/routes', {'name': 'a', 'protocols': ['http']}, "must set one of 'methods'"),
+    ('/plugins', {'name': 'not-installed'}, "plugin 'not-installed' not enabled"),
+])
+def test_schema_violations(kong, path, body, message):
+    kong.handle('POST', '/services', {}, {'name': 'a', 'host': 'a.org'})
+
+    status, payload = kong.handle('POST', path, {}, body)
+
+    assert status == 400
+    assert payload['name'] == 'schema violation' and message in payload['message']
+
+
+def test_foreign_key_violation(kong):
+    status, payload = kong.handle('POST', '/routes', {}, {'name': 'a', 'hosts': ['a.org'], 'service': {'id': 'x'}})
+    assert status == 400 and payload['name'] == 'foreign key violation'
+
+
+def test_unique_names(kong_client):
+    kong_client.consumers.create('alice')
+    with pytest.raises(APIException) as error:
+        kong_client.consumers.create('alice')
+    assert error.value.http_status == 409
+
+
+def test_deletes_cascade_or_are_restricted(kong_client):
+    service = kong_client.services.create('httpbin', host='httpbin.org')
+    kong_client.services.add_route(service['id'], name='route', hosts=['httpbin.org'])
+    kong_client.plugins.create('cors', service_id=service['id'])
+
+    with pytest.raises(APIException) as error:
+        kong_client.services.delete('httpbin')
+    assert error.value.http_status == 400
+
+    kong_client.routes.delete('route')
+    kong_client.services.delete('httpbin')
+    assert kong_client.plugins.list() == []
+
+
+def test_page_size_limits(kong):
+    assert kong.handle('GET', '/services', {'size': '1000'}, None)[0] == 200
+    assert kong.handle('GET', '/services', {'size': '1001'}, None)[0] == 400
+    assert kong.handle('GET', '/services', {'size': '0'}, None)[0] == 400
+
+
+def test_targets_are_unique_per_upstream(kong_client):
+    kong_client.upstreams.create('backend')
+    target = kong_client.upstreams.add_target('backend', '10.0.0.1:80')
+
+    with pytest.raises(APIException) as error:
+        kong_client.upstreams.add_target('backend', '10.0.0.1:80', weight=50)
+    assert error.value.http_status == 409
+
+    updated = kong_client.targets.update_target_by_upstream('backend', '10.0.0.1:80', weight=50)
+    assert updated['id'] == target['id'] and updated['weight'] == 50
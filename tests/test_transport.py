@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+import socket
+import threading
+
+import pytest
+
+from kongclient import KongClient
+from kongclient.exceptions import ConnectException, TimeoutException, TransportException
+from kongclient.transport import HttpxTransport, RequestsTransport, Urllib3Transport
+
+from benchmarks.fake_kong import FakeKongServer
+
+requests = pytest.importorskip('requests')
+urllib3 = pytest.importorskip('urllib3')
+
+TRANSPORTS = [RequestsTransport, Urllib3Transport, HttpxTransport]
+
+
+@pytest.fixture
+def server(kong):
+    server = FakeKongServer(kong=kong)
+    server.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def closed_port_url():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return 'http://127.0.0.1:%d' % sock.getsockname()[1]
+
+
+@pytest.mark.parametrize('transport_class', TRANSPORTS)
+def test_transports(server, transport_class):
+    transport = transport_class(server.url, headers={'Kong-Admin-Token': 'secret'}, timeout=(3, 30))
+    try:
+        created = transport.request('POST', '/consumers', json={'username': 'alice'})
+        listed = transport.request('GET', '/consumers', params={'size': 1, 'tags': None})
+    finally:
+        transport.close()
+
+    assert created.status_code == 201 and created.json()['username'] == 'alice'
+    assert listed.status_code == 200 and [c['username'] for c in listed.json()['data']] == ['alice']
+
+
+@pytest.mark.parametrize('transport_class', TRANSPORTS)
+def test_clients_accept_a_transport_class(server, transport_class):
+    kong_client = KongClient(server.url, transport=transport_class, pool_maxsize=4)
+    kong_client.services.create('httpbin', host='httpbin.org')
+
+    assert isinstance(kong_client.client, transport_class)
+    assert [service['name'] for service in kong_client.services.list()] == ['httpbin']
+    kong_client.close()
+
+
+@pytest.mark.parametrize('transport_class', TRANSPORTS)
+def test_connection_errors_are_mapped(transport_class):
+    transport = transport_class(closed_port_url())
+
+    with pytest.raises(ConnectException):
+        transport.request('GET', '/status')
+
+
+@pytest.mark.parametrize('transport_class', TRANSPORTS)
+def test_timeouts_are_mapped(kong, transport_class):
+    server = FakeKongServer(kong=kong, latency=0.5)
+    # The response is written after the client gave up, which is expected here.
+    server.handle_error = lambda request, client_address: None
+    server.start()
+    transport = transport_class(server.url, timeout=0.05)
+    try:
+        with pytest.raises(TimeoutException):
+            transport.request('GET', '/status')
+    finally:
+        transport.close()
+        server.shutdown()
+        server.server_close()
+
+
+def failing(error):
+    def request(session, method, url, **kwargs):
+        raise error
+    return request
+
+
+@pytest.mark.parametrize('error, expected', [
+    (requests.ConnectionError(urllib3.exceptions.MaxRetryError(None, '/', urllib3.exceptions.NewConnectionError(
+        None, 'refused'))), ConnectException),
+    (requests.ConnectTimeout('connect timeout'), ConnectException),
+    (requests.ConnectionError(urllib3.exceptions.ProtocolError('Connection aborted.')), TransportException),
+    (requests.exceptions.ChunkedEncodingError('broken'), TransportException),
+    (requests.exceptions.ContentDecodingError('gzip'), TransportException),
+    (requests.ReadTimeout('read timeout'), TimeoutException),
+])
+def test_requests_errors_are_mapped(monkeypatch, error, expected):
+    monkeypatch.setattr(requests.Session, 'request', failing(error))
+    transport = RequestsTransport('http://localhost:8001')
+
+    with pytest.raises(TransportException) as raised:
+        transport.request('GET', '/services')
+    assert type(raised.value) is expected
+    assert raised.value.__cause__ is error
+
+
+def sessions_of(transport, count):
+    sessions = [None] * count
+    barrier = threading.Barrier(count)
+
+    def run(i):
+        barrier.wait()
+        sessions[i] = transport.session
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sessions
+
+
+def test_every_thread_has_its_own_session():
+    transport = RequestsTransport('http://localhost:8001')
+
+    sessions = sessions_of(transport, 8)
+
+    assert len(set(map(id, sessions))) == 8
+    assert all(session.get_adapter('http://localhost:8001') is transport.adapter for session in sessions)
+
+
+def test_shared_session_is_created_once():
+    transport = RequestsTransport('http://localhost:8001', per_thread_sessions=False)
+
+    sessions = sessions_of(transport, 8)
+
+    assert all(session is transport.session for session in sessions)
+
+
+def test_bulk_over_http(server):
+    kong_client = KongClient(server.url)
+
+    results = kong_client.consumers.bulk_create([{'username': 'user-%d' % i} for i in range(20)], max_workers=8)
+
+    assert all(result.ok for result in results)
+    assert len(kong_client.consumers.list()) == 20
+
+
+def test_http_session_is_kept(server):
+    from kongclient.client import HttpSession
+
+    session = HttpSession(server.url)
+
+    assert isinstance(session, requests.Session) and session.verify is False
+    assert session.post('/services', json={'name': 'httpbin', 'host': 'httpbin.org'}).status_code == 201
+    assert session.get('/services/httpbin').json()['host'] == 'httpbin.org'
+    assert HttpSession(server.url, verify_ssl=True).verify is True
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import subprocess
+import sys
+
+import pytest
+
+from kongclient import AsyncKongClient
+from kongclient.exceptions import TransportException
+from kongclient.testing import AsyncFakeKongTransport
+from kongclient.watch import AsyncHealthWatcher, HealthWatcher
+
+
+class FlakyAsyncTransport(AsyncFakeKongTransport):
+    """ AsyncFakeKongTransport raising the exceptions appended to `failures`, in order. """
+
+    def __init__(self, kong=None, **options):
+        super(FlakyAsyncTransport, self).__init__(kong, **options)
+        self.failures = []
+
+    async def send(self, method, url, params=None, json=None, headers=None, timeout=None):
+        if self.failures:
+            raise self.failures.pop(0)
+        return await super(FlakyAsyncTransport, self).send(method, url, params=params, json=json, headers=headers,
+                                                           timeout=timeout)
+
+
+@pytest.fixture
+def upstream(kong_client):
+    upstream = kong_client.upstreams.create('backend')
+    kong_client.upstreams.add_target(upstream['id'], '10.0.0.1:80')
+    return upstream
+
+
+def changes(events):
+    return [(event.upstream, event.target, event.address, event.previous, event.current) for event in events]
+
+
+def test_changes_are_yielded(kong_client, upstream):
+    watcher = HealthWatcher(kong_client, upstreams=['backend'], interval=0)
+    assert watcher.poll() == []
+
+    kong_client.targets.set_unhealthy_target_by_upstream('backend', '10.0.0.1:80')
+
+    assert changes(watcher.poll()) == [
+        ('backend', '10.0.0.1:80', None, 'HEALTHY', 'UNHEALTHY'),
+        ('backend', '10.0.0.1:80', '10.0.0.1:80', 'HEALTHY', 'UNHEALTHY')]
+    assert watcher.poll() == []
+
+
+def test_initial_events(kong_client, upstream):
+    watcher = HealthWatcher(kong_client, upstreams=['backend'], interval=0, emit_initial=True)
+    assert changes(watcher.poll())[0] == ('backend', '10.0.0.1:80', None, None, 'HEALTHY')
+
+
+def test_stable_upstreams_are_polled_less_often(kong_client, upstream):
+    watcher = HealthWatcher(kong_client, upstreams=['backend'], interval=1, max_interval=4, backoff=2)
+    delays = []
+    for _ in range(4):
+        watcher._next_poll['backend'] = 0.0
+        watcher.poll()
+        delays.append(watcher._delays['backend'])
+    assert delays == [1, 2, 4, 4]
+
+    kong_client.targets.set_unhealthy_target_by_upstream('backend', '10.0.0.1:80')
+    watcher._next_poll['backend'] = 0.0
+    assert watcher.poll() != []
+    assert watcher._delays['backend'] == 1
+    assert watcher.poll() == []
+
+
+def test_upstreams_are_discovered_on_their_own_interval(kong_client, transport, upstream):
+    watcher = HealthWatcher(kong_client, interval=0, discover_interval=30)
+    watcher.poll()
+    kong_client.upstreams.create('api')
+    watcher.poll()
+
+    assert list(watcher.states) == [upstream['id']]
+    assert transport.requests.count(('GET', 'http://localhost:8001/upstreams')) == 1
+
+    watcher._next_discovery = 0.0
+    watcher.poll()
+    assert len(watcher.states) == 2
+
+
+def test_failures_do_not_stop_the_watch(kong_client, transport, upstream):
+    watcher = HealthWatcher(kong_client, interval=0)
+    transport.failures = [TransportException('refused')]
+
+    assert watcher.poll() == []
+    assert watcher.states == {}
+
+    watcher.poll()
+    transport.failures = [500]
+    assert watcher.poll() == []
+    assert list(watcher.states) == [upstream['id']]
+
+
+def test_async_watcher(kong_client, async_kong_client, upstream):
+    watcher = AsyncHealthWatcher(async_kong_client, interval=0)
+
+    async def main():
+        await watcher.poll()
+        kong_client.targets.set_unhealthy_target_by_upstream('backend', '10.0.0.1:80')
+        return await watcher.poll()
+
+    assert changes(asyncio.run(main()))[0] == (upstream['id'], '10.0.0.1:80', None, 'HEALTHY', 'UNHEALTHY')
+
+
+def test_iteration(kong_client, upstream):
+    watcher = HealthWatcher(kong_client, upstreams=['backend'], interval=0, emit_initial=True)
+    events = []
+    for event in watcher:
+        events.append(event)
+        watcher.close()
+
+    assert changes(events) == [('backend', '10.0.0.1:80', None, None, 'HEALTHY'),
+                               ('backend', '10.0.0.1:80', '10.0.0.1:80', None, 'HEALTHY')]
+
+
+def test_async_watcher_survives_failures(kong, kong_client, upstream):
+    transport = FlakyAsyncTransport(kong)
+    watcher = AsyncHealthWatcher(AsyncKongClient('http://localhost:8001', transport=transport), interval=0)
+
+    async def main():
+        transport.failures = [TransportException('refused')]
+        assert await watcher.poll() == []
+        await watcher.poll()
+        transport.failures = [TransportException('refused')]
+        assert await watcher.poll() == []
+        kong_client.targets.set_unhealthy_target_by_upstream('backend', '10.0.0.1:80')
+        return await watcher.poll()
+
+    assert len(asyncio.run(main())) == 2
+    assert list(watcher.states) == [upstream['id']]
+
+
+def test_async_iteration(async_kong_client, upstream):
+    watcher = AsyncHealthWatcher(async_kong_client, upstreams=['backend'], interval=0, emit_initial=True)
+
+    async def main():
+        events = []
+        async for event in watcher:
+            events.append(event)
+            watcher.close()
+        return events
+
+    assert len(asyncio.run(main())) == 2
+    with pytest.raises(TypeError):
+        iter(watcher)
+
+
+def test_importing_the_watcher_does_not_import_asyncio():
+    code = 'import sys, kongclient.watch; print("asyncio" in sys.modules)'
+    assert subprocess.check_output([sys.executable, '-c', code]).strip() == b'False'